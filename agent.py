@@ -8,10 +8,12 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Awaitable, Coroutine, Dict
 from enum import Enum
+import itertools
+import time
 import uuid
 import models
 
-from python.helpers import extract_tools, files, errors, history, tokens
+from python.helpers import extract_tools, files, errors, history, tokens, tracing, llm_metrics
 from python.helpers import dirty_json
 from python.helpers.print_style import PrintStyle
 from langchain_core.prompts import (
@@ -21,7 +23,9 @@ from langchain_core.messages import HumanMessage, SystemMessage, BaseMessage
 
 import python.helpers.log as Log
 from python.helpers.dirty_json import DirtyJson
-from python.helpers.defer import DeferredTask
+from python.helpers.defer import DeferredTask, EventLoopThread, shard_thread_name
+from python.helpers.dotenv import get_dotenv_value
+from python.helpers.loop_monitor import BlockingDetector
 from typing import Callable
 from python.helpers.localization import Localization
 from python.helpers.extension import call_extensions
@@ -36,6 +40,9 @@ class AgentContext:
 
     _contexts: dict[str, "AgentContext"] = {}
     _counter: int = 0
+    _versions = itertools.count(1)
+    _version: int = 0  # changes whenever a context is added, removed or its listed fields change
+    DEFAULT_LOOP_SHARDS = 4  # event loop threads shared by all contexts, override with A0_AGENT_LOOP_SHARDS
 
     def __init__(
         self,
@@ -66,15 +73,62 @@ class AgentContext:
         # set to start of unix epoch
         self.last_message = last_message or datetime.now(timezone.utc)
 
+        # log changes are the progress of the running task
+        self.log.add_listener(self._report_progress)
+
         existing = self._contexts.get(self.id, None)
         if existing:
             AgentContext.remove(self.id)
         self._contexts[self.id] = self
+        AgentContext.mark_changed()
+
+    # fields listed by serialize() bump the contexts version when set
+    @property
+    def name(self) -> str | None:
+        return self._name
+
+    @name.setter
+    def name(self, value: str | None):
+        self._name = value
+        AgentContext.mark_changed()
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    @paused.setter
+    def paused(self, value: bool):
+        if getattr(self, "_paused", None) != value:
+            self._paused = value
+            AgentContext.mark_changed()
+
+    @property
+    def last_message(self) -> datetime:
+        return self._last_message
+
+    @last_message.setter
+    def last_message(self, value: datetime):
+        self._last_message = value
+        AgentContext.mark_changed()
+
+    @staticmethod
+    def mark_changed():
+        AgentContext._version = next(AgentContext._versions)
+
+    @staticmethod
+    def get_version() -> int:
+        return AgentContext._version
 
     @staticmethod
     def get(id: str):
         return AgentContext._contexts.get(id, None)
 
+    @staticmethod
+    def add(context: "AgentContext"):
+        """Register an existing context again, e.g. one reused from a pool after remove()."""
+        AgentContext._contexts[context.id] = context
+        AgentContext.mark_changed()
+
     @staticmethod
     def first():
         if not AgentContext._contexts:
@@ -88,8 +142,12 @@ class AgentContext:
     @staticmethod
     def remove(id: str):
         context = AgentContext._contexts.pop(id, None)
+        if context:
+            AgentContext.mark_changed()
         if context and context.task:
             context.task.kill()
+        tracing.remove_trace(id)
+        llm_metrics.remove_context(id)
         return context
 
     def serialize(self):
@@ -160,14 +218,17 @@ class AgentContext:
         current_agent = self.get_agent()
 
         if self.task and self.task.is_alive():
+            # parallel subordinates all work for the current agent, each of them gets the message
+            parallel = current_agent.data.get(Agent.DATA_NAME_PARALLEL_SUBORDINATES)
             # set intervention messages to agent(s):
-            intervention_agent = current_agent
-            while intervention_agent and broadcast_level != 0:
-                intervention_agent.intervention = msg
-                broadcast_level -= 1
-                intervention_agent = intervention_agent.data.get(
-                    Agent.DATA_NAME_SUPERIOR, None
-                )
+            for intervention_agent in parallel or [current_agent]:
+                level = broadcast_level
+                while intervention_agent and level != 0:
+                    intervention_agent.intervention = msg
+                    level -= 1
+                    intervention_agent = intervention_agent.data.get(
+                        Agent.DATA_NAME_SUPERIOR, None
+                    )
         else:
             self.task = self.run_task(self._process_chain, current_agent, msg)
 
@@ -177,12 +238,35 @@ class AgentContext:
         self, func: Callable[..., Coroutine[Any, Any, Any]], *args: Any, **kwargs: Any
     ):
         if not self.task:
+            # the context and all its subordinates stay on one loop thread for their lifetime
             self.task = DeferredTask(
-                thread_name=self.__class__.__name__,
+                thread_name=self.get_thread_name(),
             )
+            self.task.event_loop_thread.start_lag_monitor()
+            BlockingDetector.start_if_enabled()
         self.task.start_task(func, *args, **kwargs)
         return self.task
 
+    def _report_progress(self):
+        if self.task:
+            self.task.report_progress(len(self.log.updates))
+
+    def get_thread_name(self) -> str:
+        shards = int(get_dotenv_value("A0_AGENT_LOOP_SHARDS", AgentContext.DEFAULT_LOOP_SHARDS))
+        return shard_thread_name(self.__class__.__name__, self.id, shards)
+
+    @staticmethod
+    def get_loop_stats() -> dict[str, Any]:
+        lag = EventLoopThread.get_lag_stats()
+        stats: dict[str, Any] = {}
+        for context in AgentContext.all():
+            name = context.get_thread_name()
+            shard = stats.setdefault(name, {"contexts": 0, "running": 0, "lag": lag.get(name)})
+            shard["contexts"] += 1
+            if context.task and context.task.is_alive():
+                shard["running"] += 1
+        return stats
+
     # this wrapper ensures that superior agents are called back if the chat was loaded from file and original callstack is gone
     async def _process_chain(self, agent: "Agent", msg: "UserMessage|str", user=True):
         try:
@@ -213,6 +297,8 @@ class AgentConfig:
     profile: str = ""
     memory_subdir: str = ""
     knowledge_subdirs: list[str] = field(default_factory=lambda: ["default", "custom"])
+    parallel_tools: bool = False  # allow multiple independent tool calls per response
+    subordinate_requests_per_minute: int = 6  # estimated chat requests of one running subordinate
     code_exec_docker_enabled: bool = False
     code_exec_docker_name: str = "A0-dev"
     code_exec_docker_image: str = "agent0ai/agent-zero-run:development"
@@ -275,6 +361,8 @@ class Agent:
 
     DATA_NAME_SUPERIOR = "_superior"
     DATA_NAME_SUBORDINATE = "_subordinate"
+    DATA_NAME_PARALLEL = "_parallel"  # runs next to other subordinates, does not take over streaming
+    DATA_NAME_PARALLEL_SUBORDINATES = "_parallel_subordinates"
     DATA_NAME_CTX_WINDOW = "ctx_window"
 
     def __init__(
@@ -304,6 +392,9 @@ class Agent:
 
     async def monologue(self):
         while True:
+            monologue_span = tracing.span(
+                "monologue", context_id=self.context.id, agent=self.agent_name
+            )
             try:
                 # loop data dictionary to pass to extensions
                 self.loop_data = LoopData(user_message=self.last_user_message)
@@ -315,7 +406,8 @@ class Agent:
                 # let the agent run message loop until he stops it with a response tool
                 while True:
 
-                    self.context.streaming_agent = self  # mark self as current streamer
+                    if not self.get_data(Agent.DATA_NAME_PARALLEL):
+                        self.context.streaming_agent = self  # mark self as current streamer
                     self.loop_data.iteration += 1
                     self.loop_data.params_temporary = {}  # clear temporary params
 
@@ -324,9 +416,14 @@ class Agent:
                         "message_loop_start", loop_data=self.loop_data
                     )
 
+                    # started right before the try so the finally below always ends it
+                    iteration_span = tracing.span(
+                        "iteration", iteration=self.loop_data.iteration
+                    )
                     try:
                         # prepare LLM chain (model, system, history)
-                        prompt = await self.prepare_prompt(loop_data=self.loop_data)
+                        with tracing.span("prepare_prompt"):
+                            prompt = await self.prepare_prompt(loop_data=self.loop_data)
 
                         # call before_main_llm_call extensions
                         await self.call_extensions("before_main_llm_call", loop_data=self.loop_data)
@@ -372,6 +469,7 @@ class Agent:
                             # process tools requested in agent message
                             tools_result = await self.process_tools(agent_response)
                             if tools_result:  # final response of message loop available
+                                self.loop_data.params_temporary["loop_finished"] = True
                                 return tools_result  # break the execution if the task is done
 
                     # exceptions inside message loop:
@@ -388,10 +486,14 @@ class Agent:
                         self.handle_critical_exception(e)
 
                     finally:
-                        # call message_loop_end extensions
-                        await self.call_extensions(
-                            "message_loop_end", loop_data=self.loop_data
-                        )
+                        # end the span even when an extension raises
+                        try:
+                            # call message_loop_end extensions
+                            await self.call_extensions(
+                                "message_loop_end", loop_data=self.loop_data
+                            )
+                        finally:
+                            iteration_span.end()
 
             # exceptions outside message loop:
             except InterventionException as e:
@@ -399,9 +501,13 @@ class Agent:
             except Exception as e:
                 self.handle_critical_exception(e)
             finally:
-                self.context.streaming_agent = None  # unset current streamer
-                # call monologue_end extensions
-                await self.call_extensions("monologue_end", loop_data=self.loop_data)  # type: ignore
+                if not self.get_data(Agent.DATA_NAME_PARALLEL):
+                    self.context.streaming_agent = None  # unset current streamer
+                try:
+                    # call monologue_end extensions
+                    await self.call_extensions("monologue_end", loop_data=self.loop_data)  # type: ignore
+                finally:
+                    monologue_span.end()
 
     async def prepare_prompt(self, loop_data: LoopData) -> list[BaseMessage]:
         self.context.log.set_progress("Building prompt")
@@ -431,16 +537,24 @@ class Agent:
         ).output()
         loop_data.extras_temporary.clear()
 
-        # convert history + extras to LLM format
+        # convert history and extras to LLM format separately, system prompt and history
+        # form a prefix that stays identical between iterations, extras change every time
         history_langchain: list[BaseMessage] = history.output_langchain(
-            loop_data.history_output + extras
+            loop_data.history_output
         )
+        extras_langchain: list[BaseMessage] = history.output_langchain(extras)
 
-        # build full prompt from system prompt, message history and extrS
-        full_prompt: list[BaseMessage] = [
+        # build full prompt from system prompt, message history and extras
+        stable_prompt: list[BaseMessage] = [
             SystemMessage(content=system_text),
             *history_langchain,
         ]
+        models.set_cache_breakpoint(stable_prompt[0])
+        if len(stable_prompt) > 1:
+            models.set_cache_breakpoint(stable_prompt[-1])
+        full_prompt: list[BaseMessage] = history.group_messages_abab(
+            stable_prompt + extras_langchain
+        )
         full_text = ChatPromptTemplate.from_messages(full_prompt).format()
 
         # store as last context window content
@@ -693,7 +807,10 @@ class Agent:
         )
         limiter.add(input=tokens.approximate_tokens(input))
         limiter.add(requests=1)
-        await limiter.wait(callback=wait_callback)
+        started = time.perf_counter()
+        with tracing.span("rate_limiter", model=model_config.name):
+            await limiter.wait(callback=wait_callback)
+        llm_metrics.set_scope(self.context.id, time.perf_counter() - started)
         return limiter
 
     async def handle_intervention(self, progress: str = ""):
@@ -719,61 +836,29 @@ class Agent:
         tool_request = extract_tools.json_parse_dirty(msg)
 
         if tool_request is not None:
+            # multiple independent tool calls in one response, if enabled
+            tool_calls = tool_request.get("tool_calls") if self.config.parallel_tools else None
+            if isinstance(tool_calls, list) and tool_calls:
+                return await self.process_tool_calls(tool_calls, msg)
+
             raw_tool_name = tool_request.get("tool_name", "")  # Get the raw tool name
             tool_args = tool_request.get("tool_args", {})
 
-            tool_name = raw_tool_name  # Initialize tool_name with raw_tool_name
-            tool_method = None  # Initialize tool_method
-
-            # Split raw_tool_name into tool_name and tool_method if applicable
-            if ":" in raw_tool_name:
-                tool_name, tool_method = raw_tool_name.split(":", 1)
-
-            tool = None  # Initialize tool to None
-
-            # Try getting tool from MCP first
-            try:
-                import python.helpers.mcp_handler as mcp_helper
-
-                mcp_tool_candidate = mcp_helper.MCPConfig.get_instance().get_tool(
-                    self, tool_name
-                )
-                if mcp_tool_candidate:
-                    tool = mcp_tool_candidate
-            except ImportError:
-                PrintStyle(
-                    background_color="black", font_color="yellow", padding=True
-                ).print("MCP helper module not found. Skipping MCP tool lookup.")
-            except Exception as e:
-                PrintStyle(
-                    background_color="black", font_color="red", padding=True
-                ).print(f"Failed to get MCP tool '{tool_name}': {e}")
-
-            # Fallback to local get_tool if MCP tool was not found or MCP lookup failed
-            if not tool:
-                tool = self.get_tool(
-                    name=tool_name, method=tool_method, args=tool_args, message=msg, loop_data=self.loop_data
-                )
-
+            tool = self.find_tool(raw_tool_name, tool_args, msg)
             if tool:
-                await self.handle_intervention()
-                await tool.before_execution(**tool_args)
-                await self.handle_intervention()
-                response = await tool.execute(**tool_args)
-                await self.handle_intervention()
-                await tool.after_execution(response)
-                await self.handle_intervention()
+                with tracing.span(f"tool:{tool.name}", tool=tool.__class__.__name__, method=tool.method):
+                    await self.handle_intervention()
+                    await tool.before_execution(**tool_args)
+                    await self.handle_intervention()
+                    with tracing.span("tool.execute"):
+                        response = await tool.execute(**tool_args)
+                    await self.handle_intervention()
+                    await tool.after_execution(response)
+                    await self.handle_intervention()
                 if response.break_loop:
                     return response.message
             else:
-                error_detail = (
-                    f"Tool '{raw_tool_name}' not found or could not be initialized."
-                )
-                self.hist_add_warning(error_detail)
-                PrintStyle(font_color="red", padding=True).print(error_detail)
-                self.context.log.log(
-                    type="error", content=f"{self.agent_name}: {error_detail}"
-                )
+                self.handle_tool_not_found(raw_tool_name)
         else:
             warning_msg_misformat = self.read_prompt("fw.msg_misformat.md")
             self.hist_add_warning(warning_msg_misformat)
@@ -783,6 +868,124 @@ class Agent:
                 content=f"{self.agent_name}: Message misformat, no valid tool request found.",
             )
 
+    async def process_tool_calls(self, tool_calls: list, msg: str):
+        calls = [call for call in tool_calls if isinstance(call, dict)]
+        # the response tool ends the loop, mixed with other calls it would cut them off
+        others = [
+            call for call in calls
+            if str(call.get("tool_name", "")).split(":", 1)[0] != "response"
+        ]
+        if others and len(others) < len(calls):
+            warning_msg = self.read_prompt("fw.msg_response_not_alone.md")
+            self.hist_add_warning(warning_msg)
+            PrintStyle(font_color="orange", padding=True).print(warning_msg)
+            self.context.log.log(type="warning", content=warning_msg)
+            calls = others
+
+        tools = []
+        for call in calls:
+            raw_tool_name = call.get("tool_name", "")
+            tool_args = call.get("tool_args", {}) or {}
+            tool = self.find_tool(raw_tool_name, tool_args, msg)
+            if tool:
+                tools.append((tool, tool_args))
+            else:
+                self.handle_tool_not_found(raw_tool_name)
+
+        # consecutive parallel safe tools run together, any other tool runs alone in its place
+        batches: list[list[tuple[Any, dict]]] = []
+        for tool, tool_args in tools:
+            if batches and tool.parallel_safe() and batches[-1][0][0].parallel_safe():
+                batches[-1].append((tool, tool_args))
+            else:
+                batches.append([(tool, tool_args)])
+
+        for i, batch in enumerate(batches):
+            responses = await self.run_tools_parallel(batch)
+            for (tool, _), response in zip(batch, responses):
+                if response.break_loop:
+                    skipped = [t.name for b in batches[i + 1 :] for t, _ in b]
+                    if skipped:
+                        warning_msg = self.read_prompt(
+                            "fw.msg_tool_calls_skipped.md",
+                            tool_name=tool.name,
+                            skipped=", ".join(skipped),
+                        )
+                        self.hist_add_warning(warning_msg)
+                        self.context.log.log(type="warning", content=warning_msg)
+                    return response.message
+
+    async def run_tools_parallel(self, batch: list[tuple[Any, dict]]):
+        async def execute(tool, tool_args):
+            with tracing.span(f"tool:{tool.name}", tool=tool.__class__.__name__, method=tool.method):
+                return await tool.execute(**tool_args)
+
+        with tracing.span("tools.parallel", count=len(batch)):
+            await self.handle_intervention()
+            for tool, tool_args in batch:
+                await tool.before_execution(**tool_args)
+            await self.handle_intervention()
+
+            tasks = [asyncio.create_task(execute(tool, tool_args)) for tool, tool_args in batch]
+            try:
+                responses = await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                raise
+
+            # results go to history in the order the tools were requested
+            await self.handle_intervention()
+            for (tool, _), response in zip(batch, responses):
+                await tool.after_execution(response)
+            await self.handle_intervention()
+        return responses
+
+    def find_tool(self, raw_tool_name: str, tool_args: dict, msg: str):
+        tool_name = raw_tool_name  # Initialize tool_name with raw_tool_name
+        tool_method = None  # Initialize tool_method
+
+        # Split raw_tool_name into tool_name and tool_method if applicable
+        if ":" in raw_tool_name:
+            tool_name, tool_method = raw_tool_name.split(":", 1)
+
+        tool = None  # Initialize tool to None
+
+        # Try getting tool from MCP first
+        try:
+            import python.helpers.mcp_handler as mcp_helper
+
+            mcp_tool_candidate = mcp_helper.MCPConfig.get_instance().get_tool(
+                self, tool_name
+            )
+            if mcp_tool_candidate:
+                tool = mcp_tool_candidate
+        except ImportError:
+            PrintStyle(
+                background_color="black", font_color="yellow", padding=True
+            ).print("MCP helper module not found. Skipping MCP tool lookup.")
+        except Exception as e:
+            PrintStyle(
+                background_color="black", font_color="red", padding=True
+            ).print(f"Failed to get MCP tool '{tool_name}': {e}")
+
+        # Fallback to local get_tool if MCP tool was not found or MCP lookup failed
+        if not tool:
+            tool = self.get_tool(
+                name=tool_name, method=tool_method, args=tool_args, message=msg, loop_data=self.loop_data
+            )
+        return tool
+
+    def handle_tool_not_found(self, raw_tool_name: str):
+        error_detail = (
+            f"Tool '{raw_tool_name}' not found or could not be initialized."
+        )
+        self.hist_add_warning(error_detail)
+        PrintStyle(font_color="red", padding=True).print(error_detail)
+        self.context.log.log(
+            type="error", content=f"{self.agent_name}: {error_detail}"
+        )
+
     async def handle_reasoning_stream(self, stream: str):
         await self.call_extensions(
             "reasoning_stream",
@@ -0,0 +1,166 @@
+"""Wall-clock time of History.compress() with a mocked utility model.
+
+Builds a history whose current topic, history topics and bulks are all over their share of the
+context window, so one compression has to summarize several parts. Every utility model call just
+sleeps for --latency seconds, the time measured is the scheduling of those calls, not the model.
+Runs the step by step compression History.compress() did before it planned concurrent rounds
+(reproduced below as legacy_compress) and the current History.compress().
+
+    python benchmarks/history_compression.py
+    python benchmarks/history_compression.py --latency 1.0 --topics 16 --runs 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CTX_LENGTH = 100_000
+CTX_HISTORY = 0.7
+MESSAGE_TOKENS = 2_000
+SUMMARY = "summary " * 50
+
+
+class MockAgent:
+    """The parts of Agent that history compression uses, the utility model only waits."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def call_utility_model(self, system: str, message: str, **kwargs) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return SUMMARY
+
+    def read_prompt(self, file: str, **kwargs) -> str:
+        return file
+
+    def parse_prompt(self, file: str, **kwargs) -> str:
+        return str(kwargs.get("summary", ""))
+
+
+def build_history(agent: MockAgent, topics: int, bulks: int):
+    from python.helpers import history
+
+    hist = history.History(agent)
+    # bulks over HISTORY_BULK_RATIO
+    for _ in range(bulks):
+        bulk = history.Bulk(history=hist)
+        topic = history.Topic(history=hist)
+        for i in range(4):
+            topic.add_message(i % 2 == 1, f"bulk message {i}", tokens=MESSAGE_TOKENS)
+        bulk.records.append(topic)
+        hist.bulks.append(bulk)
+    # unsummarized topics over HISTORY_TOPIC_RATIO
+    for t in range(topics):
+        for i in range(4):
+            hist.add_message(i % 2 == 1, f"topic {t} message {i}", tokens=MESSAGE_TOKENS)
+        hist.new_topic()
+    # current topic over CURRENT_TOPIC_RATIO, small messages so only summarization helps
+    for i in range(40):
+        hist.add_message(i % 2 == 1, f"current message {i}", tokens=MESSAGE_TOKENS)
+    return hist
+
+
+async def legacy_compress(hist) -> bool:
+    """History.compress() before concurrent rounds: compress the part most over its ratio by one
+    step, one utility model call at a time (only bulk merges ran together), until all fit."""
+    from python.helpers import history
+
+    async def compress_topics() -> bool:
+        # summarize topics one by one
+        for topic in hist.topics:
+            if not topic.summary:
+                await topic.summarize()
+                return True
+        # move oldest topic to bulks and summarize
+        for topic in hist.topics:
+            bulk = history.Bulk(history=hist)
+            bulk.records.append(topic)
+            if topic.summary:
+                bulk.summary = topic.summary
+            else:
+                await bulk.summarize()
+            hist.bulks.append(bulk)
+            hist.topics.remove(topic)
+            return True
+        return False
+
+    async def compress_bulks() -> bool:
+        # merge bulks in groups of BULK_MERGE_COUNT, even if there are fewer
+        count = history.BULK_MERGE_COUNT
+        groups = [hist.bulks[i : i + count] for i in range(0, len(hist.bulks), count)]
+        hist.bulks = list(await asyncio.gather(*[hist.merge_bulks(group) for group in groups]))
+        return True
+
+    compressed = False
+    while True:
+        total = history._get_ctx_size_for_history()
+        ratios = [
+            (hist.get_current_topic_tokens(), history.CURRENT_TOPIC_RATIO, hist.current.compress),
+            (hist.get_topics_tokens(), history.HISTORY_TOPIC_RATIO, compress_topics),
+            (hist.get_bulks_tokens(), history.HISTORY_BULK_RATIO, compress_bulks),
+        ]
+        ratios.sort(key=lambda x: (x[0] / total) / x[1], reverse=True)
+        compressed_part = False
+        for tokens, ratio, compress in ratios:
+            if tokens > ratio * total:
+                compressed_part = await compress()
+                if compressed_part:
+                    break
+        if not compressed_part:
+            return compressed
+        compressed = True
+
+
+async def measure(args, legacy: bool) -> tuple[list[float], int]:
+    times = []
+    calls = 0
+    for _ in range(args.runs):
+        agent = MockAgent(args.latency)
+        hist = build_history(agent, args.topics, args.bulks)
+        started = time.perf_counter()
+        if legacy:
+            await legacy_compress(hist)
+        else:
+            await hist.compress()
+        times.append(time.perf_counter() - started)
+        calls = agent.calls
+    return times, calls
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per utility model call")
+    parser.add_argument("--topics", type=int, default=12, help="unsummarized history topics")
+    parser.add_argument("--bulks", type=int, default=6)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    from python.helpers import history, settings
+
+    # fixed context window instead of the user's settings
+    settings.get_settings = lambda: {  # type: ignore
+        "chat_model_ctx_length": CTX_LENGTH,
+        "chat_model_ctx_history": CTX_HISTORY,
+    }
+
+    for label, legacy in (
+        ("legacy step by step", True),
+        (f"planned rounds (concurrency {history.COMPRESSION_CONCURRENCY})", False),
+    ):
+        times, calls = asyncio.run(measure(args, legacy))
+        print(
+            f"{label}: median {statistics.median(times):.2f} s, "
+            f"min {min(times):.2f} s per compression, {calls} utility model calls "
+            f"({args.latency} s each)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Cost of the /poll contexts and tasks lists and of index maintenance with many scheduler tasks.
+
+Fills an in-memory SchedulerTaskList (nothing is written to disk) with --tasks ad-hoc tasks,
+--contexts of them with their own task context, next to --chats plain chat contexts, and measures:
+
+- rebuild: poll_snapshot rebuilding the lists after a change, one get_task_by_uuid and one
+  serialize_task per context, with the linear scan lookup (before the indexes) and the uuid index
+- poll: poll_snapshot.get_lists() while nothing changed, what most polls do
+- update: keeping the indexes current after a task is renamed and moved to another context,
+  as a full rebuild (what every saved change did before) and as an incremental update
+
+    python benchmarks/scheduler_lookup.py
+    python benchmarks/scheduler_lookup.py --tasks 50000 --contexts 5000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def timed(func, runs: int) -> float:
+    """Median wall-clock milliseconds of func over runs."""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--contexts", type=int, default=1_000, help="tasks with their own context")
+    parser.add_argument("--chats", type=int, default=100, help="plain chat contexts")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    from agent import AgentContext
+    from python.helpers import poll_snapshot
+    from python.helpers.task_scheduler import AdHocTask, SchedulerTaskList, TaskScheduler
+
+    task_list = SchedulerTaskList(tasks=[])
+    for i in range(args.tasks):
+        task = AdHocTask.create(
+            name=f"task {i}",
+            system_prompt="",
+            prompt="",
+            token=str(i),
+        )
+        task.context_id = task.uuid
+        task_list.tasks.append(task)
+    task_list._reindex()
+
+    # the scheduler singleton without loading tmp/scheduler from disk
+    scheduler = TaskScheduler.__new__(TaskScheduler)
+    scheduler._tasks = task_list
+    scheduler._initialized = True
+    TaskScheduler._instance = scheduler
+
+    # task contexts spread over the whole list, no agents are needed to list them
+    step = max(1, args.tasks // max(1, args.contexts))
+    for task in task_list.tasks[::step][: args.contexts]:
+        AgentContext(config=None, id=task.uuid, agent0=object())  # type: ignore
+    for _ in range(args.chats):
+        AgentContext(config=None, agent0=object())  # type: ignore
+
+    def scan(self, task_uuid):
+        with self._lock:
+            return next((task for task in self.tasks if task.uuid == task_uuid), None)
+
+    def rebuild():
+        poll_snapshot._build(poll_snapshot.get_key())
+
+    index = SchedulerTaskList.get_task_by_uuid
+    SchedulerTaskList.get_task_by_uuid = scan  # type: ignore
+    try:
+        rebuild_scan = timed(rebuild, args.runs)
+    finally:
+        SchedulerTaskList.get_task_by_uuid = index  # type: ignore
+    rebuild_index = timed(rebuild, args.runs)
+    contexts, tasks = poll_snapshot.get_lists()
+    assert len(contexts) == args.chats and len(tasks) == len(AgentContext.all()) - args.chats
+
+    edited = task_list.tasks[args.tasks // 2]
+    edits = iter(range(10**9))
+
+    def edit():
+        n = next(edits)
+        edited.name = f"renamed {n}"
+        edited.context_id = f"ctx-{n % max(1, args.contexts)}"
+
+    def update_rebuild():
+        edit()
+        task_list._reindex()
+
+    def update_incremental():
+        edit()
+        task_list._index_update(edited)
+
+    print(
+        f"{args.tasks} tasks, {len(tasks)} task contexts, {len(contexts)} chats, "
+        f"median of {args.runs} runs"
+    )
+    print(f"rebuild, poll lists after a change: scan {rebuild_scan:.2f} ms, index {rebuild_index:.2f} ms")
+    print(f"poll, unchanged lists: {timed(poll_snapshot.get_lists, args.runs):.2f} ms")
+    print(
+        f"update, one renamed task: full rebuild {timed(update_rebuild, args.runs):.3f} ms, "
+        f"incremental {timed(update_incremental, args.runs):.3f} ms"
+    )
+
+    # the incremental indexes hold the same tasks as a full rebuild
+    def snapshot():
+        return [
+            {key: sorted(task.uuid for task in tasks) for key, tasks in index.items()}
+            for index in (task_list._by_name, task_list._by_context)
+        ]
+
+    incremental = snapshot()
+    task_list._reindex()
+    assert incremental == snapshot()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Load test of the web server paths, werkzeug threaded WSGI against the ASGI bridge.
+
+Serves a Flask app with an ApiHandler-like async view (awaits a short sleep and returns json)
+from a separate process and measures requests/s and latency percentiles with concurrent clients.
+The /stream endpoint holds long-lived streaming responses open during the run.
+
+    python benchmarks/server_load.py --server wsgi
+    python benchmarks/server_load.py --server asgi
+    python benchmarks/server_load.py            # both, one after the other
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HOST = "127.0.0.1"
+VIEW_DELAY = 0.01  # simulated await inside the handler
+
+
+def serve(server: str, port: int):
+    from flask import Flask, Response
+
+    app = Flask("bench")
+
+    @app.route("/api", methods=["POST"])
+    async def api():
+        await asyncio.sleep(VIEW_DELAY)
+        return {"ok": True}
+
+    @app.route("/stream", methods=["GET"])
+    async def stream():
+        class Lines:
+            async def __aiter__(self):
+                for i in range(600):
+                    await asyncio.sleep(0.1)
+                    yield f"{i}\n"
+
+            def __iter__(self):
+                for i in range(600):
+                    time.sleep(0.1)
+                    yield f"{i}\n"
+
+        return Response(Lines(), mimetype="application/x-ndjson")
+
+    if server == "asgi":
+        from python.helpers import asgi
+
+        asgi.make_server(HOST, port, app).serve_forever()
+    else:
+        from werkzeug.serving import make_server
+
+        make_server(HOST, port, app, threaded=True).serve_forever()
+
+
+async def load(port: int, concurrency: int, duration: float, streams: int) -> dict:
+    import httpx
+
+    latencies: list[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency + streams, max_keepalive_connections=concurrency + streams)
+    async with httpx.AsyncClient(base_url=f"http://{HOST}:{port}", limits=limits, timeout=30) as client:
+        open_streams = [
+            asyncio.create_task(client.get("/stream")) for _ in range(streams)
+        ]
+        await asyncio.sleep(0.5)  # let the streams connect
+        end = time.perf_counter() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < end:
+                started = time.perf_counter()
+                try:
+                    response = await client.post("/api", json={"n": 1})
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - started)
+                except Exception:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        for task in open_streams:
+            task.cancel()
+        await asyncio.gather(*open_streams, return_exceptions=True)
+
+    latencies.sort()
+
+    def pct(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": pct(0.50),
+        "p99_ms": pct(0.99),
+    }
+
+
+def run(server: str, args) -> dict:
+    process = subprocess.Popen(
+        [sys.executable, __file__, "--serve", server, "--port", str(args.port)],
+    )
+    try:
+        time.sleep(2)  # server startup
+        return asyncio.run(load(args.port, args.concurrency, args.duration, args.streams))
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--server", choices=["wsgi", "asgi"], default=None)
+    parser.add_argument("--serve", choices=["wsgi", "asgi"], default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=50180)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--streams", type=int, default=20, help="long-lived streaming responses held open")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    for server in [args.server] if args.server else ["wsgi", "asgi"]:
+        result = run(server, args)
+        print(
+            f"{server}: {result['rps']:.0f} req/s, p50 {result['p50_ms']:.1f} ms, "
+            f"p99 {result['p99_ms']:.1f} ms, {result['requests']} requests, {result['errors']} errors "
+            f"(concurrency {args.concurrency}, {args.streams} open streams)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -78,6 +78,8 @@ def initialize_agent():
         profile=current_settings["agent_profile"],
         memory_subdir=current_settings["agent_memory_subdir"],
         knowledge_subdirs=[current_settings["agent_knowledge_subdir"], "default"],
+        parallel_tools=current_settings["agent_parallel_tools"],
+        subordinate_requests_per_minute=current_settings["agent_subordinate_requests_per_minute"],
         mcp_servers=current_settings["mcp_servers"],
         code_exec_docker_enabled=False,
         # code_exec_docker_name = "A0-dev",
@@ -6,6 +6,14 @@
   };
 })();
 
+// count DOM mutations so screenshots are only taken when the page changed
+(function () {
+  window.__a0_mutations = 0;
+  new MutationObserver((records) => {
+    window.__a0_mutations += records.length;
+  }).observe(document, { childList: true, subtree: true, attributes: true, characterData: true });
+})();
+
 // // Create a global bridge for iframe communication
 // (function() {
 //   let elementCounter = 0;
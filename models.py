@@ -2,6 +2,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 import logging
 import os
+import threading
 from typing import (
     Any,
     Awaitable,
@@ -17,7 +18,7 @@ from typing import (
 from litellm import completion, acompletion, embedding
 import litellm
 
-from python.helpers import dotenv
+from python.helpers import dotenv, llm_metrics, tracing
 from python.helpers.dotenv import load_dotenv
 from python.helpers.providers import get_provider_config
 from python.helpers.rate_limiter import RateLimiter
@@ -89,6 +90,43 @@ class ChatChunk(TypedDict):
 rate_limiters: dict[str, RateLimiter] = {}
 
 
+CACHE_BREAKPOINT = "cache_breakpoint"  # additional_kwargs key marking the end of a stable prompt prefix
+
+
+def set_cache_breakpoint(message: BaseMessage):
+    """Mark the current content of a message as the end of a prompt prefix that does not change between calls.
+    Content merged into the message later is sent after the breakpoint."""
+    message.additional_kwargs[CACHE_BREAKPOINT] = message.content
+
+
+@dataclass
+class PromptCacheStats:
+    calls: int = 0
+    input_tokens: int = 0
+    cached_tokens: int = 0  # input tokens read from provider prompt cache
+    cache_write_tokens: int = 0  # input tokens written to provider prompt cache
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "cached_tokens": self.cached_tokens,
+            "uncached_tokens": self.input_tokens - self.cached_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            "hit_ratio": round(self.cached_tokens / self.input_tokens, 3) if self.input_tokens else 0.0,
+        }
+
+
+_prompt_cache_stats: dict[str, PromptCacheStats] = {}
+_prompt_cache_lock = threading.Lock()
+
+
+def get_prompt_cache_stats() -> dict[str, dict[str, Any]]:
+    """Cached vs. uncached input tokens per model, as reported by providers"""
+    with _prompt_cache_lock:
+        return {model: stats.to_dict() for model, stats in _prompt_cache_stats.items()}
+
+
 def get_api_key(service: str) -> str:
     return (
         dotenv.get_dotenv_value(f"API_KEY_{service.upper()}")
@@ -131,10 +169,17 @@ class LiteLLMChatWrapper(SimpleChatModel):
             "system": "system",
             "tool": "tool",
         }
+        cache_control = self._supports_cache_control()
         for m in messages:
             role = role_mapping.get(m.type, m.type)
             message_dict = {"role": role, "content": m.content}
 
+            # explicit prompt cache breakpoints, other providers cache prefixes automatically
+            if cache_control and CACHE_BREAKPOINT in m.additional_kwargs:
+                message_dict["content"] = _apply_cache_breakpoint(
+                    m.content, m.additional_kwargs[CACHE_BREAKPOINT]
+                )
+
             # Handle tool calls for AI messages
             tool_calls = getattr(m, "tool_calls", None)
             if tool_calls:
@@ -170,6 +215,33 @@ class LiteLLMChatWrapper(SimpleChatModel):
             result.append(message_dict)
         return result
 
+    def _supports_cache_control(self) -> bool:
+        # Anthropic models need explicit cache_control blocks, directly or through routers like openrouter
+        return self.provider == "anthropic" or "claude" in self.model_name.lower()
+
+    def _supports_usage_stream(self) -> bool:
+        try:
+            params = litellm.get_supported_openai_params(
+                model=self.model_name.split("/", 1)[-1], custom_llm_provider=self.provider
+            )
+        except Exception:
+            return False
+        return bool(params) and "stream_options" in params  # type: ignore
+
+    def _record_usage(self, usage: Any):
+        prompt_tokens = _get_field(usage, "prompt_tokens") or 0
+        details = _get_field(usage, "prompt_tokens_details")
+        cached = (_get_field(details, "cached_tokens") if details else 0) or _get_field(
+            usage, "cache_read_input_tokens"
+        ) or 0
+        written = _get_field(usage, "cache_creation_input_tokens") or 0
+        with _prompt_cache_lock:
+            stats = _prompt_cache_stats.setdefault(self.model_name, PromptCacheStats())
+            stats.calls += 1
+            stats.input_tokens += prompt_tokens
+            stats.cached_tokens += cached
+            stats.cache_write_tokens += written
+
     def _call(
         self,
         messages: List[BaseMessage],
@@ -253,41 +325,68 @@ class LiteLLMChatWrapper(SimpleChatModel):
         # convert to litellm format
         msgs_conv = self._convert_messages(messages)
 
-        # call model
-        _completion = await acompletion(
-            model=self.model_name,
-            messages=msgs_conv,
-            stream=True,
-            **{**self.kwargs, **kwargs},
-        )
-
-        # results
-        reasoning = ""
-        response = ""
+        # request usage in the final chunk to track prompt cache hits
+        call_kwargs = {**self.kwargs, **kwargs}
+        if "stream_options" not in call_kwargs and self._supports_usage_stream():
+            call_kwargs["stream_options"] = {"include_usage": True}
+
+        # time to first token and total stream time
+        with tracing.span("llm", model=self.model_name) as span:
+            metrics = llm_metrics.start_call(self.model_name)
+            reasoning = ""
+            response = ""
+            usage = None
+
+            try:
+                # call model
+                _completion = await acompletion(
+                    model=self.model_name,
+                    messages=msgs_conv,
+                    stream=True,
+                    **call_kwargs,
+                )
 
-        # iterate over chunks
-        async for chunk in _completion:  # type: ignore
-            parsed = _parse_chunk(chunk)
-            # collect reasoning delta and call callbacks
-            if parsed["reasoning_delta"]:
-                reasoning += parsed["reasoning_delta"]
-                if reasoning_callback:
-                    await reasoning_callback(parsed["reasoning_delta"], reasoning)
-                if tokens_callback:
-                    await tokens_callback(
-                        parsed["reasoning_delta"],
-                        approximate_tokens(parsed["reasoning_delta"]),
-                    )
-            # collect response delta and call callbacks
-            if parsed["response_delta"]:
-                response += parsed["response_delta"]
-                if response_callback:
-                    await response_callback(parsed["response_delta"], response)
-                if tokens_callback:
-                    await tokens_callback(
-                        parsed["response_delta"],
-                        approximate_tokens(parsed["response_delta"]),
-                    )
+                # iterate over chunks
+                async for chunk in _completion:  # type: ignore
+                    usage = _get_field(chunk, "usage") or usage
+                    if not _get_field(chunk, "choices"):
+                        continue
+                    parsed = _parse_chunk(chunk)
+                    if parsed["response_delta"] or parsed["reasoning_delta"]:
+                        if not response and not reasoning:
+                            span.event("first_token")
+                        metrics.chunk()
+                    # collect reasoning delta and call callbacks
+                    if parsed["reasoning_delta"]:
+                        reasoning += parsed["reasoning_delta"]
+                        if reasoning_callback:
+                            await reasoning_callback(parsed["reasoning_delta"], reasoning)
+                        if tokens_callback:
+                            await tokens_callback(
+                                parsed["reasoning_delta"],
+                                approximate_tokens(parsed["reasoning_delta"]),
+                            )
+                    # collect response delta and call callbacks
+                    if parsed["response_delta"]:
+                        response += parsed["response_delta"]
+                        if response_callback:
+                            await response_callback(parsed["response_delta"], response)
+                        if tokens_callback:
+                            await tokens_callback(
+                                parsed["response_delta"],
+                                approximate_tokens(parsed["response_delta"]),
+                            )
+            except BaseException as e:
+                metrics.finish(usage, response, reasoning, error=not llm_metrics.is_interruption(e))
+                raise
+            metrics.finish(usage, response, reasoning)
+
+            if usage:
+                self._record_usage(usage)
+                span.set(
+                    prompt_tokens=_get_field(usage, "prompt_tokens"),
+                    completion_tokens=_get_field(usage, "completion_tokens"),
+                )
 
         # return complete results
         return response, reasoning
@@ -418,6 +517,35 @@ def _get_litellm_embedding(model_name: str, provider_name: str, **kwargs: Any):
     return LiteLLMEmbeddingWrapper(model=model_name, provider=provider_name, **kwargs)
 
 
+def _get_field(obj: Any, name: str) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def _apply_cache_breakpoint(content: Any, prefix: Any) -> list[dict]:
+    cache_control = {"type": "ephemeral"}
+    if isinstance(content, str):
+        # split off content merged after the breakpoint was set
+        if isinstance(prefix, str) and len(content) > len(prefix) and content.startswith(prefix):
+            return [
+                {"type": "text", "text": prefix, "cache_control": cache_control},
+                {"type": "text", "text": content[len(prefix):]},
+            ]
+        return [{"type": "text", "text": content, "cache_control": cache_control}]
+
+    blocks = [
+        dict(block) if isinstance(block, dict) else {"type": "text", "text": str(block)}
+        for block in content
+    ]
+    if not blocks:
+        return blocks
+    # a string prefix became the first block when merged with list content
+    stable = len(prefix) if isinstance(prefix, list) else 1
+    blocks[min(max(stable, 1), len(blocks)) - 1]["cache_control"] = cache_control
+    return blocks
+
+
 def _parse_chunk(chunk: Any) -> ChatChunk:
     delta = chunk["choices"][0].get("delta", {})
     message = chunk["choices"][0].get("message", {}) or chunk["choices"][0].get(
@@ -12,6 +12,10 @@ class BackupCreate(ApiHandler):
     def requires_loopback(cls) -> bool:
         return False
 
+    @classmethod
+    def blocks_loop(cls) -> bool:
+        return True  # BackupService writes the zip inline
+
     async def process(self, input: dict, request: Request) -> dict | Response:
         try:
             # Get input parameters
@@ -12,6 +12,10 @@ class BackupInspect(ApiHandler):
     def requires_loopback(cls) -> bool:
         return False
 
+    @classmethod
+    def blocks_loop(cls) -> bool:
+        return True  # BackupService reads the uploaded zip inline
+
     async def process(self, input: dict, request: Request) -> dict | Response:
         # Handle file upload
         if 'backup_file' not in request.files:
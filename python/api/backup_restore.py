@@ -14,6 +14,10 @@ class BackupRestore(ApiHandler):
     def requires_loopback(cls) -> bool:
         return False
 
+    @classmethod
+    def blocks_loop(cls) -> bool:
+        return True  # BackupService extracts the uploaded zip inline
+
     async def process(self, input: dict, request: Request) -> dict | Response:
         # Handle file upload
         if 'backup_file' not in request.files:
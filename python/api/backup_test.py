@@ -11,6 +11,10 @@ class BackupTest(ApiHandler):
     def requires_loopback(cls) -> bool:
         return False
 
+    @classmethod
+    def blocks_loop(cls) -> bool:
+        return True  # BackupService walks the file tree inline
+
     async def process(self, input: dict, request: Request) -> dict | Response:
         try:
             # Get input parameters
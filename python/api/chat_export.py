@@ -1,3 +1,4 @@
+import asyncio
 from python.helpers.api import ApiHandler, Input, Output, Request, Response
 
 from python.helpers import persist_chat
@@ -9,7 +10,7 @@ class ExportChat(ApiHandler):
             raise Exception("No context id provided")
 
         context = self.get_context(ctxid)
-        content = persist_chat.export_json_chat(context)
+        content = await asyncio.to_thread(persist_chat.export_json_chat, context)
         return {
             "message": "Chats exported.",
             "ctxid": context.id,
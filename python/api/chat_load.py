@@ -1,3 +1,4 @@
+import asyncio
 from python.helpers.api import ApiHandler, Input, Output, Request, Response
 
 
@@ -9,7 +10,7 @@ class LoadChats(ApiHandler):
         if not chats:
             raise Exception("No chats provided")
 
-        ctxids = persist_chat.load_json_chats(chats)
+        ctxids = await asyncio.to_thread(persist_chat.load_json_chats, chats)
 
         return {
             "message": "Chats loaded.",
@@ -1,3 +1,4 @@
+import asyncio
 from python.helpers.api import ApiHandler, Input, Output, Request, Response
 from agent import AgentContext
 from python.helpers import persist_chat
@@ -14,7 +15,7 @@ class RemoveChat(ApiHandler):
             context.reset()
 
         AgentContext.remove(ctxid)
-        persist_chat.remove_chat(ctxid)
+        await asyncio.to_thread(persist_chat.remove_chat, ctxid)
 
         scheduler = TaskScheduler.get()
         await scheduler.reload()
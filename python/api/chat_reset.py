@@ -1,3 +1,4 @@
+import asyncio
 from python.helpers.api import ApiHandler, Input, Output, Request, Response
 
 
@@ -11,7 +12,7 @@ class Reset(ApiHandler):
         # context instance - get or create
         context = self.get_context(ctxid)
         context.reset()
-        persist_chat.save_tmp_chat(context)
+        await asyncio.to_thread(persist_chat.save_tmp_chat, context)
 
         return {
             "message": "Agent restarted.",
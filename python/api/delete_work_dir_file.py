@@ -1,3 +1,5 @@
+import asyncio
+
 from python.helpers.api import ApiHandler, Input, Output, Request, Response
 
 
@@ -27,5 +29,6 @@ class DeleteWorkDirFile(ApiHandler):
 
 
 async def delete_file(file_path: str):
+    # deleting a folder removes its whole tree, keep it off the event loop
     browser = FileBrowser()
-    return browser.delete_file(file_path)
+    return await asyncio.to_thread(browser.delete_file, file_path)
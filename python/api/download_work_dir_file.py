@@ -1,3 +1,4 @@
+import asyncio
 import base64
 from io import BytesIO
 
@@ -28,7 +29,7 @@ class DownloadFile(ApiHandler):
             raise Exception(f"File {file_path} not found")
 
         if file["is_dir"]:
-            zip_file = await runtime.call_development_function(files.zip_dir, file["abs_path"])
+            zip_file = await runtime.call_development_function(zip_dir, file["abs_path"])
             if runtime.is_development():
                 b64 = await runtime.call_development_function(fetch_file, zip_file)
                 file_data = BytesIO(base64.b64decode(b64))
@@ -61,7 +62,16 @@ class DownloadFile(ApiHandler):
         raise Exception(f"File {file_path} not found")
 
 
+async def zip_dir(path):
+    # compressing a folder takes a while, keep it off the event loop
+    return await asyncio.to_thread(files.zip_dir, path)
+
+
 async def fetch_file(path):
+    return await asyncio.to_thread(_read_base64, path)
+
+
+def _read_base64(path):
     with open(path, "rb") as file:
         file_content = file.read()
         return base64.b64encode(file_content).decode("utf-8")
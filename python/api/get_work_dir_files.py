@@ -1,3 +1,5 @@
+import asyncio
+
 from python.helpers.api import ApiHandler, Request, Response
 from python.helpers.file_browser import FileBrowser
 from python.helpers import runtime
@@ -20,11 +22,20 @@ class GetWorkDirFiles(ApiHandler):
 
         # browser = FileBrowser()
         # result = browser.get_files(current_path)
-        result = await runtime.call_development_function(get_files, current_path)
+        result = await runtime.call_development_function(
+            get_files,
+            current_path,
+            sort_by=request.args.get("sort_by", "name"),
+            sort_dir=request.args.get("sort_dir", "asc"),
+            cursor=request.args.get("cursor", 0, type=int),
+            limit=request.args.get("limit", FileBrowser.MAX_ENTRIES, type=int),
+            name_filter=request.args.get("filter", ""),
+        )
 
         return {"data": result}
 
 
-async def get_files(path):
+async def get_files(path, **kwargs):
+    # scanning and sorting a large directory blocks, keep it off the event loop
     browser = FileBrowser()
-    return browser.get_files(path)
+    return await asyncio.to_thread(browser.get_files, path, **kwargs)
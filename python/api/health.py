@@ -1,3 +1,4 @@
+import asyncio
 from python.helpers.api import ApiHandler, Request, Response
 from python.helpers import errors, git
 
@@ -19,7 +20,7 @@ class HealthCheck(ApiHandler):
         gitinfo = None
         error = None
         try:
-            gitinfo = git.get_git_info()
+            gitinfo = await asyncio.to_thread(git.get_git_info)
         except Exception as e:
             error = errors.error_text(e)
 
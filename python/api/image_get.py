@@ -1,7 +1,7 @@
 import base64
 import os
 from python.helpers.api import ApiHandler, Request, Response, send_file
-from python.helpers import files, runtime
+from python.helpers import files, runtime, images
 import io
 from mimetypes import guess_type
 
@@ -19,6 +19,9 @@ class ImageGet(ApiHandler):
             input.get("metadata", request.args.get("metadata", "false")).lower()
             == "true"
         )
+        variant = images.VARIANTS.get(
+            input.get("variant", request.args.get("variant", ""))
+        )
 
         if not path:
             raise ValueError("No path provided")
@@ -44,6 +47,12 @@ class ImageGet(ApiHandler):
        
         if file_ext in image_extensions:
 
+            # serve a cached compressed variant (thumbnail) instead of the original
+            if variant and file_ext != ".svg":
+                response = await _send_variant(path, filename, variant)
+                if response:
+                    return response
+
             # in development environment, try to serve the image from local file system if exists, otherwise from docker
             if runtime.is_development():
                 if files.exists(path):
@@ -80,6 +89,38 @@ class ImageGet(ApiHandler):
             return _send_file_type_icon(file_ext, filename)
 
 
+async def _send_variant(path: str, filename: str, variant: images.ImageVariant):
+    """Return a compressed JPEG variant of the image, None if it cannot be produced"""
+    try:
+        if files.exists(path):
+            content = await images.get_variant_file_async(path, variant)
+        elif runtime.is_development() and await runtime.call_development_function(
+            files.exists, path
+        ):
+            b64_content = await runtime.call_development_function(
+                files.read_file_base64, path
+            )
+            content = await images.get_variant_async(
+                base64.b64decode(b64_content), variant
+            )
+        else:
+            return None
+    except Exception:
+        # not decodable by PIL, fall back to serving the original
+        return None
+
+    response = send_file(
+        io.BytesIO(content),
+        mimetype="image/jpeg",
+        as_attachment=False,
+        download_name=os.path.splitext(filename)[0] + ".jpg",
+    )
+    response.headers["Cache-Control"] = "public, max-age=3600"
+    response.headers["X-File-Type"] = "image"
+    response.headers["X-File-Name"] = filename
+    return response
+
+
 def _send_file_type_icon(file_ext, filename=None):
     """Return appropriate icon for file type"""
 
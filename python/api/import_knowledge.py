@@ -5,6 +5,11 @@ from werkzeug.utils import secure_filename
 
 
 class ImportKnowledge(ApiHandler):
+
+    @classmethod
+    def blocks_loop(cls) -> bool:
+        return True  # saves uploads and re-embeds the knowledge folder inline
+
     async def process(self, input: dict, request: Request) -> dict | Response:
         if "files[]" not in request.files:
             raise Exception("No files part")
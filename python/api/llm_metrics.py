@@ -0,0 +1,26 @@
+from python.helpers.api import ApiHandler, Input, Output, Request, Response
+from python.helpers import llm_metrics
+import models
+
+
+class LlmMetrics(ApiHandler):
+
+    @classmethod
+    def get_methods(cls) -> list[str]:
+        return ["GET"]
+
+    @classmethod
+    def requires_csrf(cls) -> bool:
+        return False  # read-only, scraped by monitoring with basic auth
+
+    async def process(self, input: Input, request: Request) -> Output:
+        if request.args.get("format") == "prometheus":
+            return Response(
+                response=llm_metrics.get_prometheus_text(),
+                status=200,
+                mimetype="text/plain; version=0.0.4",
+            )
+        return {
+            **llm_metrics.get_stats(),
+            "prompt_cache": models.get_prompt_cache_stats(),
+        }
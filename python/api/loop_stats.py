@@ -0,0 +1,27 @@
+from python.helpers.api import ApiHandler, Input, Output, Request, Response
+
+from agent import AgentContext
+from python.helpers.defer import EventLoopThread
+from python.helpers.loop_monitor import BlockingDetector
+
+
+class LoopStats(ApiHandler):
+
+    @classmethod
+    def get_methods(cls) -> list[str]:
+        return ["GET", "POST"]
+
+    async def process(self, input: Input, request: Request) -> Output:
+        detector = BlockingDetector.get()
+        # the blocking detector can be switched on and off at runtime
+        enable = input.get("detector")
+        if enable is True:
+            detector.start()
+        elif enable is False:
+            detector.stop()
+
+        return {
+            "shards": AgentContext.get_loop_stats(),
+            "lag": EventLoopThread.get_lag_stats(),
+            "blocking": detector.get_stats(),
+        }
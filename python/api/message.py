@@ -2,15 +2,24 @@ from agent import AgentContext, UserMessage
 from python.helpers.api import ApiHandler, Request, Response
 
 from python.helpers import files
+from python.helpers.log import LogCursor
+import asyncio
+import json
 import os
+import time
 from werkzeug.utils import secure_filename
 from python.helpers.defer import DeferredTask
 from python.helpers.print_style import PrintStyle
 
 
+STREAM_INTERVAL = 0.25  # min seconds between streamed chunks
+
+
 class Message(ApiHandler):
     async def process(self, input: dict, request: Request) -> dict | Response:
-        task, context = await self.communicate(input=input, request=request)
+        task, context, cursor = await self.communicate(input=input, request=request)
+        if _wants_stream(input, request):
+            return self.respond_stream(task, context, cursor)
         return await self.respond(task, context)
 
     async def respond(self, task: DeferredTask, context: AgentContext):
@@ -20,6 +29,14 @@ class Message(ApiHandler):
             "context": context.id,
         }
 
+    def respond_stream(self, task: DeferredTask, context: AgentContext, cursor: LogCursor):
+        # progress as newline delimited json, the final line carries the same result as respond()
+        return Response(
+            _ProgressStream(task, context, cursor),
+            mimetype="application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     async def communicate(self, input: dict, request: Request):
         # Handle both JSON and multipart/form-data
         if request.content_type.startswith("multipart/form-data"):
@@ -39,7 +56,7 @@ class Message(ApiHandler):
                         continue
                     filename = secure_filename(attachment.filename)
                     save_path = files.get_abs_path(upload_folder_ext, filename)
-                    attachment.save(save_path)
+                    await asyncio.to_thread(attachment.save, save_path)
                     attachment_paths.append(os.path.join(upload_folder_int, filename))
         else:
             # Handle JSON request as before
@@ -84,4 +101,75 @@ class Message(ApiHandler):
             id=message_id,
         )
 
-        return context.communicate(UserMessage(message, attachment_paths)), context
+        # positioned before the task starts, so items it logs right away are streamed too
+        cursor = LogCursor(context.log)
+        return context.communicate(UserMessage(message, attachment_paths)), context, cursor
+
+
+def _wants_stream(input: dict, request: Request) -> bool:
+    if request.content_type.startswith("multipart/form-data"):
+        value = request.form.get("stream", "")
+    else:
+        value = input.get("stream", False)
+    return str(value).lower() in ("true", "1")
+
+
+class _ProgressStream:
+    """Progress of a task as newline delimited json.
+    ASGI servers iterate it asynchronously and wait for progress on their event loop,
+    werkzeug iterates it synchronously in its request thread."""
+
+    def __init__(self, task: DeferredTask, context: AgentContext, cursor: LogCursor):
+        self.task = task
+        self.context = context
+        self.cursor = cursor
+
+    async def __aiter__(self):
+        while True:
+            done = self.task.is_ready()
+            version = self.task.progress_version
+            for line in self._read_lines():
+                yield line
+            if done:
+                break
+            await self.task.wait_progress(version)
+            await asyncio.sleep(STREAM_INTERVAL)  # batch rapid updates
+
+        try:
+            result = await self.task.result()
+            yield self._result_line(result)
+        except Exception as e:
+            yield self._error_line(e)
+
+    def __iter__(self):
+        while True:
+            done = self.task.is_ready()
+            version = self.task.progress_version
+            yield from self._read_lines()
+            if done:
+                break
+            self.task.wait_progress_sync(version)
+            time.sleep(STREAM_INTERVAL)  # batch rapid updates
+
+        try:
+            result = self.task.result_sync()
+            yield self._result_line(result)
+        except Exception as e:
+            yield self._error_line(e)
+
+    def _read_lines(self) -> list[str]:
+        lines = []
+        for item in self.cursor.read():
+            if item["type"] == "response":
+                delta = self.cursor.response_delta(item)
+                if delta:
+                    lines.append(json.dumps({"type": "response", "text": delta}) + "\n")
+            else:
+                lines.append(json.dumps({"type": "log", "item": item}) + "\n")
+        return lines
+
+    def _result_line(self, result) -> str:
+        return json.dumps({"type": "result", "message": result, "context": self.context.id}) + "\n"
+
+    def _error_line(self, error: Exception) -> str:
+        return json.dumps({"type": "error", "error": str(error), "context": self.context.id}) + "\n"
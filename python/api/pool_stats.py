@@ -0,0 +1,20 @@
+from python.helpers.api import ApiHandler, Input, Output, Request, Response
+from python.helpers.browser_pool import BrowserPool
+from python.helpers.mcp_server import McpContextPool
+
+
+class PoolStats(ApiHandler):
+
+    @classmethod
+    def get_methods(cls) -> list[str]:
+        return ["GET"]
+
+    @classmethod
+    def requires_csrf(cls) -> bool:
+        return False  # read-only, scraped by monitoring with basic auth
+
+    async def process(self, input: Input, request: Request) -> Output:
+        return {
+            "mcp_contexts": McpContextPool.get().get_stats(),
+            "browsers": BrowserPool.get().get_stats(),
+        }
@@ -1,3 +1,4 @@
+import asyncio
 from python.helpers.api import ApiHandler, Input, Output, Request
 from python.helpers.task_scheduler import TaskScheduler, TaskState
 from python.helpers.localization import Localization
@@ -44,7 +45,7 @@ class SchedulerTaskDelete(ApiHandler):
         # This is a dedicated context for the task, so we remove it
         if context and context.id == task.uuid:
             AgentContext.remove(context.id)
-            persist_chat.remove_chat(context.id)
+            await asyncio.to_thread(persist_chat.remove_chat, context.id)
 
         # Remove the task
         await scheduler.remove_task_by_uuid(task_id)
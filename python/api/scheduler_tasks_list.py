@@ -22,7 +22,7 @@ class SchedulerTasksList(ApiHandler):
             # Use the scheduler's convenience method for task serialization
             tasks_list = scheduler.serialize_all_tasks()
 
-            return {"tasks": tasks_list}
+            return {"tasks": tasks_list, "executor": scheduler.get_executor_stats()}
 
         except Exception as e:
             PrintStyle.error(f"Failed to list tasks: {str(e)} {traceback.format_exc()}")
@@ -1,3 +1,4 @@
+import asyncio
 from python.helpers.api import ApiHandler, Request, Response
 
 from python.helpers import settings
@@ -8,5 +9,5 @@ from typing import Any
 class SetSettings(ApiHandler):
     async def process(self, input: dict[Any, Any], request: Request) -> dict[Any, Any] | Response:
         set = settings.convert_in(input)
-        set = settings.set_settings(set)
+        set = await asyncio.to_thread(settings.set_settings, set)
         return {"settings": set}
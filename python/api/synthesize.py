@@ -1,5 +1,6 @@
 # api/synthesize.py
 
+import json
 from python.helpers.api import ApiHandler, Request, Response
 
 from python.helpers import runtime, settings, kokoro_tts
@@ -30,6 +31,14 @@ class Synthesize(ApiHandler):
             #         audio_parts.append(chunk_audio)
             #     return {"audio_parts": audio_parts, "success": True}
 
+            # stream sentence by sentence as newline delimited json
+            if input.get("stream", False):
+                return Response(
+                    _stream_audio(text),
+                    mimetype="application/x-ndjson",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+                )
+
             # audio is chunked on the frontend for better flow
             audio = await kokoro_tts.synthesize_sentences([text])
             return {"audio": audio, "success": True}
@@ -91,4 +100,13 @@ class Synthesize(ApiHandler):
     #     if current_chunk.strip():
     #         chunks.append(current_chunk.strip())
         
-    #     return chunks if chunks else [text]
\ No newline at end of file
+    #     return chunks if chunks else [text]
+
+
+def _stream_audio(text: str):
+    # runs in the server request thread while the response is sent, not on the event loop
+    try:
+        for index, audio in enumerate(kokoro_tts.synthesize_stream([text])):
+            yield json.dumps({"audio": audio, "index": index, "success": True}) + "\n"
+    except Exception as e:
+        yield json.dumps({"error": str(e), "success": False}) + "\n"
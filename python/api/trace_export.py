@@ -0,0 +1,26 @@
+import json
+
+from python.helpers.api import ApiHandler, Input, Output, Request, Response
+from python.helpers import tracing
+
+
+class TraceExport(ApiHandler):
+
+    async def process(self, input: Input, request: Request) -> Output:
+        # tracing can be switched on and off at runtime
+        enabled = input.get("enabled")
+        if enabled is not None:
+            tracing.set_enabled(str(enabled).lower() in ("1", "true"))
+
+        ctxid = input.get("context", "")
+        if not ctxid:
+            return {"enabled": tracing.is_enabled()}
+
+        format = input.get("format", "chrome")
+        data = tracing.export_chrome(ctxid) if format == "chrome" else tracing.export_json(ctxid)
+        return Response(
+            response=json.dumps(data, default=str),
+            status=200,
+            mimetype="application/json",
+            headers={"Content-Disposition": f'attachment; filename="{ctxid}.{format}.json"'},
+        )
@@ -13,4 +13,4 @@ class Transcribe(ApiHandler):
 
         set = settings.get_settings()
         result = await whisper.transcribe(set["stt_model_size"], audio) # type: ignore
-        return result
+        return {**result, "stats": whisper.get_stats()}
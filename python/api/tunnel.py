@@ -1,3 +1,4 @@
+import asyncio
 from python.helpers.api import ApiHandler, Request, Response
 from python.helpers import runtime
 from python.helpers.tunnel_manager import TunnelManager
@@ -17,8 +18,7 @@ class Tunnel(ApiHandler):
             tunnel_url = tunnel_manager.start_tunnel(port, provider)
             if tunnel_url is None:
                 # Add a little delay and check again - tunnel might be starting
-                import time
-                time.sleep(2)
+                await asyncio.sleep(2)
                 tunnel_url = tunnel_manager.get_tunnel_url()
             
             return {
@@ -1,6 +1,7 @@
 from python.helpers.api import ApiHandler, Request, Response
 from python.helpers import dotenv, runtime
 from python.helpers.tunnel_manager import TunnelManager
+import asyncio
 import requests
 
 
@@ -16,7 +17,9 @@ class TunnelProxy(ApiHandler):
         # first verify the service is running:
         service_ok = False
         try:
-            response = requests.post(f"http://localhost:{tunnel_api_port}/", json={"action": "health"})
+            response = await asyncio.to_thread(
+                requests.post, f"http://localhost:{tunnel_api_port}/", json={"action": "health"}
+            )
             if response.status_code == 200:
                 service_ok = True
         except Exception as e:
@@ -25,7 +28,9 @@ class TunnelProxy(ApiHandler):
         # forward this request to the tunnel service if OK
         if service_ok:
             try:
-                response = requests.post(f"http://localhost:{tunnel_api_port}/", json=input)
+                response = await asyncio.to_thread(
+                    requests.post, f"http://localhost:{tunnel_api_port}/", json=input
+                )
                 return response.json()
             except Exception as e:
                 return {"error": str(e)}
@@ -1,3 +1,4 @@
+import asyncio
 from python.helpers.api import ApiHandler, Request, Response
 from python.helpers import files
 from werkzeug.utils import secure_filename
@@ -14,7 +15,7 @@ class UploadFile(ApiHandler):
         for file in file_list:
             if file and self.allowed_file(file.filename):  # Check file type
                 filename = secure_filename(file.filename) # type: ignore
-                file.save(files.get_abs_path("tmp/upload", filename))
+                await asyncio.to_thread(file.save, files.get_abs_path("tmp/upload", filename))
                 saved_filenames.append(filename)
 
         return {"filenames": saved_filenames}  # Return saved filenames
@@ -1,3 +1,4 @@
+import asyncio
 import base64
 from werkzeug.datastructures import FileStorage
 from python.helpers.api import ApiHandler, Request, Response
@@ -53,12 +54,12 @@ async def upload_files(uploaded_files: list[FileStorage], current_path: str):
                 failed.append(file.filename)
     else:
         browser = FileBrowser()
-        successful, failed = browser.save_files(uploaded_files, current_path)
+        successful, failed = await asyncio.to_thread(browser.save_files, uploaded_files, current_path)
 
     return successful, failed
 
 
 async def upload_file(current_path: str, filename: str, base64_content: str):
     browser = FileBrowser()
-    return browser.save_file_b64(current_path, filename, base64_content)
+    return await asyncio.to_thread(browser.save_file_b64, current_path, filename, base64_content)
 
@@ -0,0 +1,28 @@
+from python.helpers.extension import Extension
+from python.helpers import settings
+from agent import LoopData
+from python.extensions.message_loop_prompts_after._50_recall_memories import (
+    DATA_NAME_SPECULATIVE,
+    RecallMemories,
+    cancel_recall,
+)
+
+
+class SpeculativeRecall(Extension):
+    async def execute(self, loop_data: LoopData = LoopData(), **kwargs):
+        # start the next recall now, so it runs while the loop finishes and is ready at the next prompt build
+        set = settings.get_settings()
+        next_iteration = loop_data.iteration + 1
+        if (
+            loop_data.params_temporary.get("loop_finished")
+            or not set["memory_recall_enabled"]
+            or next_iteration % set["memory_recall_interval"] != 0
+        ):
+            return
+
+        previous = self.agent.get_data(DATA_NAME_SPECULATIVE)
+        if previous:
+            cancel_recall(previous)
+
+        recall = RecallMemories(agent=self.agent).start_recall(loop_data, next_iteration, speculative=True)
+        self.agent.set_data(DATA_NAME_SPECULATIVE, recall)
@@ -1,11 +1,27 @@
 import asyncio
+import time
+from dataclasses import dataclass, field
 from python.helpers.extension import Extension
 from python.helpers.memory import Memory
+from python.helpers.log import LogItem
 from agent import LoopData
 from python.tools.memory_load import DEFAULT_THRESHOLD as DEFAULT_MEMORY_THRESHOLD
 from python.helpers import dirty_json, errors, settings
 
 DATA_NAME_TASK = "_recall_memories_task"
+DATA_NAME_SPECULATIVE = "_recall_memories_speculative"
+DATA_NAME_STATS = "_recall_memories_stats"
+
+
+@dataclass
+class Recall:
+    iteration: int  # loop iteration the results are meant for
+    fingerprint: tuple
+    speculative: bool = False  # started ahead of the iteration that needs it
+    task: "asyncio.Task[dict] | None" = None
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: float | None = None
+    log_item: LogItem | None = None
 
 
 class RecallMemories(Extension):
@@ -24,37 +40,92 @@ class RecallMemories(Extension):
 
         # every 3 iterations (or the first one) recall memories
         if loop_data.iteration % set["memory_recall_interval"] == 0:
-            task = asyncio.create_task(
-                self.search_memories(loop_data=loop_data, **kwargs)
-            )
+            # use the recall started at the end of the previous iteration if still valid
+            recall = self.take_speculative(loop_data)
+            if not recall:
+                recall = self.start_recall(loop_data, loop_data.iteration)
+            task = asyncio.create_task(self.apply_recall(loop_data, recall))
         else:
             task = None
 
         # set to agent to be able to wait for it
         self.agent.set_data(DATA_NAME_TASK, task)
 
-    async def search_memories(self, loop_data: LoopData, **kwargs):
-
-        # cleanup
+    def fingerprint(self, loop_data: LoopData) -> tuple:
+        # the recall query is built from the user message and the end of history
+        messages = self.agent.history.current.messages
+        return (id(loop_data.user_message), id(messages[-1]) if messages else None)
+
+    def start_recall(self, loop_data: LoopData, iteration: int, speculative: bool = False) -> Recall:
+        recall = Recall(iteration=iteration, fingerprint=self.fingerprint(loop_data), speculative=speculative)
+        recall.task = asyncio.create_task(self.search_memories(loop_data=loop_data, recall=recall))
+        recall.task.add_done_callback(lambda _: setattr(recall, "finished_at", time.perf_counter()))
+        return recall
+
+    def take_speculative(self, loop_data: LoopData) -> Recall | None:
+        recall: Recall | None = self.agent.get_data(DATA_NAME_SPECULATIVE)
+        self.agent.set_data(DATA_NAME_SPECULATIVE, None)
+        if not recall:
+            return None
+        if (
+            recall.iteration == loop_data.iteration
+            and recall.fingerprint == self.fingerprint(loop_data)
+            and recall.task
+            and not recall.task.cancelled()
+        ):
+            return recall
+        # conversation moved on (intervention, new user message), results would be outdated
+        cancel_recall(recall)
+        self.get_stats()["stale"] += 1
+        return None
+
+    async def apply_recall(self, loop_data: LoopData, recall: Recall):
+        waiting_since = time.perf_counter()
+        extras_new = await recall.task  # type: ignore
+
+        # replace previous recall results
         extras = loop_data.extras_persistent
         if "memories" in extras:
             del extras["memories"]
         if "solutions" in extras:
             del extras["solutions"]
-
+        extras.update(extras_new)
+
+        # how much of the recall ran in the background while the loop was busy
+        stats = self.get_stats()
+        finished_at = recall.finished_at or time.perf_counter()
+        duration = finished_at - recall.started_at
+        stats["recalls"] += 1
+        stats["total_time"] += duration
+        if recall.speculative:
+            stats["speculative"] += 1
+            stats["hidden_time"] += max(0.0, min(duration, waiting_since - recall.started_at))
+
+    def get_stats(self) -> dict:
+        stats = self.agent.get_data(DATA_NAME_STATS)
+        if stats is None:
+            stats = {"recalls": 0, "speculative": 0, "stale": 0, "total_time": 0.0, "hidden_time": 0.0}
+            self.agent.set_data(DATA_NAME_STATS, stats)
+        return stats
+
+    async def search_memories(self, loop_data: LoopData, recall: Recall, **kwargs) -> dict:
+
+        # results to place into persistent extras
+        extras = {}
 
         set = settings.get_settings()
         # try:
 
         # if recall is disabled, return
         if not set["memory_recall_enabled"]:
-            return
+            return extras
 
         # show full util message
         log_item = self.agent.context.log.log(
             type="util",
             heading="Searching memories...",
         )
+        recall.log_item = log_item
 
         # get system message and chat history for util llm
         system = self.agent.read_prompt("memory.memories_query.sys.md")
@@ -94,7 +165,7 @@ class RecallMemories(Extension):
                 log_item.update(
                     heading="Failed to generate memory query",
                 )
-                return
+                return extras
         
         # otherwise use the message and history as query
         else:
@@ -123,7 +194,7 @@ class RecallMemories(Extension):
             log_item.update(
                 heading="No memories or solutions found",
             )
-            return
+            return extras
 
         # if post filtering is enabled
         if set["memory_recall_post_filter"]:
@@ -201,3 +272,11 @@ class RecallMemories(Extension):
             extras["solutions"] = self.agent.parse_prompt(
                 "agent.system.solutions.md", solutions=solutions_txt
             )
+        return extras
+
+
+def cancel_recall(recall: Recall):
+    if recall.task and not recall.task.done():
+        recall.task.cancel()
+        if recall.log_item:
+            recall.log_item.update(heading="Memory search restarted, conversation changed")
@@ -1,21 +1,39 @@
 from typing import Any
 from python.helpers.extension import Extension
 from python.helpers.mcp_handler import MCPConfig
+from python.helpers import settings
 from agent import Agent, LoopData
 
+DATA_NAME_CACHE = "_system_prompt_cache"
+
 
 class SystemPrompt(Extension):
 
     async def execute(self, system_prompt: list[str] = [], loop_data: LoopData = LoopData(), **kwargs: Any):
+        # prompts only change with these inputs, reuse the rendered parts from previous iterations
+        key = (
+            self.agent.config.profile,
+            self.agent.config.chat_model.vision,
+            settings.get_settings_version(),
+            MCPConfig.get_tools_version(),
+        )
+        cached = self.agent.get_data(DATA_NAME_CACHE)
+        if cached and cached[0] == key:
+            system_prompt.extend(cached[1])
+            return
+
         # append main system prompt and tools
         main = get_main_prompt(self.agent)
         tools = get_tools_prompt(self.agent)
         mcp_tools = get_mcp_tools_prompt(self.agent)
 
-        system_prompt.append(main)
-        system_prompt.append(tools)
+        parts = [main, tools]
         if mcp_tools:
-            system_prompt.append(mcp_tools)
+            parts.append(mcp_tools)
+
+        # key was taken before collecting, so tools arriving meanwhile trigger a rebuild next time
+        self.agent.set_data(DATA_NAME_CACHE, (key, parts))
+        system_prompt.extend(parts)
 
 
 def get_main_prompt(agent: Agent):
@@ -26,6 +44,8 @@ def get_tools_prompt(agent: Agent):
     prompt = agent.read_prompt("agent.system.tools.md")
     if agent.config.chat_model.vision:
         prompt += '\n\n' + agent.read_prompt("agent.system.tools_vision.md")
+    if agent.config.parallel_tools:
+        prompt += '\n\n' + agent.read_prompt("agent.system.tools_parallel.md")
     return prompt
 
 
@@ -1,13 +1,31 @@
+import os
 from datetime import datetime
 from python.helpers.extension import Extension
 from agent import Agent, LoopData
-from python.helpers import files, memory
+from python.helpers import files, memory, settings
+
+
+DATA_NAME_CACHE = "_behaviour_prompt_cache"
 
 
 class BehaviourPrompt(Extension):
 
     async def execute(self, system_prompt: list[str]=[], loop_data: LoopData = LoopData(), **kwargs):
-        prompt = read_rules(self.agent)
+        # rebuild only when the rules file or the settings change
+        rules_file = get_custom_rules_file(self.agent)
+        try:
+            stat = os.stat(rules_file)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = None
+        key = (rules_file, stamp, self.agent.config.profile, settings.get_settings_version())
+
+        cached = self.agent.get_data(DATA_NAME_CACHE)
+        if cached and cached[0] == key:
+            prompt = cached[1]
+        else:
+            prompt = read_rules(self.agent)
+            self.agent.set_data(DATA_NAME_CACHE, (key, prompt))
         system_prompt.insert(0, prompt) #.append(prompt)
 
 def get_custom_rules_file(agent: Agent):
@@ -39,6 +39,11 @@ class ApiHandler:
     def requires_csrf(cls) -> bool:
         return cls.requires_auth()
 
+    @classmethod
+    def blocks_loop(cls) -> bool:
+        # handlers doing long blocking work inside their awaits, the ASGI server runs them on a worker thread
+        return False
+
     @abstractmethod
     async def process(self, input: Input, request: Request) -> Output:
         pass
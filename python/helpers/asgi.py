@@ -0,0 +1,237 @@
+import asyncio
+import inspect
+import io
+import sys
+
+import uvicorn
+from flask import Flask, Response
+from flask.globals import request_ctx
+from flask.signals import request_started
+from starlette.middleware.exceptions import ExceptionMiddleware
+from starlette.routing import Mount, Router
+from starlette.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Receive, Scope, Send
+from werkzeug.exceptions import HTTPException
+
+from python.helpers.print_style import PrintStyle
+from python.helpers.errors import format_error
+
+
+class FlaskBridge:
+    """Serves the routes of a Flask app from an ASGI server.
+    Async views are awaited directly on the server loop instead of on a new event loop
+    in a worker thread per request, which is what Flask does under WSGI.
+    Paths that resolve to Flask's static endpoint are served by `static` when given."""
+
+    def __init__(self, app: Flask, static: ASGIApp | None = None):
+        self.app = app
+        self.static = static
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return
+        if self.static and self._is_static(scope):
+            return await self.static(scope, receive, send)
+
+        body = await _read_body(receive)
+        response = await self._dispatch(_build_environ(scope, body))
+        await _send_response(response, send)
+
+    def _is_static(self, scope: Scope) -> bool:
+        adapter = self.app.url_map.bind("localhost")
+        try:
+            endpoint, _ = adapter.match(scope["path"], method=scope["method"])
+        except HTTPException:
+            return False
+        return endpoint == "static"
+
+    async def _dispatch(self, environ: dict) -> Response:
+        # same steps as Flask.wsgi_app and full_dispatch_request, only the view call differs
+        app = self.app
+        if self._has_async_hooks():
+            # async hooks go through asgiref's async_to_sync, which cannot run on the server loop thread
+            return await asyncio.to_thread(self._dispatch_sync, environ)
+        ctx = app.request_context(environ)
+        error: BaseException | None = None
+        try:
+            try:
+                ctx.push()  # flask globals are context variables, so each request task sees its own
+                return await self._full_dispatch()
+            except Exception as e:
+                error = e
+                PrintStyle.error(f"Request error: {format_error(e)}")
+                return app.handle_exception(e)
+        finally:
+            ctx.pop(error)
+
+    def _dispatch_sync(self, environ: dict) -> Response:
+        # the whole request on a worker thread, exactly as under WSGI
+        app = self.app
+        with app.request_context(environ):
+            try:
+                return app.full_dispatch_request()
+            except Exception as e:
+                PrintStyle.error(f"Request error: {format_error(e)}")
+                return app.handle_exception(e)
+
+    async def _full_dispatch(self) -> Response:
+        app = self.app
+        try:
+            request_started.send(app, _async_wrapper=app.ensure_sync)
+            rv = app.preprocess_request()
+            if rv is None:
+                rv = await self._dispatch_view()
+        except Exception as e:
+            # registered error handlers and HTTP errors, anything unhandled is re-raised
+            rv = app.handle_user_exception(e)
+        return app.finalize_request(rv)
+
+    async def _dispatch_view(self):
+        app = self.app
+        req = request_ctx.request
+        if req.routing_exception is not None:
+            app.raise_routing_exception(req)
+        rule = req.url_rule
+        if getattr(rule, "provide_automatic_options", False) and req.method == "OPTIONS":
+            return app.make_default_options_response()
+        view = app.view_functions[rule.endpoint]  # type: ignore
+        if inspect.iscoroutinefunction(view) and not getattr(view, "blocks_loop", False):
+            return await view(**req.view_args)  # type: ignore
+        # sync views and blocking handlers run on a worker thread with their own loop, like under WSGI
+        return await asyncio.to_thread(app.ensure_sync(view), **req.view_args)  # type: ignore
+
+    def _has_async_hooks(self) -> bool:
+        app = self.app
+        registries = [
+            app.before_request_funcs,
+            app.after_request_funcs,
+            app.teardown_request_funcs,
+            app.url_value_preprocessors,
+        ]
+        hooks = [f for registry in registries for funcs in registry.values() for f in funcs]
+        hooks += [
+            handler
+            for codes in app.error_handler_spec.values()
+            for handlers in codes.values()
+            for handler in handlers.values()
+        ]
+        return any(inspect.iscoroutinefunction(f) for f in hooks)
+
+
+class AsgiServer:
+    """uvicorn server with the serve_forever/shutdown interface of werkzeug's server."""
+
+    def __init__(self, app: ASGIApp, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.server = uvicorn.Server(
+            uvicorn.Config(
+                app,
+                host=host,
+                port=port,
+                loop="asyncio",  # nest_asyncio cannot patch uvloop
+                access_log=False,
+                log_level="warning",
+            )
+        )
+
+    def log_startup(self):
+        PrintStyle().print(f"ASGI server running on http://{self.host}:{self.port}")
+
+    def serve_forever(self):
+        self.server.run()
+
+    def shutdown(self):
+        self.server.should_exit = True
+
+
+def make_server(
+    host: str,
+    port: int,
+    app: Flask,
+    mounts: dict[str, ASGIApp] | None = None,
+    static_dir: str | None = None,
+) -> AsgiServer:
+    # StaticFiles signals 404/405 by raising, the middleware turns that into a response
+    static = ExceptionMiddleware(StaticFiles(directory=static_dir)) if static_dir else None
+    router = Router(
+        routes=[Mount(path, app=mounted) for path, mounted in (mounts or {}).items()],
+        redirect_slashes=False,
+        default=FlaskBridge(app, static),
+    )
+    return AsgiServer(router, host, port)
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _build_environ(scope: Scope, body: bytes) -> dict:
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode().decode("latin1"),
+        "PATH_INFO": scope["path"].encode().decode("latin1"),
+        "QUERY_STRING": scope["query_string"].decode("latin1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope["headers"]:
+        name = raw_name.decode("latin1")
+        value = raw_value.decode("latin1")
+        if name == "content-length":
+            continue
+        if name == "content-type":
+            environ["CONTENT_TYPE"] = value
+            continue
+        key = "HTTP_" + name.upper().replace("-", "_")
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def _send_response(response: Response, send: Send):
+    headers = [
+        (name.lower().encode("latin1"), value.encode("latin1"))
+        for name, value in response.headers.items()
+    ]
+    await send({"type": "http.response.start", "status": response.status_code, "headers": headers})
+    try:
+        if response.is_streamed and hasattr(response.response, "__aiter__"):
+            # async streams wait for their data on this loop
+            async for chunk in response.response:  # type: ignore
+                if isinstance(chunk, str):
+                    chunk = chunk.encode()
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        elif response.is_streamed:
+            # file wrappers read from disk, pull each chunk on a worker thread
+            chunks = iter(response.iter_encoded())
+            while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        else:
+            await send({"type": "http.response.body", "body": response.get_data()})
+    finally:
+        response.close()
@@ -1,10 +1,9 @@
 import os
-import io
 import base64
-from PIL import Image
 from typing import Dict, List, Optional, Tuple
 from werkzeug.utils import secure_filename
 
+from python.helpers import images
 from python.helpers.print_style import PrintStyle
 
 class AttachmentManager:
@@ -73,21 +72,11 @@ class AttachmentManager:
 
   def generate_image_preview(self, image_path: str, max_size: int = 800) -> Optional[str]:
       try:
-          with Image.open(image_path) as img:
-              # Convert image if needed
-              if img.mode in ('RGBA', 'P'):
-                  img = img.convert('RGB')
-              
-              # Resize for preview
-              img.thumbnail((max_size, max_size))
-              
-              # Save to buffer
-              buffer = io.BytesIO()
-              img.save(buffer, format="JPEG", quality=70, optimize=True)
-              
-              # Convert to base64
-              return base64.b64encode(buffer.getvalue()).decode('utf-8')
+          variant = images.VARIANT_THUMB
+          if max_size != variant.max_size:
+              variant = images.ImageVariant(f"thumb{max_size}", max_size=max_size, quality=variant.quality)
+          preview = images.get_variant_file(image_path, variant)
+          return base64.b64encode(preview).decode('utf-8')
       except Exception as e:
           PrintStyle.error(f"Error generating preview for {image_path}: {e}")
           return None
-      
\ No newline at end of file
@@ -0,0 +1,283 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Playwright
+
+from python.helpers import files
+from python.helpers.defer import EventLoopThread
+from python.helpers.playwright import ensure_playwright_binary
+from python.helpers.print_style import PrintStyle
+
+# playwright objects are bound to the event loop that created them,
+# so every browser agent task runs on this one shared loop thread
+POOL_THREAD = "BrowserPool"
+
+MAX_BROWSERS = 2  # chromium processes kept by the pool
+MAX_CONTEXTS_PER_BROWSER = 8  # isolated agent contexts per chromium process
+MIN_WARM_BROWSERS = 1  # idle browsers kept running for fast startup
+BROWSER_IDLE_TIMEOUT = 300  # seconds before an unused browser above MIN_WARM_BROWSERS is closed
+# a finished task keeps its context (open pages, cookies) for the next task of the same agent,
+# until this timeout or until another agent needs the slot and it is the longest idle one
+LEASE_IDLE_TIMEOUT = 600
+ACQUIRE_TIMEOUT = 120  # seconds acquire waits for a free context slot before giving up
+
+VIEWPORT = {"width": 1024, "height": 2048}
+
+
+@dataclass
+class _PooledBrowser:
+    browser: Browser
+    contexts: int = 0
+    idle_since: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class BrowserLease:
+    owner: str
+    browser: Browser
+    context: BrowserContext
+    acquired_at: float = field(default_factory=time.monotonic)
+    busy: bool = True  # a task is running on the context, it is never reclaimed meanwhile
+    idle_since: float = field(default_factory=time.monotonic)
+    released: bool = False  # closed by the pool, the owner has to acquire a new lease
+
+
+class BrowserPool:
+    _instance: "BrowserPool | None" = None
+
+    @classmethod
+    def get(cls) -> "BrowserPool":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.playwright: Playwright | None = None
+        self._browsers: list[_PooledBrowser] = []
+        self._leases: dict[int, tuple[_PooledBrowser, BrowserLease]] = {}  # id(context) -> browser, lease
+        self._condition: asyncio.Condition | None = None
+        self._launching = 0
+        self._stats = {
+            "launches": 0,
+            "launch_time": 0.0,
+            "reuses": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+            "evictions": 0,
+            "crashes": 0,
+            "reclaims": 0,
+            "timeouts": 0,
+        }
+
+    async def acquire(self, owner: str, timeout: float = ACQUIRE_TIMEOUT) -> BrowserLease:
+        """Return a new isolated browser context, on a warm browser if one has capacity.
+        When all browsers are at MAX_CONTEXTS_PER_BROWSER, the longest idle lease is reclaimed,
+        if every context is busy this waits up to timeout seconds and then raises TimeoutError."""
+        condition = self._get_condition()
+        waited_since = None
+        reclaimed: BrowserLease | None = None
+        deadline = time.monotonic() + timeout
+        async with condition:
+            while True:
+                self._drop_disconnected()
+                pooled = self._pick_browser()
+                if pooled:
+                    self._stats["reuses"] += 1
+                    break
+                if len(self._browsers) + self._launching < MAX_BROWSERS:
+                    pooled = await self._launch(condition)
+                    break
+                reclaimed = self._reclaim_idle()
+                if reclaimed:
+                    # the slot passes straight to this caller, its old context is closed below
+                    pooled = self._leases.pop(id(reclaimed.context))[0]
+                    pooled.contexts -= 1
+                    self._stats["reclaims"] += 1
+                    break
+                if waited_since is None:
+                    waited_since = time.monotonic()
+                    self._stats["waits"] += 1
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError()
+                    await asyncio.wait_for(condition.wait(), remaining)
+                except asyncio.TimeoutError:
+                    self._stats["timeouts"] += 1
+                    raise TimeoutError(
+                        f"No free browser context after {timeout:.0f} seconds, "
+                        f"all {MAX_BROWSERS * MAX_CONTEXTS_PER_BROWSER} are busy with running browser tasks"
+                    ) from None
+            pooled.contexts += 1
+
+        if waited_since is not None:
+            self._stats["wait_time"] += time.monotonic() - waited_since
+        if reclaimed:
+            await self._close_context(reclaimed)
+
+        try:
+            context = await self._new_context(pooled.browser)
+        except Exception:
+            await self._release_slot(pooled)
+            raise
+        lease = BrowserLease(owner=owner, browser=pooled.browser, context=context)
+        self._leases[id(context)] = (pooled, lease)
+        return lease
+
+    async def release(self, lease: BrowserLease):
+        entry = self._leases.pop(id(lease.context), None)
+        if lease.released:
+            return
+        await self._close_context(lease)
+        if entry:
+            await self._release_slot(entry[0])
+
+    def set_busy(self, lease: BrowserLease):
+        """A task starts on the lease, call on the pool loop right after checking lease.released."""
+        lease.busy = True
+
+    async def set_idle(self, lease: BrowserLease):
+        """The task on the lease finished, the context stays with its owner but can be reclaimed."""
+        condition = self._get_condition()
+        async with condition:
+            lease.busy = False
+            lease.idle_since = time.monotonic()
+            condition.notify()  # a waiter can reclaim it now
+        asyncio.get_running_loop().call_later(
+            LEASE_IDLE_TIMEOUT, lambda: asyncio.ensure_future(self._release_idle())
+        )
+
+    def release_threadsafe(self, lease: BrowserLease):
+        """Release from any thread, the context is closed on the pool loop."""
+        EventLoopThread(POOL_THREAD).run_coroutine(self.release(lease))
+
+    def get_stats(self) -> dict[str, Any]:
+        launches = self._stats["launches"]
+        return {
+            **self._stats,
+            "browsers": len(self._browsers),
+            "active_contexts": sum(b.contexts for b in self._browsers),
+            "idle_contexts": sum(1 for _, lease in self._leases.values() if not lease.busy),
+            "avg_launch_time": round(self._stats["launch_time"] / launches, 3) if launches else 0.0,
+        }
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _pick_browser(self) -> _PooledBrowser | None:
+        # least loaded browser with free capacity
+        candidates = [b for b in self._browsers if b.contexts < MAX_CONTEXTS_PER_BROWSER]
+        return min(candidates, key=lambda b: b.contexts) if candidates else None
+
+    def _reclaim_idle(self) -> BrowserLease | None:
+        idle = [lease for _, lease in self._leases.values() if not lease.busy]
+        if not idle:
+            return None
+        lease = min(idle, key=lambda lease: lease.idle_since)
+        lease.released = True
+        return lease
+
+    async def _release_idle(self):
+        now = time.monotonic()
+        expired = [
+            lease for _, lease in list(self._leases.values())
+            if not lease.busy and now - lease.idle_since >= LEASE_IDLE_TIMEOUT
+        ]
+        for lease in expired:
+            if lease.busy or lease.released:
+                continue  # picked up again by its owner meanwhile
+            await self.release(lease)
+
+    async def _close_context(self, lease: BrowserLease):
+        lease.released = True
+        try:
+            await lease.context.close()
+        except Exception as e:
+            PrintStyle().error(f"Error closing browser context of {lease.owner}: {e}")
+
+    def _drop_disconnected(self):
+        for pooled in list(self._browsers):
+            if not pooled.browser.is_connected():
+                self._browsers.remove(pooled)
+                self._stats["crashes"] += 1
+                # contexts of a crashed browser are gone, their owners acquire new ones
+                for key, (owner_browser, lease) in list(self._leases.items()):
+                    if owner_browser is pooled:
+                        lease.released = True
+                        del self._leases[key]
+
+    async def _launch(self, condition: asyncio.Condition) -> _PooledBrowser:
+        # launch outside the lock so other agents can use existing browsers meanwhile
+        self._launching += 1
+        condition.release()
+        started = time.monotonic()
+        try:
+            browser = await self._start_browser()
+        finally:
+            await condition.acquire()
+            self._launching -= 1
+
+        self._stats["launches"] += 1
+        self._stats["launch_time"] += time.monotonic() - started
+        pooled = _PooledBrowser(browser=browser)
+        self._browsers.append(pooled)
+        condition.notify_all()  # waiters can use the new browser's remaining capacity
+        return pooled
+
+    async def _start_browser(self) -> Browser:
+        if not self.playwright:
+            self.playwright = await async_playwright().start()
+        # for some reason we need to provide exact path to headless shell, otherwise it looks for headed browser
+        return await self.playwright.chromium.launch(
+            executable_path=str(ensure_playwright_binary()),
+            headless=True,
+            chromium_sandbox=False,
+            args=["--headless=new"],
+        )
+
+    async def _new_context(self, browser: Browser) -> BrowserContext:
+        context = await browser.new_context(
+            accept_downloads=True,
+            ignore_https_errors=True,
+            bypass_csp=True,
+            viewport=VIEWPORT,  # type: ignore
+            screen=VIEWPORT,  # type: ignore
+        )
+        await context.add_init_script(path=files.get_abs_path("lib/browser/init_override.js"))
+        return context
+
+    async def _release_slot(self, pooled: _PooledBrowser):
+        condition = self._get_condition()
+        async with condition:
+            pooled.contexts = max(0, pooled.contexts - 1)
+            if pooled.contexts == 0:
+                pooled.idle_since = time.monotonic()
+                asyncio.get_running_loop().call_later(
+                    BROWSER_IDLE_TIMEOUT, lambda: asyncio.ensure_future(self._evict_idle())
+                )
+            condition.notify()
+
+    async def _evict_idle(self):
+        condition = self._get_condition()
+        async with condition:
+            now = time.monotonic()
+            idle = [
+                b for b in self._browsers
+                if b.contexts == 0 and now - b.idle_since >= BROWSER_IDLE_TIMEOUT
+            ]
+            # keep the most recently used ones warm
+            idle.sort(key=lambda b: b.idle_since)
+            keep = max(0, MIN_WARM_BROWSERS - (len(self._browsers) - len(idle)))
+            evict = idle[: max(0, len(idle) - keep)]
+            for pooled in evict:
+                self._browsers.remove(pooled)
+        for pooled in evict:
+            self._stats["evictions"] += 1
+            try:
+                await pooled.browser.close()
+            except Exception as e:
+                PrintStyle().error(f"Error closing idle browser: {e}")
@@ -1,11 +1,33 @@
 import asyncio
 from dataclasses import dataclass
 import threading
+import time
+import zlib
 from concurrent.futures import Future
 from typing import Any, Callable, Optional, Coroutine, TypeVar, Awaitable
 
 T = TypeVar("T")
 
+LAG_MONITOR_INTERVAL = 0.2  # seconds between loop lag probes
+
+
+@dataclass
+class LoopLag:
+    interval: float = LAG_MONITOR_INTERVAL
+    last: float = 0.0
+    max: float = 0.0
+    avg: float = 0.0  # exponential moving average
+    samples: int = 0
+    last_tick: float = 0.0  # perf_counter of the last probe, goes stale while the loop is blocked
+
+    def record(self, lag: float):
+        self.last_tick = time.perf_counter()
+        self.last = lag
+        self.max = max(self.max, lag)
+        self.avg = lag if not self.samples else self.avg * 0.9 + lag * 0.1
+        self.samples += 1
+
+
 class EventLoopThread:
     _instances = {}
     _lock = threading.Lock()
@@ -13,6 +35,9 @@ class EventLoopThread:
     def __init__(self, thread_name: str = "Background") -> None:
         """Initialize the event loop thread."""
         self.thread_name = thread_name
+        if not hasattr(self, "lag"):
+            self.lag: LoopLag | None = None
+            self._lag_monitor: Future | None = None
         self._start()
 
     def __new__(cls, thread_name: str = "Background"):
@@ -42,6 +67,7 @@ class EventLoopThread:
             self.loop.stop()
         self.loop = None
         self.thread = None
+        self._lag_monitor = None
 
     def run_coroutine(self, coro):
         self._start()
@@ -49,6 +75,52 @@ class EventLoopThread:
             raise RuntimeError("Event loop is not initialized")
         return asyncio.run_coroutine_threadsafe(coro, self.loop)
 
+    def start_lag_monitor(self, interval: float = LAG_MONITOR_INTERVAL):
+        """Measure how late the loop wakes up from a sleep, a direct view of how long callbacks block it."""
+        if self._lag_monitor and not self._lag_monitor.done():
+            return
+        if not self.lag:
+            self.lag = LoopLag()
+        self.lag.interval = interval
+        self.lag.last_tick = time.perf_counter()
+        self._lag_monitor = self.run_coroutine(self._monitor_lag(interval))
+
+    async def _monitor_lag(self, interval: float):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.lag.record(max(0.0, time.perf_counter() - started - interval))  # type: ignore
+
+    def is_lag_monitored(self) -> bool:
+        return bool(self.lag and self._lag_monitor and not self._lag_monitor.done())
+
+    @classmethod
+    def get_instances(cls) -> list["EventLoopThread"]:
+        with cls._lock:
+            return list(cls._instances.values())
+
+    @classmethod
+    def get_lag_stats(cls) -> dict[str, dict[str, Any]]:
+        instances = cls.get_instances()
+        return {
+            t.thread_name: {
+                "last": round(t.lag.last, 4),
+                "max": round(t.lag.max, 4),
+                "avg": round(t.lag.avg, 4),
+                "samples": t.lag.samples,
+            }
+            for t in instances
+            if t.lag
+        }
+
+
+def shard_thread_name(base_name: str, key: str, shards: int) -> str:
+    """Pin a key to one of `shards` loop threads. The hash is stable, so the same key
+    always lands on the same thread, also across restarts."""
+    if shards <= 1:
+        return base_name
+    return f"{base_name}-{zlib.crc32(key.encode()) % shards}"
+
 
 @dataclass
 class ChildTask:
@@ -64,6 +136,9 @@ class DeferredTask:
         self.event_loop_thread = EventLoopThread(thread_name)
         self._future: Optional[Future] = None
         self.children: list[ChildTask] = []
+        self.progress: Any = None
+        self.progress_version = 0
+        self._progress_listeners: list[Callable[[Any], None]] = []
 
     def start_task(
         self, func: Callable[..., Coroutine[Any, Any, Any]], *args: Any, **kwargs: Any
@@ -79,6 +154,8 @@ class DeferredTask:
 
     def _start_task(self):
         self._future = self.event_loop_thread.run_coroutine(self._run())
+        # completion counts as progress, so progress waiters also wake up when the task ends
+        self._future.add_done_callback(lambda _: self.report_progress(self.progress))
 
     async def _run(self):
         return await self.func(*self.args, **self.kwargs)
@@ -100,19 +177,67 @@ class DeferredTask:
         if not self._future:
             raise RuntimeError("Task hasn't been started")
 
-        loop = asyncio.get_running_loop()
+        # bridged by a done callback, so waiting does not hold an executor thread;
+        # shielded so a cancelled or timed out waiter does not cancel the task itself
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(self._future)), timeout
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                "The task did not complete within the specified timeout."
+            )
+
+    def add_progress_listener(self, callback: Callable[[Any], None]) -> Callable[[], None]:
+        """Call `callback(progress)` on every progress report, from the reporting thread.
+        Returns a function that removes the listener."""
+        self._progress_listeners.append(callback)
 
-        def _get_result():
+        def remove():
+            if callback in self._progress_listeners:
+                self._progress_listeners.remove(callback)
+
+        return remove
+
+    def report_progress(self, progress: Any = None) -> None:
+        self.progress = progress
+        self.progress_version += 1
+        for callback in list(self._progress_listeners):
             try:
-                result = self._future.result(timeout)  # type: ignore
-                # self.kill()
-                return result
-            except TimeoutError:
-                raise TimeoutError(
-                    "The task did not complete within the specified timeout."
-                )
+                callback(progress)
+            except Exception:
+                pass  # a broken listener must not break the task
 
-        return await loop.run_in_executor(None, _get_result)
+    async def wait_progress(self, since: int, timeout: Optional[float] = None) -> bool:
+        """Wait until progress_version moves past `since` or the task is done.
+        Returns False on timeout."""
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+
+        def wake(_):
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(event.set)
+
+        remove = self.add_progress_listener(wake)
+        try:
+            if self.progress_version != since or not self.is_alive():
+                return True
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            remove()
+
+    def wait_progress_sync(self, since: int, timeout: Optional[float] = None) -> bool:
+        event = threading.Event()
+        remove = self.add_progress_listener(lambda _: event.set())
+        try:
+            if self.progress_version != since or not self.is_alive():
+                return True
+            return event.wait(timeout)
+        finally:
+            remove()
 
     def kill(self, terminate_thread: bool = False) -> None:
         """Kill the task and optionally terminate its thread."""
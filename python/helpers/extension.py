@@ -1,6 +1,6 @@
 from abc import abstractmethod
 from typing import Any
-from python.helpers import extract_tools, files 
+from python.helpers import extract_tools, files, tracing
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from agent import Agent
@@ -35,8 +35,10 @@ async def call_extensions(extension_point: str, agent: "Agent|None" = None, **kw
             classes = sorted(unique.values(), key=lambda cls: _get_file_from_module(cls.__module__))
 
     # call extensions
-    for cls in classes:
-        await cls(agent=agent).execute(**kwargs)
+    with tracing.span(f"extensions:{extension_point}"):
+        for cls in classes:
+            with tracing.span(cls.__name__, file=_get_file_from_module(cls.__module__)):
+                await cls(agent=agent).execute(**kwargs)
 
 
 def _get_file_from_module(module_name: str) -> str:
@@ -2,7 +2,6 @@ import os
 from pathlib import Path
 import shutil
 import base64
-import subprocess
 from typing import Dict, List, Tuple, Any
 from werkzeug.utils import secure_filename
 from datetime import datetime
@@ -19,6 +18,7 @@ class FileBrowser:
     }
 
     MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB
+    MAX_ENTRIES = 10000  # max entries per listing page
 
     def __init__(self):
         # if runtime.is_development():
@@ -122,148 +122,147 @@ class FileBrowser:
     def _get_file_extension(self, filename: str) -> str:
         return filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
 
-    def _get_files_via_ls(self, full_path: Path) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-        """Get files and folders using ls command for better error handling"""
-        files: List[Dict[str, Any]] = []
-        folders: List[Dict[str, Any]] = []
-
+    def _scan_directory(self, full_path: Path, name_filter: str = "") -> List[os.DirEntry]:
+        """List directory entries via os.scandir, optionally filtered by a case-insensitive name substring"""
+        entries: List[os.DirEntry] = []
+        needle = name_filter.lower()
         try:
-            # Use ls command to get directory listing
-            result = subprocess.run(
-                ['ls', '-la', str(full_path)],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-            if result.returncode != 0:
-                PrintStyle.error(f"ls command failed: {result.stderr}")
-                return files, folders
-
-            # Parse ls output (skip first line which is "total X")
-            lines = result.stdout.strip().split('\n')
-            if len(lines) <= 1:
-                return files, folders
-
-            for line in lines[1:]:  # Skip the "total" line
-                try:
-                    # Skip current and parent directory entries
-                    if line.endswith(' .') or line.endswith(' ..'):
-                        continue
-
-                    # Parse ls -la output format
-                    parts = line.split()
-                    if len(parts) < 9:
-                        continue
-
-                    # Check if this is a symlink (permissions start with 'l')
-                    permissions = parts[0]
-                    is_symlink = permissions.startswith('l')
-
-                    if is_symlink:
-                        # For symlinks, extract the name before the '->' arrow
-                        full_name_part = ' '.join(parts[8:])
-                        if ' -> ' in full_name_part:
-                            filename = full_name_part.split(' -> ')[0]
-                            symlink_target = full_name_part.split(' -> ')[1]
-                        else:
-                            filename = full_name_part
-                            symlink_target = None
-                    else:
-                        filename = ' '.join(parts[8:])  # Handle filenames with spaces
-                        symlink_target = None
-
-                    if not filename:
-                        continue
-
-                    # Get full path for this entry
-                    entry_path = full_path / filename
-
-                    try:
-                        stat_info = entry_path.stat()
-
-                        entry_data: Dict[str, Any] = {
-                            "name": filename,
-                            "path": str(entry_path.relative_to(self.base_dir)),
-                            "modified": datetime.fromtimestamp(stat_info.st_mtime).isoformat()
-                        }
-
-                        # Add symlink information if this is a symlink
-                        if is_symlink and symlink_target:
-                            entry_data["symlink_target"] = symlink_target
-                            entry_data["is_symlink"] = True
-
-                        if entry_path.is_file():
-                            entry_data.update({
-                                "type": self._get_file_type(filename),
-                                "size": stat_info.st_size,
-                                "is_dir": False
-                            })
-                            files.append(entry_data)
-                        elif entry_path.is_dir():
-                            entry_data.update({
-                                "type": "folder",
-                                "size": 0,  # Directories show as 0 bytes
-                                "is_dir": True
-                            })
-                            folders.append(entry_data)
-
-                    except (OSError, PermissionError, FileNotFoundError) as e:
-                        # Log error but continue with other files
-                        PrintStyle.warning(f"No access to {filename}: {e}")
+            with os.scandir(full_path) as it:
+                for entry in it:
+                    if needle and needle not in entry.name.lower():
                         continue
+                    entries.append(entry)
+        except (OSError, PermissionError) as e:
+            PrintStyle.error(f"Error scanning directory {full_path}: {e}")
+        return entries
 
-                    if len(files) + len(folders) > 10000:
-                        break
-
-                except Exception as e:
-                    # Log error and continue with next line
-                    PrintStyle.error(f"Error parsing ls line '{line}': {e}")
-                    continue
-
-        except subprocess.TimeoutExpired:
-            PrintStyle.error("ls command timed out")
-        except Exception as e:
-            PrintStyle.error(f"Error running ls command: {e}")
-
-        return files, folders
+    def _entry_is_dir(self, entry: os.DirEntry) -> bool:
+        # uses cached dirent type, follows symlinks only when needed
+        try:
+            return entry.is_dir()
+        except OSError:
+            return False
 
-    def get_files(self, current_path: str = "") -> Dict:
+    def _entry_stat(self, entry: os.DirEntry) -> os.stat_result | None:
+        try:
+            return entry.stat()
+        except OSError:
+            # broken symlink - fall back to the link itself
+            try:
+                return entry.stat(follow_symlinks=False)
+            except OSError as e:
+                PrintStyle.warning(f"No access to {entry.name}: {e}")
+                return None
+
+    def _sort_entries(self, entries: List[os.DirEntry], sort_by: str, sort_dir: str) -> List[os.DirEntry]:
+        """Sort entries with folders first, then by name, size or date"""
+        reverse = sort_dir == "desc"
+        if sort_by == "size":
+            def key(e: os.DirEntry):
+                st = None if self._entry_is_dir(e) else self._entry_stat(e)
+                return st.st_size if st else 0
+        elif sort_by == "date":
+            def key(e: os.DirEntry):
+                st = self._entry_stat(e)
+                return st.st_mtime if st else 0
+        else:
+            def key(e: os.DirEntry):
+                return e.name.lower()
+
+        folders = [e for e in entries if self._entry_is_dir(e)]
+        files = [e for e in entries if not self._entry_is_dir(e)]
+        folders.sort(key=key, reverse=reverse)
+        files.sort(key=key, reverse=reverse)
+        return folders + files
+
+    def _entry_to_dict(self, entry: os.DirEntry) -> Dict[str, Any] | None:
+        stat_info = self._entry_stat(entry)
+        if stat_info is None:
+            return None
+
+        entry_path = Path(entry.path)
+        is_dir = self._entry_is_dir(entry)
+        entry_data: Dict[str, Any] = {
+            "name": entry.name,
+            "path": str(entry_path.relative_to(self.base_dir)),
+            "modified": datetime.fromtimestamp(stat_info.st_mtime).isoformat(),
+        }
+
+        if entry.is_symlink():
+            entry_data["is_symlink"] = True
+            try:
+                entry_data["symlink_target"] = os.readlink(entry.path)
+            except OSError:
+                pass
+
+        if is_dir:
+            entry_data.update({
+                "type": "folder",
+                "size": 0,  # Directories show as 0 bytes
+                "is_dir": True
+            })
+        else:
+            entry_data.update({
+                "type": self._get_file_type(entry.name),
+                "size": stat_info.st_size,
+                "is_dir": False
+            })
+        return entry_data
+
+    def get_files(
+        self,
+        current_path: str = "",
+        sort_by: str = "name",
+        sort_dir: str = "asc",
+        cursor: int = 0,
+        limit: int = MAX_ENTRIES,
+        name_filter: str = "",
+    ) -> Dict:
+        """List a directory page: folders first, sorted server-side, `cursor` is the offset of the first entry"""
         try:
             # Resolve the full path while preventing directory traversal
             full_path = (self.base_dir / current_path).resolve()
             if not str(full_path).startswith(str(self.base_dir)):
                 raise ValueError("Invalid path")
 
-            # Use ls command instead of os.scandir for better error handling
-            files, folders = self._get_files_via_ls(full_path)
+            cursor = max(0, int(cursor or 0))
+            limit = max(1, min(int(limit or self.MAX_ENTRIES), self.MAX_ENTRIES))
 
-            # Combine folders and files, folders first
-            all_entries = folders + files
+            entries = self._scan_directory(full_path, name_filter)
+            entries = self._sort_entries(entries, sort_by, sort_dir)
+            total = len(entries)
+
+            # stat only the entries on the requested page
+            page = [
+                data
+                for data in (self._entry_to_dict(e) for e in entries[cursor:cursor + limit])
+                if data is not None
+            ]
+            next_cursor = cursor + limit if cursor + limit < total else None
 
             # Get parent directory path if not at root
             parent_path = ""
             if current_path:
                 try:
-                    # Get the absolute path of current directory
-                    current_abs = (self.base_dir / current_path).resolve()
-
                     # parent_path is empty only if we're already at root
-                    if str(current_abs) != str(self.base_dir):
+                    if str(full_path) != str(self.base_dir):
                         parent_path = str(Path(current_path).parent)
 
                 except Exception:
                     parent_path = ""
 
             return {
-                "entries": all_entries,
+                "entries": page,
                 "current_path": current_path,
-                "parent_path": parent_path
+                "parent_path": parent_path,
+                "total": total,
+                "cursor": cursor,
+                "next_cursor": next_cursor,
             }
 
         except Exception as e:
             PrintStyle.error(f"Error reading directory: {e}")
-            return {"entries": [], "current_path": "", "parent_path": ""}
+            return {"entries": [], "current_path": "", "parent_path": "", "total": 0, "cursor": 0, "next_cursor": None}
 
     def get_full_path(self, file_path: str, allow_dir: bool = False) -> str:
         """Get full file path if it exists and is within base_dir"""
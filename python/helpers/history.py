@@ -4,7 +4,7 @@ from collections import OrderedDict
 from collections.abc import Mapping
 import json
 import math
-from typing import Coroutine, Literal, TypedDict, cast, Union, Dict, List, Any
+from typing import Callable, Coroutine, Literal, TypedDict, cast, Union, Dict, List, Any
 from python.helpers import messages, tokens, settings, call_llm
 from enum import Enum
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, AIMessage
@@ -17,6 +17,7 @@ HISTORY_BULK_RATIO = 0.2
 TOPIC_COMPRESS_RATIO = 0.65
 LARGE_MESSAGE_TO_TOPIC_RATIO = 0.25
 RAW_MESSAGE_OUTPUT_TEXT_TRIM = 100
+COMPRESSION_CONCURRENCY = 4  # max parallel utility model calls during compression
 
 
 class RawMessage(TypedDict):
@@ -34,6 +35,10 @@ MessageContent = Union[
 ]
 
 
+# applies a finished summarization to the history, False if it no longer fits
+CompressionResult = Callable[[], bool]
+
+
 class OutputMessage(TypedDict):
     ai: bool
     content: MessageContent
@@ -201,18 +206,31 @@ class Topic(Record):
         return compress
 
     async def compress_attention(self) -> bool:
-
-        if len(self.messages) > 2:
-            cnt_to_sum = math.ceil((len(self.messages) - 2) * TOPIC_COMPRESS_RATIO)
-            msg_to_sum = self.messages[1 : cnt_to_sum + 1]
+        apply = await self.summarize_attention(asyncio.Semaphore(1))
+        return apply() if apply else False
+
+    async def summarize_attention(
+        self, limit: asyncio.Semaphore
+    ) -> CompressionResult | None:
+        if len(self.messages) <= 2:
+            return None
+
+        cnt_to_sum = math.ceil((len(self.messages) - 2) * TOPIC_COMPRESS_RATIO)
+        msg_to_sum = self.messages[1 : cnt_to_sum + 1]
+        async with limit:
             summary = await self.summarize_messages(msg_to_sum)
+
+        def apply() -> bool:
+            # messages may have been appended meanwhile, the summarized slice must be intact
+            if self.messages[1 : cnt_to_sum + 1] != msg_to_sum:
+                return False
             sum_msg_content = self.history.agent.parse_prompt(
                 "fw.msg_summary.md", summary=summary
             )
-            sum_msg = Message(False, sum_msg_content)
-            self.messages[1 : cnt_to_sum + 1] = [sum_msg]
+            self.messages[1 : cnt_to_sum + 1] = [Message(False, sum_msg_content)]
             return True
-        return False
+
+        return apply
 
     async def summarize_messages(self, messages: list[Message]):
         # FIXME: vision bytes are sent to utility LLM, send summary instead
@@ -358,86 +376,116 @@ class History(Record):
         return _json_dumps(data)
 
     async def compress(self):
+        """Free space in all parts over their ratio of the context window.
+        Each round plans every summarization needed, runs the utility model calls
+        concurrently (bounded) and then applies all results at once."""
         compressed = False
+        limit = asyncio.Semaphore(COMPRESSION_CONCURRENCY)
         while True:
-            curr, hist, bulk = (
-                self.get_current_topic_tokens(),
-                self.get_topics_tokens(),
-                self.get_bulks_tokens(),
-            )
             total = _get_ctx_size_for_history()
-            ratios = [
-                (curr, CURRENT_TOPIC_RATIO, "current_topic"),
-                (hist, HISTORY_TOPIC_RATIO, "history_topic"),
-                (bulk, HISTORY_BULK_RATIO, "history_bulk"),
-            ]
-            ratios = sorted(ratios, key=lambda x: (x[0] / total) / x[1], reverse=True)
-            compressed_part = False
-            for ratio in ratios:
-                if ratio[0] > ratio[1] * total:
-                    over_part = ratio[2]
-                    if over_part == "current_topic":
-                        compressed_part = await self.current.compress()
-                    elif over_part == "history_topic":
-                        compressed_part = await self.compress_topics()
-                    else:
-                        compressed_part = await self.compress_bulks()
-                    if compressed_part:
-                        break
-
-            if compressed_part:
+            jobs: list[Coroutine[Any, Any, CompressionResult | None]] = []
+
+            # current topic - truncating large messages needs no LLM, do it right away
+            over_current = self.get_current_topic_tokens() - total * CURRENT_TOPIC_RATIO
+            while over_current > 0 and await self.current.compress_large_messages():
                 compressed = True
-                continue
-            else:
+                over_current = self.get_current_topic_tokens() - total * CURRENT_TOPIC_RATIO
+            if over_current > 0:
+                jobs.append(self.current.summarize_attention(limit))
+
+            # history topics
+            over_topics = self.get_topics_tokens() - total * HISTORY_TOPIC_RATIO
+            if over_topics > 0:
+                topic_jobs = self.plan_topics(over_topics, limit)
+                if topic_jobs:
+                    jobs += topic_jobs
+                elif self.move_topics_to_bulks(over_topics):
+                    compressed = True
+
+            # history bulks
+            if self.get_bulks_tokens() > total * HISTORY_BULK_RATIO:
+                jobs.append(self.summarize_bulks(BULK_MERGE_COUNT, limit))
+
+            if not jobs:
                 return compressed
 
-    async def compress_topics(self) -> bool:
-        # summarize topics one by one
+            # all summaries are ready before any of them is applied
+            results = await asyncio.gather(*jobs)
+            applied = [apply() for apply in results if apply]
+            if not any(applied):
+                return compressed
+            compressed = True
+
+    def plan_topics(
+        self, over_tokens: int, limit: asyncio.Semaphore
+    ) -> list[Coroutine[Any, Any, CompressionResult | None]]:
+        # summarize oldest unsummarized topics until their size covers the excess
+        jobs = []
+        planned = 0
         for topic in self.topics:
+            if planned >= over_tokens:
+                break
             if not topic.summary:
-                await topic.summarize()
-                return True
+                jobs.append(self.summarize_topic(topic, limit))
+                planned += topic.get_tokens()
+        return jobs
+
+    async def summarize_topic(
+        self, topic: Topic, limit: asyncio.Semaphore
+    ) -> CompressionResult | None:
+        async with limit:
+            summary = await topic.summarize_messages(topic.messages)
+
+        def apply() -> bool:
+            if topic.summary or topic not in self.topics:
+                return False
+            topic.summary = summary
+            return True
 
-        # move oldest topic to bulks and summarize
-        for topic in self.topics:
+        return apply
+
+    def move_topics_to_bulks(self, over_tokens: int) -> bool:
+        # all topics are summarized, move oldest ones to bulks, summary is reused
+        moved = 0
+        while self.topics and moved < over_tokens:
+            topic = self.topics.pop(0)
             bulk = Bulk(history=self)
             bulk.records.append(topic)
-            if topic.summary:
-                bulk.summary = topic.summary
-            else:
-                await bulk.summarize()
+            bulk.summary = topic.summary
             self.bulks.append(bulk)
-            self.topics.remove(topic)
-            return True
-        return False
+            moved += topic.get_tokens()
+        return moved > 0
 
-    async def compress_bulks(self):
-        # merge bulks if possible
-        compressed = await self.merge_bulks_by(BULK_MERGE_COUNT)
-        # remove oldest bulk if necessary
-        if not compressed:
-            self.bulks.pop(0)
-            return True
-        return compressed
-
-    async def merge_bulks_by(self, count: int):
-        # if bulks is empty, return False
+    async def summarize_bulks(
+        self, count: int, limit: asyncio.Semaphore
+    ) -> CompressionResult | None:
         if len(self.bulks) == 0:
-            return False
+            return None
+        source = list(self.bulks)
         # merge bulks in groups of count, even if there are fewer than count
         bulks = await asyncio.gather(
             *[
-                self.merge_bulks(self.bulks[i : i + count])
-                for i in range(0, len(self.bulks), count)
+                self.merge_bulks(source[i : i + count], limit)
+                for i in range(0, len(source), count)
             ]
         )
-        self.bulks = bulks
-        return True
 
-    async def merge_bulks(self, bulks: list[Bulk]) -> Bulk:
+        def apply() -> bool:
+            # bulks moved from topics meanwhile stay after the merged ones
+            if self.bulks[: len(source)] != source:
+                return False
+            self.bulks[: len(source)] = bulks
+            return True
+
+        return apply
+
+    async def merge_bulks(
+        self, bulks: list[Bulk], limit: asyncio.Semaphore | None = None
+    ) -> Bulk:
         bulk = Bulk(history=self)
         bulk.records = cast(list[Record], bulks)
-        await bulk.summarize()
+        async with limit or asyncio.Semaphore(1):
+            await bulk.summarize()
         return bulk
 
 
@@ -505,8 +553,11 @@ def group_messages_abab(messages: list[BaseMessage]) -> list[BaseMessage]:
     result = []
     for msg in messages:
         if result and isinstance(result[-1], type(msg)):
-            # create new instance of the same type with merged content
-            result[-1] = type(result[-1])(content=_merge_outputs(result[-1].content, msg.content))  # type: ignore
+            # create new instance of the same type with merged content, keep metadata like cache breakpoints
+            result[-1] = type(result[-1])(
+                content=_merge_outputs(result[-1].content, msg.content),  # type: ignore
+                additional_kwargs=result[-1].additional_kwargs,
+            )
         else:
             result.append(msg)
     return result
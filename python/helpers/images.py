@@ -1,22 +1,58 @@
 from PIL import Image
+import asyncio
+import hashlib
 import io
 import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from python.helpers import files
+
+# compressed variants are cached on disk, pruned on write: entries unused for CACHE_MAX_AGE are dropped,
+# then the least recently used ones (by mtime, reads touch the file) until the cache fits CACHE_MAX_BYTES
+CACHE_DIR = "tmp/images_cache"
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+CACHE_MAX_AGE = 30 * 24 * 3600  # seconds
+CACHE_PRUNE_INTERVAL = 300  # seconds, at most one prune per interval, triggered by cache writes
+
+
+@dataclass(frozen=True)
+class ImageVariant:
+    name: str
+    max_pixels: int | None = None  # scale down to this pixel count (LLM input)
+    max_size: int | None = None  # fit into max_size x max_size box (UI thumbnail)
+    quality: int = 75
+
+
+# compressed variants shared by vision_load, image_get and attachment previews
+VARIANT_LLM = ImageVariant("llm", max_pixels=768_000, quality=75)
+VARIANT_THUMB = ImageVariant("thumb", max_size=800, quality=70)
+VARIANTS = {v.name: v for v in (VARIANT_LLM, VARIANT_THUMB)}
+
+# PIL releases the GIL for most of decode/resize/encode, so a few threads scale well
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="images")
+
+_prune_lock = threading.Lock()
+_last_prune = 0.0
 
 
 def compress_image(image_data: bytes, *, max_pixels: int = 256_000, quality: int = 50) -> bytes:
     """Compress an image by scaling it down and converting to JPEG with quality settings.
-    
+
     Args:
         image_data: Raw image bytes
         max_pixels: Maximum number of pixels in the output image (width * height)
         quality: JPEG quality setting (1-100)
-    
+
     Returns:
         Compressed image as bytes
     """
     # load image from bytes
     img = Image.open(io.BytesIO(image_data))
-    
+
     # calculate scaling factor to get to max_pixels
     current_pixels = img.width * img.height
     if current_pixels > max_pixels:
@@ -24,12 +60,119 @@ def compress_image(image_data: bytes, *, max_pixels: int = 256_000, quality: int
         new_width = int(img.width * scale)
         new_height = int(img.height * scale)
         img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-    
+
     # convert to RGB if needed (for JPEG)
     if img.mode in ('RGBA', 'P'):
         img = img.convert('RGB')
-    
+
     # save as JPEG with compression
     output = io.BytesIO()
     img.save(output, format='JPEG', quality=quality, optimize=True)
     return output.getvalue()
+
+
+def thumbnail_image(image_data: bytes, *, max_size: int = 800, quality: int = 70) -> bytes:
+    """Fit an image into a max_size x max_size box and convert to JPEG."""
+    with Image.open(io.BytesIO(image_data)) as img:
+        if img.mode in ('RGBA', 'P'):
+            img = img.convert('RGB')
+        img.thumbnail((max_size, max_size))
+        output = io.BytesIO()
+        img.save(output, format='JPEG', quality=quality, optimize=True)
+        return output.getvalue()
+
+
+def _render_variant(image_data: bytes, variant: ImageVariant) -> bytes:
+    if variant.max_size:
+        return thumbnail_image(image_data, max_size=variant.max_size, quality=variant.quality)
+    return compress_image(image_data, max_pixels=variant.max_pixels or 256_000, quality=variant.quality)
+
+
+def _cache_path(image_data: bytes, variant: ImageVariant) -> str:
+    digest = hashlib.sha256(image_data).hexdigest()
+    params = f"{variant.max_pixels}_{variant.max_size}_{variant.quality}"
+    return files.get_abs_path(CACHE_DIR, digest[:2], f"{digest}_{variant.name}_{params}.jpg")
+
+
+def get_variant(image_data: bytes, variant: ImageVariant = VARIANT_LLM) -> bytes:
+    """Return the compressed variant of an image, content-addressed on disk so each image is compressed only once."""
+    path = _cache_path(image_data, variant)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        _touch(path)
+        return data
+    except FileNotFoundError:
+        pass
+
+    compressed = _render_variant(image_data, variant)
+
+    # write to a temp file first so concurrent readers never see partial data
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{id(compressed)}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(compressed)
+    os.replace(tmp_path, path)
+    prune_cache()
+    return compressed
+
+
+def _touch(path: str):
+    try:
+        os.utime(path)
+    except OSError:
+        pass  # evicted meanwhile
+
+
+def prune_cache(force: bool = False):
+    """Evict cached variants older than CACHE_MAX_AGE, then the least recently used ones until the cache fits CACHE_MAX_BYTES."""
+    global _last_prune
+    now = time.time()
+    # one thread prunes, the others skip instead of waiting for it
+    if not _prune_lock.acquire(blocking=False):
+        return
+    try:
+        if not force and now - _last_prune < CACHE_PRUNE_INTERVAL:
+            return
+        _last_prune = now
+
+        entries: list[tuple[float, int, str]] = []
+        root = files.get_abs_path(CACHE_DIR)
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if name.endswith(".tmp") and now - stat.st_mtime < CACHE_PRUNE_INTERVAL:
+                    continue  # being written right now
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()  # oldest first
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            if total <= CACHE_MAX_BYTES and now - mtime <= CACHE_MAX_AGE:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+    finally:
+        _prune_lock.release()
+
+
+def get_variant_file(path: str, variant: ImageVariant = VARIANT_THUMB) -> bytes:
+    with open(path, "rb") as f:
+        return get_variant(f.read(), variant)
+
+
+async def get_variant_async(image_data: bytes, variant: ImageVariant = VARIANT_LLM) -> bytes:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, get_variant, image_data, variant)
+
+
+async def get_variant_file_async(path: str, variant: ImageVariant = VARIANT_THUMB) -> bytes:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, get_variant_file, path, variant)
@@ -1,5 +1,5 @@
 import asyncio
-from datetime import datetime
+from datetime import datetime, timezone
 import time
 from python.helpers.task_scheduler import TaskScheduler
 from python.helpers.print_style import PrintStyle
@@ -7,19 +7,28 @@ from python.helpers import errors
 from python.helpers import runtime
 
 
-SLEEP_TIME = 60
+SLEEP_TIME = 60  # max sleep between ticks, also the development pause heartbeat
 
 keep_running = True
 pause_time = 0
 
+_loop: asyncio.AbstractEventLoop | None = None
+_wakeup: asyncio.Event | None = None
+
 
 async def run_loop():
-    global pause_time, keep_running
+    global pause_time, keep_running, _loop, _wakeup
+
+    _loop = asyncio.get_running_loop()
+    _wakeup = asyncio.Event()
+    TaskScheduler.get().add_change_listener(notify_change)
+    last_pause_call = 0.0
 
     while True:
-        if runtime.is_development():
+        if runtime.is_development() and (time.time() - last_pause_call) >= SLEEP_TIME:
             # Signal to container that the job loop should be paused
             # if we are runing a development instance to avoid duble-running the jobs
+            last_pause_call = time.time()
             try:
                 await runtime.call_development_function(pause_loop)
             except Exception as e:
@@ -31,7 +40,31 @@ async def run_loop():
                 await scheduler_tick()
             except Exception as e:
                 PrintStyle().error(errors.format_error(e))
-        await asyncio.sleep(SLEEP_TIME)  # TODO! - if we lower it under 1min, it can run a 5min job multiple times in it's target minute
+        await _sleep_until_next_run()
+
+
+async def _sleep_until_next_run():
+    # sleep exactly until the next due task, or until tasks change
+    if not _wakeup:
+        return await asyncio.sleep(SLEEP_TIME)
+    _wakeup.clear()
+
+    delay = SLEEP_TIME
+    if keep_running:
+        next_run = TaskScheduler.get().get_next_run_time()
+        if next_run:
+            delay = min(delay, max(0.0, (next_run - datetime.now(timezone.utc)).total_seconds()))
+
+    try:
+        await asyncio.wait_for(_wakeup.wait(), timeout=delay)
+    except asyncio.TimeoutError:
+        pass
+
+
+def notify_change():
+    # called from any thread when scheduler tasks are added, updated or finished
+    if _loop and _wakeup and not _loop.is_closed():
+        _loop.call_soon_threadsafe(_wakeup.set)
 
 
 async def scheduler_tick():
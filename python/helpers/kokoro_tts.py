@@ -4,6 +4,10 @@ import base64
 import io
 import warnings
 import asyncio
+import re
+import threading
+from typing import Iterator
+import numpy as np
 import soundfile as sf
 from python.helpers import runtime
 from python.helpers.print_style import PrintStyle
@@ -14,8 +18,14 @@ warnings.filterwarnings("ignore", category=UserWarning)
 _pipeline = None
 _voice = "am_puck,am_onyx"
 _speed = 1.1
+_pipeline_lock = threading.Lock()
+# KPipeline is not thread-safe, streamed and whole-text synthesis take turns sentence by sentence
+_synthesis_lock = threading.Lock()
 is_updating_model = False
 
+SAMPLE_RATE = 24000
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
 
 async def preload():
     try:
@@ -30,19 +40,23 @@ async def preload():
 
 
 async def _preload():
-    global _pipeline, is_updating_model
+    # load off the event loop, model download and init can take minutes
+    await asyncio.to_thread(_load_pipeline)
 
-    while is_updating_model:
-        await asyncio.sleep(0.1)
 
-    try:
-        is_updating_model = True
+def _load_pipeline():
+    global _pipeline, is_updating_model
+
+    with _pipeline_lock:
         if not _pipeline:
-            PrintStyle.standard("Loading Kokoro TTS model...")
-            from kokoro import KPipeline
-            _pipeline = KPipeline(lang_code="a", repo_id="hexgrad/Kokoro-82M")
-    finally:
-        is_updating_model = False
+            try:
+                is_updating_model = True
+                PrintStyle.standard("Loading Kokoro TTS model...")
+                from kokoro import KPipeline
+                _pipeline = KPipeline(lang_code="a", repo_id="hexgrad/Kokoro-82M")
+            finally:
+                is_updating_model = False
+        return _pipeline
 
 
 async def is_downloading():
@@ -87,28 +101,58 @@ async def synthesize_sentences(sentences: list[str]):
 
 async def _synthesize_sentences(sentences: list[str]):
     await _preload()
+    return await asyncio.to_thread(_synthesize_all, sentences)
+
 
-    combined_audio = []
+def synthesize_stream(sentences: list[str]) -> Iterator[str]:
+    """Yield base64 WAV audio sentence by sentence as soon as each one is synthesized.
+    Blocking generator, iterate it off the event loop (e.g. in a streamed HTTP response)."""
+    _load_pipeline()
+    for sentence in _split_sentences(sentences):
+        try:
+            samples = _synthesize_sentence(sentence)
+        except Exception as e:
+            PrintStyle.error(f"Error in Kokoro TTS synthesis: {e}")
+            raise
+        if samples.size:
+            yield _encode_wav(samples)
 
+
+def _synthesize_all(sentences: list[str]) -> str:
     try:
-        for sentence in sentences:
-            if sentence.strip():
-                segments = _pipeline(sentence.strip(), voice=_voice, speed=_speed) # type: ignore
-                segment_list = list(segments)
+        parts = [_synthesize_sentence(s) for s in _split_sentences(sentences)]
+        return _encode_wav(_concat(parts))
+    except Exception as e:
+        PrintStyle.error(f"Error in Kokoro TTS synthesis: {e}")
+        raise
 
-                for segment in segment_list:
-                    audio_tensor = segment.audio
-                    audio_numpy = audio_tensor.detach().cpu().numpy() # type: ignore
-                    combined_audio.extend(audio_numpy)
 
-        # Convert combined audio to bytes
-        buffer = io.BytesIO()
-        sf.write(buffer, combined_audio, 24000, format="WAV")
-        audio_bytes = buffer.getvalue()
+def _split_sentences(sentences: list[str]) -> list[str]:
+    result = []
+    for text in sentences:
+        result.extend(s.strip() for s in _SENTENCE_SPLIT.split(text) if s.strip())
+    return result
 
-        # Return base64 encoded audio
-        return base64.b64encode(audio_bytes).decode("utf-8")
 
-    except Exception as e:
-        PrintStyle.error(f"Error in Kokoro TTS synthesis: {e}")
-        raise    
\ No newline at end of file
+def _synthesize_sentence(sentence: str) -> np.ndarray:
+    with _synthesis_lock:
+        # the pipeline is a lazy generator, consume it fully under the lock
+        segments = _pipeline(sentence, voice=_voice, speed=_speed)  # type: ignore
+        parts = [segment.audio.detach().cpu().numpy() for segment in segments]  # type: ignore
+    return _concat(parts)
+
+
+def _concat(parts: list[np.ndarray]) -> np.ndarray:
+    # copy into one preallocated float32 buffer instead of growing a python list
+    buffer = np.empty(sum(len(p) for p in parts), dtype=np.float32)
+    pos = 0
+    for part in parts:
+        buffer[pos : pos + len(part)] = part
+        pos += len(part)
+    return buffer
+
+
+def _encode_wav(samples: np.ndarray) -> str:
+    buffer = io.BytesIO()
+    sf.write(buffer, samples, SAMPLE_RATE, format="WAV")
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
@@ -0,0 +1,208 @@
+import asyncio
+import contextvars
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import litellm
+
+from python.helpers.tokens import approximate_tokens
+
+
+@dataclass
+class _Scope:
+    context_id: str | None = None
+    queue_time: float = 0.0
+
+
+_scope: contextvars.ContextVar[_Scope | None] = contextvars.ContextVar(
+    "llm_metrics_scope", default=None
+)
+
+
+@dataclass
+class CallMetrics:
+    model: str
+    context_id: str | None = None
+    queue_time: float = 0.0  # waiting in the rate limiter before the call
+    started: float = field(default_factory=time.perf_counter)
+    ttft: float | None = None
+    duration: float = 0.0
+    chunks: int = 0
+    inter_token_total: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    reasoning_tokens: int = 0
+    cost: float = 0.0
+    error: bool = False
+    _last_chunk: float = 0.0
+
+    def chunk(self):
+        """Call for every streamed chunk with content."""
+        now = time.perf_counter()
+        if self.ttft is None:
+            self.ttft = now - self.started
+        else:
+            self.inter_token_total += now - self._last_chunk
+        self._last_chunk = now
+        self.chunks += 1
+
+    def finish(self, usage: Any = None, response: str = "", reasoning: str = "", error: bool = False):
+        self.duration = time.perf_counter() - self.started
+        self.error = error
+        if usage:
+            self.prompt_tokens = _get(usage, "prompt_tokens") or 0
+            self.completion_tokens = _get(usage, "completion_tokens") or 0
+            self.reasoning_tokens = _get(_get(usage, "completion_tokens_details"), "reasoning_tokens") or 0
+        else:
+            # provider sent no usage block, approximate what was streamed
+            self.completion_tokens = approximate_tokens(response + reasoning) if response or reasoning else 0
+        if not self.reasoning_tokens and reasoning:
+            self.reasoning_tokens = approximate_tokens(reasoning)
+        self.cost = _cost(self.model, self.prompt_tokens, self.completion_tokens)
+        _record(self)
+
+
+@dataclass
+class Aggregate:
+    calls: int = 0
+    errors: int = 0
+    queue_time: float = 0.0
+    ttft_total: float = 0.0
+    ttft_count: int = 0
+    duration: float = 0.0
+    stream_time: float = 0.0  # duration after the first token
+    streamed_tokens: int = 0  # completion tokens of calls that streamed, for tokens/s
+    inter_token_total: float = 0.0
+    inter_token_count: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    reasoning_tokens: int = 0
+    cost: float = 0.0
+
+    def add(self, call: CallMetrics):
+        self.calls += 1
+        self.errors += int(call.error)
+        self.queue_time += call.queue_time
+        self.duration += call.duration
+        if call.ttft is not None:
+            self.ttft_total += call.ttft
+            self.ttft_count += 1
+            self.stream_time += call.duration - call.ttft
+            self.streamed_tokens += call.completion_tokens
+        self.inter_token_total += call.inter_token_total
+        self.inter_token_count += max(0, call.chunks - 1)
+        self.prompt_tokens += call.prompt_tokens
+        self.completion_tokens += call.completion_tokens
+        self.reasoning_tokens += call.reasoning_tokens
+        self.cost += call.cost
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_queue_time": _avg(self.queue_time, self.calls),
+            "avg_ttft": _avg(self.ttft_total, self.ttft_count),
+            "avg_duration": _avg(self.duration, self.calls),
+            "avg_inter_token": _avg(self.inter_token_total, self.inter_token_count, 4),
+            "tokens_per_second": _avg(self.streamed_tokens, self.stream_time, 1),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "reasoning_tokens": self.reasoning_tokens,
+            "cost": round(self.cost, 6),
+        }
+
+
+_models: dict[str, Aggregate] = {}
+_contexts: dict[str, Aggregate] = {}
+_lock = threading.Lock()
+
+
+def set_scope(context_id: str | None, queue_time: float):
+    """Attach the calling context and rate limiter wait to the next LLM call in this task."""
+    _scope.set(_Scope(context_id=context_id, queue_time=queue_time))
+
+
+def start_call(model: str) -> CallMetrics:
+    scope = _scope.get()
+    if not scope:
+        return CallMetrics(model=model)
+    call = CallMetrics(model=model, context_id=scope.context_id, queue_time=scope.queue_time)
+    scope.queue_time = 0.0  # the wait belongs to this call only
+    return call
+
+
+def is_interruption(error: BaseException) -> bool:
+    # user interventions and cancelled tasks end a stream on purpose, they are not provider errors
+    return isinstance(error, asyncio.CancelledError) or type(error).__name__ == "InterventionException"
+
+
+def remove_context(context_id: str):
+    with _lock:
+        _contexts.pop(context_id, None)
+
+
+def get_stats() -> dict[str, Any]:
+    with _lock:
+        return {
+            "models": {model: agg.to_dict() for model, agg in _models.items()},
+            "contexts": {ctx: agg.to_dict() for ctx, agg in _contexts.items()},
+        }
+
+
+def get_prometheus_text() -> str:
+    metrics = [
+        ("a0_llm_calls_total", "counter", "LLM calls", lambda a: a.calls),
+        ("a0_llm_errors_total", "counter", "Failed LLM calls", lambda a: a.errors),
+        ("a0_llm_queue_seconds_total", "counter", "Time spent waiting in rate limiters", lambda a: a.queue_time),
+        ("a0_llm_ttft_seconds_total", "counter", "Sum of times to first token", lambda a: a.ttft_total),
+        ("a0_llm_ttft_calls_total", "counter", "Calls with a first token", lambda a: a.ttft_count),
+        ("a0_llm_duration_seconds_total", "counter", "Sum of call durations", lambda a: a.duration),
+        ("a0_llm_stream_seconds_total", "counter", "Sum of stream durations after the first token", lambda a: a.stream_time),
+        ("a0_llm_inter_token_seconds_total", "counter", "Sum of gaps between streamed chunks", lambda a: a.inter_token_total),
+        ("a0_llm_inter_token_gaps_total", "counter", "Gaps between streamed chunks", lambda a: a.inter_token_count),
+        ("a0_llm_prompt_tokens_total", "counter", "Prompt tokens", lambda a: a.prompt_tokens),
+        ("a0_llm_completion_tokens_total", "counter", "Completion tokens", lambda a: a.completion_tokens),
+        ("a0_llm_reasoning_tokens_total", "counter", "Reasoning tokens", lambda a: a.reasoning_tokens),
+        ("a0_llm_cost_usd_total", "counter", "Estimated cost in USD", lambda a: a.cost),
+    ]
+    with _lock:
+        models = list(_models.items())
+    lines = []
+    for name, type, help, value in metrics:
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {type}")
+        for model, agg in models:
+            label = model.replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(f'{name}{{model="{label}"}} {value(agg)}')
+    return "\n".join(lines) + "\n"
+
+
+def _record(call: CallMetrics):
+    with _lock:
+        _models.setdefault(call.model, Aggregate()).add(call)
+        if call.context_id:
+            _contexts.setdefault(call.context_id, Aggregate()).add(call)
+
+
+def _cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    try:
+        prompt_cost, completion_cost = litellm.cost_per_token(
+            model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+        )
+        return prompt_cost + completion_cost
+    except Exception:
+        return 0.0  # model not in litellm's price list
+
+
+def _get(obj: Any, key: str) -> Any:
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(key)
+    return getattr(obj, key, None)
+
+
+def _avg(total: float, count: float, digits: int = 3) -> float:
+    return round(total / count, digits) if count else 0.0
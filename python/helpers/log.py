@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 import json
-from typing import Any, Literal, Optional, Dict
+from typing import Any, Callable, Literal, Optional, Dict
 import uuid
 from collections import OrderedDict  # Import OrderedDict
 from python.helpers.strings import truncate_text_by_ratio
@@ -166,8 +166,17 @@ class Log:
         self.guid: str = str(uuid.uuid4())
         self.updates: list[int] = []
         self.logs: list[LogItem] = []
+        self._listeners: list[Callable[[], None]] = []
         self.set_initial_progress()
 
+    def add_listener(self, callback: Callable[[], None]):
+        """Call `callback()` after every added or updated item."""
+        self._listeners.append(callback)
+
+    def _notify(self):
+        for callback in self._listeners:
+            callback()
+
     def log(
         self,
         type: Type,
@@ -214,6 +223,7 @@ class Log:
         self.logs.append(item)
         self.updates += [item.no]
         self._update_progress_from_item(item)
+        self._notify()
         return item
 
     def _update_item(
@@ -260,6 +270,7 @@ class Log:
 
         self.updates += [item.no]
         self._update_progress_from_item(item)
+        self._notify()
 
     def set_progress(self, progress: str, no: int = 0, active: bool = True):
         self.progress = _truncate_progress(progress)
@@ -300,3 +311,33 @@ class Log:
                     (item.no if item.update_progress == "persistent" else -1),
                 )
             
+
+
+class LogCursor:
+    """Reads only log items added or updated since the previous read, for streaming a log to remote callers."""
+
+    def __init__(self, log: Log, start: int | None = None):
+        self.log = log
+        self.guid = log.guid
+        self.position = len(log.updates) if start is None else start
+        self._sent: dict[int, str] = {}  # item no -> response text already streamed
+
+    def read(self) -> list[dict]:
+        if self.log.guid != self.guid:
+            # log was reset, start over
+            self.guid = self.log.guid
+            self.position = 0
+            self._sent.clear()
+        end = len(self.log.updates)
+        if end <= self.position:
+            return []
+        items = self.log.output(self.position, end)
+        self.position = end
+        return items
+
+    def response_delta(self, item: dict) -> str:
+        """New text of a live response item since it was last seen."""
+        content = item.get("content") or ""
+        sent = self._sent.get(item["no"], "")
+        self._sent[item["no"]] = content
+        return content[len(sent):] if content.startswith(sent) else content
@@ -0,0 +1,172 @@
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from python.helpers import files
+from python.helpers.defer import EventLoopThread
+from python.helpers.dotenv import get_dotenv_value
+from python.helpers.print_style import PrintStyle
+
+BLOCK_THRESHOLD = 0.5  # seconds a loop may stay unresponsive before the blocking call is recorded
+CHECK_INTERVAL = 0.1  # seconds between watchdog checks
+MAX_EVENTS = 100  # recent blocking events kept for the API
+STACK_DEPTH = 12  # innermost frames kept per event
+
+_EXTENSIONS_DIR = os.path.join("python", "extensions") + os.sep
+_TOOLS_DIR = os.path.join("python", "tools") + os.sep
+
+
+@dataclass
+class BlockEvent:
+    thread: str
+    label: str
+    stack: list[str]
+    started_at: float = field(default_factory=time.time)
+    duration: float = 0.0
+
+    def output(self) -> dict[str, Any]:
+        return {
+            "thread": self.thread,
+            "label": self.label,
+            "started_at": self.started_at,
+            "duration": round(self.duration, 3),
+            "stack": self.stack,
+        }
+
+
+class BlockingDetector:
+    """Watchdog thread that notices when a monitored event loop stops answering its lag probe
+    and captures the stack of the loop thread while it is still blocked.
+    Works with every EventLoopThread that runs start_lag_monitor."""
+
+    _instance: "BlockingDetector | None" = None
+
+    @classmethod
+    def get(cls) -> "BlockingDetector":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def start_if_enabled(cls):
+        if str(get_dotenv_value("A0_LOOP_BLOCK_DETECTOR", "")).lower() in ("1", "true"):
+            cls.get().start()
+
+    def __init__(self):
+        self.threshold = float(get_dotenv_value("A0_LOOP_BLOCK_THRESHOLD", BLOCK_THRESHOLD))
+        self.events: deque[BlockEvent] = deque(maxlen=MAX_EVENTS)
+        self.offenders: dict[str, dict[str, Any]] = {}
+        self._active: dict[str, BlockEvent] = {}  # thread name -> ongoing block
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def start(self):
+        with self._lock:
+            if self.is_running():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, daemon=True, name="LoopBlockingDetector"
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            offenders = sorted(
+                self.offenders.values(), key=lambda o: o["total"], reverse=True
+            )
+            return {
+                "running": self.is_running(),
+                "threshold": self.threshold,
+                "offenders": [{**o, "total": round(o["total"], 3), "max": round(o["max"], 3)} for o in offenders],
+                "events": [e.output() for e in reversed(self.events)],
+                "active": [e.output() for e in self._active.values()],
+            }
+
+    def _run(self):
+        while not self._stop.wait(CHECK_INTERVAL):
+            try:
+                self._check()
+            except Exception as e:
+                PrintStyle.error(f"Loop blocking detector failed: {e}")
+
+    def _check(self):
+        now = time.perf_counter()
+        for loop_thread in EventLoopThread.get_instances():
+            if not loop_thread.is_lag_monitored() or not loop_thread.thread:
+                continue
+            lag = loop_thread.lag
+            blocked_for = now - lag.last_tick - lag.interval  # type: ignore
+            name = loop_thread.thread_name
+            active = self._active.get(name)
+
+            if blocked_for > self.threshold:
+                if active:
+                    active.duration = blocked_for
+                else:
+                    stack = _thread_stack(loop_thread.thread.ident)
+                    with self._lock:
+                        self._active[name] = BlockEvent(
+                            thread=name,
+                            label=_label(stack),
+                            stack=[_format_frame(f) for f in stack[-STACK_DEPTH:]],
+                            started_at=time.time() - blocked_for,
+                            duration=blocked_for,
+                        )
+            elif active:
+                # the probe ran again, its lag is the most exact duration of the block
+                active.duration = max(active.duration, lag.last)  # type: ignore
+                self._finish(active)
+
+    def _finish(self, event: BlockEvent):
+        with self._lock:
+            self._active.pop(event.thread, None)
+            self.events.append(event)
+            offender = self.offenders.setdefault(
+                event.label, {"label": event.label, "count": 0, "total": 0.0, "max": 0.0, "stack": []}
+            )
+            offender["count"] += 1
+            offender["total"] += event.duration
+            if event.duration >= offender["max"]:
+                offender["max"] = event.duration
+                offender["stack"] = event.stack
+        PrintStyle.warning(
+            f"Event loop {event.thread} was blocked for {event.duration:.2f}s in {event.label}"
+        )
+
+
+def _thread_stack(ident: int | None) -> traceback.StackSummary:
+    frame = sys._current_frames().get(ident) if ident else None  # type: ignore
+    return traceback.extract_stack(frame) if frame else traceback.StackSummary()
+
+
+def _label(stack: traceback.StackSummary) -> str:
+    # innermost extension or tool frame names the culprit, otherwise the innermost project frame
+    base = files.get_base_dir() + os.sep
+    own = [f for f in stack if f.filename.startswith(base)]
+    for frame in reversed(own):
+        rel = files.deabsolute_path(frame.filename)
+        if rel.startswith(_EXTENSIONS_DIR):
+            return f"extension:{rel[len(_EXTENSIONS_DIR):]}:{frame.name}"
+        if rel.startswith(_TOOLS_DIR):
+            return f"tool:{rel[len(_TOOLS_DIR):]}:{frame.name}"
+    frame = own[-1] if own else (stack[-1] if stack else None)
+    if not frame:
+        return "unknown"
+    return f"{files.deabsolute_path(frame.filename) if own else frame.filename}:{frame.name}"
+
+
+def _format_frame(frame: traceback.FrameSummary) -> str:
+    return f"{frame.filename}:{frame.lineno} in {frame.name}"
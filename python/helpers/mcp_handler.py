@@ -365,6 +365,16 @@ MCPServer = Annotated[
 ]
 
 
+_tools_version = 0  # increased whenever servers or their tool lists change
+_tools_version_lock = threading.Lock()
+
+
+def _bump_tools_version():
+    global _tools_version
+    with _tools_version_lock:
+        _tools_version += 1
+
+
 class MCPConfig(BaseModel):
     servers: list[MCPServer] = Field(default_factory=list)
     disconnected_servers: list[dict[str, Any]] = Field(default_factory=list)
@@ -379,6 +389,10 @@ class MCPConfig(BaseModel):
             cls.__instance = cls(servers_list=[])
         return cls.__instance
 
+    @classmethod
+    def get_tools_version(cls) -> int:
+        return _tools_version
+
     @classmethod
     def wait_for_lock(cls):
         with cls.__lock:
@@ -462,6 +476,7 @@ class MCPConfig(BaseModel):
 
             # Option 1: Re-initialize the existing instance (if __init__ is idempotent for other fields)
             instance.__init__(servers_list=servers_data)
+            _bump_tools_version()
 
             # Option 2: Or, if __init__ has side effects we don't want to repeat,
             # and 'servers' is the primary thing 'update' changes:
@@ -879,6 +894,7 @@ class MCPClientBase(ABC):
                     }
                     for tool in response.tools
                 ]
+            _bump_tools_version()
             PrintStyle(font_color="green").print(
                 f"MCPClientBase ({self.server.name}): Tools updated. Found {len(self.tools)} tools."
             )
@@ -902,6 +918,7 @@ class MCPClientBase(ABC):
             with self.__lock:
                 self.tools = []  # Ensure tools are cleared on failure
                 self.error = f"Failed to initialize. {error_text[:200]}{'...' if len(error_text) > 200 else ''}"  # store error from tools fetch
+            _bump_tools_version()
         return self
 
     def has_tool(self, tool_name: str) -> bool:
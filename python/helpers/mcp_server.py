@@ -1,15 +1,19 @@
+import asyncio
 from asyncio import current_task
+from datetime import datetime, timezone
 import os
-from typing import Annotated, Literal, Union
+import time
+from typing import Annotated, Awaitable, Callable, Literal, Union
 from urllib.parse import urlparse
 from openai import BaseModel
 from pydantic import Field
-from fastmcp import FastMCP
+from fastmcp import FastMCP, Context
 
 from agent import AgentContext, AgentContextType, UserMessage
 from python.helpers.persist_chat import save_tmp_chat, remove_chat
 from initialize import initialize_agent
 from python.helpers.print_style import PrintStyle
+from python.helpers.log import LogCursor
 from python.helpers import settings
 from starlette.middleware import Middleware
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -21,6 +25,8 @@ import threading
 
 _PRINTER = PrintStyle(italic=True, font_color="green", padding=False)
 
+PROGRESS_INTERVAL = 0.25  # min seconds between progress notifications while a chat runs
+
 
 mcp_server: FastMCP = FastMCP(
     name="Agent Zero integrated MCP Server",
@@ -92,6 +98,7 @@ async def send_message(
             title="message",
         ),
     ],
+    ctx: Context,
     attachments: (
         Annotated[
             list[str],
@@ -138,26 +145,29 @@ async def send_message(
             # whether we should save the chat or delete it afterwards
             # If we continue a conversation, it must be persistent
             persistent_chat = True
-    else:
+    elif persistent_chat:
         config = initialize_agent()
         context = AgentContext(config=config, type=AgentContextType.MCP)
 
     if not message:
         return ToolError(
-            error="Message is required", chat_id=context.id if persistent_chat else ""
+            error="Message is required", chat_id=context.id if context and persistent_chat else ""
         )
 
+    # one-off chats run on pooled contexts, limited in number
+    pooled = context is None
     try:
-        response = await _run_chat(context, message, attachments)
-        if not persistent_chat:
-            context.reset()
-            AgentContext.remove(context.id)
-            remove_chat(context.id)
+        if pooled:
+            context = await McpContextPool.get().acquire()
+        response = await _run_chat(context, message, attachments, _McpProgress(ctx).report)  # type: ignore
         return ToolResponse(
-            response=response, chat_id=context.id if persistent_chat else ""
+            response=response, chat_id=context.id if persistent_chat else ""  # type: ignore
         )
     except Exception as e:
-        return ToolError(error=str(e), chat_id=context.id if persistent_chat else "")
+        return ToolError(error=str(e), chat_id=context.id if context and persistent_chat else "")
+    finally:
+        if pooled and context:
+            await McpContextPool.get().release(context)
 
 
 FINISH_CHAT_DESCRIPTION = """
@@ -219,8 +229,108 @@ async def finish_chat(
         return ToolResponse(response="Chat finished", chat_id=chat_id)
 
 
+class McpContextPool:
+    """Reusable contexts for non-persistent send_message calls.
+    Contexts are reset in place after use instead of being rebuilt, and at most
+    MAX_CONCURRENT_CHATS run at once, further calls wait in line."""
+
+    MAX_CONCURRENT_CHATS = 8
+    MAX_IDLE_CONTEXTS = 4  # reset contexts kept for reuse
+    QUEUE_TIMEOUT = 300  # seconds a call may wait for a free slot
+
+    _instance: "McpContextPool | None" = None
+
+    @staticmethod
+    def get() -> "McpContextPool":
+        if McpContextPool._instance is None:
+            McpContextPool._instance = McpContextPool()
+        return McpContextPool._instance
+
+    def __init__(self):
+        self._idle: list[tuple[AgentContext, int]] = []  # context, settings version of its config
+        self._lock = threading.Lock()
+        self._semaphore: asyncio.Semaphore | None = None
+        self.stats = {"created": 0, "reused": 0, "queued": 0, "queue_time": 0.0, "rejected": 0}
+
+    async def acquire(self) -> AgentContext:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_CHATS)
+        if self._semaphore.locked():
+            self.stats["queued"] += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.stats["rejected"] += 1
+            raise RuntimeError("Too many concurrent MCP chats, try again later")
+        self.stats["queue_time"] += time.monotonic() - started
+
+        try:
+            with self._lock:
+                context, version = self._idle.pop() if self._idle else (None, 0)
+            if context:
+                self.stats["reused"] += 1
+                if version != settings.get_settings_version():
+                    # settings changed while idle
+                    context.config = initialize_agent()
+                    context.reset()
+                AgentContext.add(context)
+                context.last_message = datetime.now(timezone.utc)
+            else:
+                self.stats["created"] += 1
+                context = AgentContext(config=initialize_agent(), type=AgentContextType.MCP)
+            return context
+        except Exception:
+            self._semaphore.release()
+            raise
+
+    async def release(self, context: AgentContext):
+        try:
+            context.reset()
+            AgentContext.remove(context.id)
+            # the chat was saved to disk during the loop, the caller did not ask to keep it
+            await asyncio.to_thread(remove_chat, context.id)
+            with self._lock:
+                if len(self._idle) < self.MAX_IDLE_CONTEXTS:
+                    self._idle.append((context, settings.get_settings_version()))
+        finally:
+            if self._semaphore:
+                self._semaphore.release()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            idle = len(self._idle)
+        return {**self.stats, "idle": idle}
+
+
+class _McpProgress:
+    """Forwards log items of a running chat to the MCP client as progress and log notifications."""
+
+    def __init__(self, ctx: Context):
+        self.ctx = ctx
+        self.progress = 0
+
+    async def report(self, cursor: LogCursor, items: list[dict]):
+        for item in items:
+            if item["type"] == "response":
+                text = cursor.response_delta(item)  # live response text as it is generated
+            else:
+                text = item["heading"]
+            if not text:
+                continue
+            self.progress += 1
+            try:
+                await self.ctx.report_progress(self.progress)
+                await self.ctx.info(text)
+            except Exception:
+                pass  # client gone or does not take notifications, the final result still counts
+
+
 async def _run_chat(
-    context: AgentContext, message: str, attachments: list[str] | None = None
+    context: AgentContext,
+    message: str,
+    attachments: list[str] | None = None,
+    on_progress: Callable[[LogCursor, list[dict]], Awaitable[None]] | None = None,
 ):
     try:
         _PRINTER.print("MCP Chat message received")
@@ -248,11 +358,27 @@ async def _run_chat(
             for filename in attachment_filenames:
                 _PRINTER.print(f"- {filename}")
 
+        # positioned before the task starts, so items it logs right away are reported too
+        cursor = LogCursor(context.log)
         task = context.communicate(
             UserMessage(
                 message=message, system_message=[], attachments=attachment_filenames
             )
         )
+
+        # forward progress until the monologue finishes
+        if on_progress:
+            while True:
+                done = task.is_ready()
+                version = task.progress_version
+                items = cursor.read()
+                if items:
+                    await on_progress(cursor, items)
+                if done:
+                    break
+                await task.wait_progress(version)
+                await asyncio.sleep(PROGRESS_INTERVAL)  # batch rapid updates
+
         result = await task.result()
 
         # Success
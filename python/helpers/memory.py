@@ -17,7 +17,7 @@ from langchain_community.vectorstores.utils import (
 )
 from langchain_core.embeddings import Embeddings
 
-import os, json
+import os, json, threading
 
 import numpy as np
 
@@ -60,6 +60,7 @@ class Memory:
         INSTRUMENTS = "instruments"
 
     index: dict[str, "MyFaiss"] = {}
+    _save_lock = threading.Lock()  # contexts on different loop threads may persist the same db
 
     @staticmethod
     async def get(agent: Agent):
@@ -392,7 +393,8 @@ class Memory:
     @staticmethod
     def _save_db_file(db: MyFaiss, memory_subdir: str):
         abs_dir = Memory._abs_db_dir(memory_subdir)
-        db.save_local(folder_path=abs_dir)
+        with Memory._save_lock:
+            db.save_local(folder_path=abs_dir)
 
     @staticmethod
     def _get_comparator(condition: str):
@@ -0,0 +1,129 @@
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+from agent import AgentContext
+from python.helpers.localization import Localization
+from python.helpers.task_scheduler import TaskScheduler
+
+# serialized fields that change with every log update, filled in per poll instead of rebuilding the snapshot
+_LOG_FIELDS = ("log_guid", "log_version", "log_length")
+
+
+@dataclass
+class Snapshot:
+    key: tuple
+    contexts: list[dict[str, Any]] = field(default_factory=list)
+    tasks: list[dict[str, Any]] = field(default_factory=list)
+
+
+_snapshot: Snapshot | None = None
+_lock = threading.Lock()
+
+
+def get_key() -> tuple:
+    return (
+        AgentContext.get_version(),
+        TaskScheduler.get().get_version(),
+        Localization.get().get_timezone(),
+    )
+
+
+def get_snapshot() -> Snapshot:
+    """Serialized contexts and tasks lists, rebuilt only when a context or the scheduler changed."""
+    global _snapshot
+    # read the key before building, a change during the build leaves a stale key and forces a rebuild next time
+    key = get_key()
+    snapshot = _snapshot
+    if snapshot and snapshot.key == key:
+        return snapshot
+    with _lock:
+        if _snapshot and _snapshot.key == key:
+            return _snapshot
+        _snapshot = _build(key)
+        return _snapshot
+
+
+def get_lists() -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Contexts and tasks lists of the current snapshot with up to date log counters."""
+    snapshot = get_snapshot()
+    return _with_logs(snapshot.contexts), _with_logs(snapshot.tasks)
+
+
+def get_etag(*state: Any) -> str:
+    """ETag of a poll response, covers the snapshot, the log counters of all contexts and the given state."""
+    logs = tuple(
+        (ctx.id, ctx.log.guid, len(ctx.log.updates), len(ctx.log.logs))
+        for ctx in AgentContext.all()
+    )
+    return hashlib.sha1(repr((get_key(), logs, state)).encode()).hexdigest()
+
+
+def _with_logs(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    result = []
+    for item in items:
+        ctx = AgentContext.get(item["id"])
+        if not ctx:
+            continue  # removed after the snapshot was built
+        result.append(
+            {
+                **item,
+                "log_guid": ctx.log.guid,
+                "log_version": len(ctx.log.updates),
+                "log_length": len(ctx.log.logs),
+            }
+        )
+    return result
+
+
+def _build(key: tuple) -> Snapshot:
+    scheduler = TaskScheduler.get()
+    snapshot = Snapshot(key=key)
+
+    for ctx in AgentContext.all():
+        # Create the base context data that will be returned
+        context_data = ctx.serialize()
+        for name in _LOG_FIELDS:
+            context_data.pop(name, None)
+
+        context_task = scheduler.get_task_by_uuid(ctx.id)
+        # Determine if this is a task-dedicated context by checking if a task with this UUID exists
+        is_task_context = context_task is not None and context_task.context_id == ctx.id
+
+        if not is_task_context:
+            snapshot.contexts.append(context_data)
+            continue
+
+        # If this is a task, get task details from the scheduler
+        task_details = scheduler.serialize_task(ctx.id)
+        if task_details:
+            # Add task details to context_data with the same field names
+            # as used in scheduler endpoints to maintain UI compatibility
+            context_data.update({
+                "task_name": task_details.get("name"), # name is for context, task_name for the task name
+                "uuid": task_details.get("uuid"),
+                "state": task_details.get("state"),
+                "type": task_details.get("type"),
+                "system_prompt": task_details.get("system_prompt"),
+                "prompt": task_details.get("prompt"),
+                "last_run": task_details.get("last_run"),
+                "last_result": task_details.get("last_result"),
+                "attachments": task_details.get("attachments", []),
+                "context_id": task_details.get("context_id"),
+            })
+
+            # Add type-specific fields
+            if task_details.get("type") == "scheduled":
+                context_data["schedule"] = task_details.get("schedule")
+            elif task_details.get("type") == "planned":
+                context_data["plan"] = task_details.get("plan")
+            else:
+                context_data["token"] = task_details.get("token")
+
+        snapshot.tasks.append(context_data)
+
+    # Sort tasks and chats by their creation date, descending
+    snapshot.contexts.sort(key=lambda x: x["created_at"], reverse=True)
+    snapshot.tasks.sort(key=lambda x: x["created_at"], reverse=True)
+    return snapshot
@@ -53,6 +53,8 @@ class Settings(TypedDict):
     agent_profile: str
     agent_memory_subdir: str
     agent_knowledge_subdir: str
+    agent_parallel_tools: bool
+    agent_subordinate_requests_per_minute: int
 
     memory_recall_enabled: bool
     memory_recall_interval: int
@@ -136,6 +138,7 @@ PASSWORD_PLACEHOLDER = "****PSWD****"
 
 SETTINGS_FILE = files.get_abs_path("tmp/settings.json")
 _settings: Settings | None = None
+_settings_version = 0  # increased on every settings change, for caches derived from settings
 
 
 
@@ -566,6 +569,26 @@ def convert_out(settings: Settings) -> SettingsOutput:
         }
     )
 
+    agent_fields.append(
+        {
+            "id": "agent_parallel_tools",
+            "title": "Parallel tool calls",
+            "description": "Allow the agent to request several independent tools in one response. Read-only tools like memory_load, search_engine and document_query then run concurrently, saving LLM round trips.",
+            "type": "switch",
+            "value": settings["agent_parallel_tools"],
+        }
+    )
+
+    agent_fields.append(
+        {
+            "id": "agent_subordinate_requests_per_minute",
+            "title": "Subordinate requests per minute",
+            "description": "Estimated number of chat model requests one running subordinate makes per minute. When the chat model has a requests per minute limit, parallel subordinates are capped so that together they stay within the remaining requests.",
+            "type": "number",
+            "value": settings["agent_subordinate_requests_per_minute"],
+        }
+    )
+
     agent_section: SettingsSection = {
         "id": "agent",
         "title": "Agent Config",
@@ -1072,10 +1095,15 @@ def get_settings() -> Settings:
     return norm
 
 
+def get_settings_version() -> int:
+    return _settings_version
+
+
 def set_settings(settings: Settings, apply: bool = True):
-    global _settings
+    global _settings, _settings_version
     previous = _settings
     _settings = normalize_settings(settings)
+    _settings_version += 1
     _write_settings_file(_settings)
     if apply:
         _apply_settings(previous)
@@ -1220,6 +1248,8 @@ def get_default_settings() -> Settings:
         agent_profile="agent0",
         agent_memory_subdir="default",
         agent_knowledge_subdir="custom",
+        agent_parallel_tools=False,
+        agent_subordinate_requests_per_minute=6,
         rfc_auto_docker=True,
         rfc_url="localhost",
         rfc_password="",
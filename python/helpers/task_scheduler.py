@@ -1,31 +1,43 @@
 import asyncio
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
+import heapq
+import json
 import os
 import random
 import threading
+import time
 from urllib.parse import urlparse
 import uuid
 from enum import Enum
 from os.path import exists
-from typing import Any, Callable, Dict, Literal, Optional, Type, TypeVar, Union, cast, ClassVar
+from typing import Any, Callable, Coroutine, Dict, Literal, Optional, Type, TypeVar, Union, cast, ClassVar
 
 import nest_asyncio
 nest_asyncio.apply()
 
 from crontab import CronTab
-from pydantic import BaseModel, Field, PrivateAttr
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter
 
 from agent import Agent, AgentContext, UserMessage
 from initialize import initialize_agent
 from python.helpers.persist_chat import save_tmp_chat
 from python.helpers.print_style import PrintStyle
-from python.helpers.defer import DeferredTask
+from python.helpers.defer import EventLoopThread
 from python.helpers.files import get_abs_path, make_dirs, read_file, write_file
 from python.helpers.localization import Localization
 import pytz
 from typing import Annotated
 
 SCHEDULER_FOLDER = "tmp/scheduler"
+TASKS_FOLDER = "tmp/scheduler/tasks"  # one json file per task
+MANIFEST_FILE = "manifest.json"  # change version counter, rewritten on every change
+LEGACY_TASKS_FILE = "tasks.json"  # single file storage, migrated whenever it is found
+MAX_CONCURRENT_TASKS = 4  # scheduler tasks executed at the same time
+MAX_RUNNING_CONTEXTS = 16  # hold queued tasks back while this many agent contexts are busy
+BACKPRESSURE_RETRY_SECONDS = 1.0
 
 # ----------------------
 # Task Models
@@ -51,12 +63,22 @@ class TaskSchedule(BaseModel):
     day: str
     month: str
     weekday: str
+    second: str | None = None  # optional, enables second granularity schedules
     timezone: str = Field(default_factory=lambda: Localization.get().get_timezone())
 
     def to_crontab(self) -> str:
+        if self.second:
+            # 7 field crontab: seconds first, any year last
+            return f"{self.second} {self.minute} {self.hour} {self.day} {self.month} {self.weekday} *"
         return f"{self.minute} {self.hour} {self.day} {self.month} {self.weekday}"
 
 
+@lru_cache(maxsize=1024)
+def _get_crontab(expression: str) -> CronTab:
+    # parsed crontabs are immutable, share them between checks
+    return CronTab(crontab=expression)  # type: ignore
+
+
 class TaskPlan(BaseModel):
     todo: list[datetime] = Field(default_factory=list)
     in_progress: datetime | None = None
@@ -212,7 +234,6 @@ class BaseTask(BaseModel):
             PrintStyle(italic=True, font_color="red", padding=False).print(
                 f"Failed to update task {self.uuid} state to ERROR after error: {error}"
             )
-        await scheduler.save()  # Force save after update
 
     async def on_success(self, result: str):
         # Update task state to IDLE and set last result
@@ -228,7 +249,6 @@ class BaseTask(BaseModel):
             PrintStyle(italic=True, font_color="red", padding=False).print(
                 f"Failed to update task {self.uuid} state to IDLE after success"
             )
-        await scheduler.save()  # Force save after update
 
 
 class AdHocTask(BaseTask):
@@ -327,7 +347,7 @@ class ScheduledTask(BaseTask):
 
     def check_schedule(self, frequency_seconds: float = 60.0) -> bool:
         with self._lock:
-            crontab = CronTab(crontab=self.schedule.to_crontab())  # type: ignore
+            crontab = _get_crontab(self.schedule.to_crontab())
 
             # Get the timezone from the schedule or use UTC as fallback
             task_timezone = pytz.timezone(self.schedule.timezone or Localization.get().get_timezone())
@@ -349,9 +369,22 @@ class ScheduledTask(BaseTask):
 
     def get_next_run(self) -> datetime | None:
         with self._lock:
-            crontab = CronTab(crontab=self.schedule.to_crontab())  # type: ignore
+            crontab = _get_crontab(self.schedule.to_crontab())
             return crontab.next(now=datetime.now(timezone.utc), return_datetime=True)  # type: ignore
 
+    def get_next_run_after(self, after: datetime) -> datetime | None:
+        """Exact next fire time strictly after the given aware datetime, in UTC."""
+        with self._lock:
+            crontab = _get_crontab(self.schedule.to_crontab())
+            task_timezone = pytz.timezone(self.schedule.timezone or Localization.get().get_timezone())
+            delay: Optional[float] = crontab.next(  # type: ignore
+                now=after.astimezone(task_timezone),
+                return_datetime=False
+            )
+            if delay is None:
+                return None
+            return after + timedelta(seconds=delay)
+
 
 class PlannedTask(BaseTask):
     type: Literal[TaskType.PLANNED] = TaskType.PLANNED
@@ -427,7 +460,6 @@ class PlannedTask(BaseTask):
             scheduler = TaskScheduler.get()
             await scheduler.reload()
             await scheduler.update_task(self.uuid, plan=self.plan)
-            await scheduler.save()  # Force save
 
         # Call the parent implementation for any additional cleanup
         await super().on_finish()
@@ -441,6 +473,12 @@ class PlannedTask(BaseTask):
         await super().on_error(error)
 
 
+# parses a single task file into its concrete type
+_TASK_ADAPTER = TypeAdapter(
+    Annotated[Union[ScheduledTask, AdHocTask, PlannedTask], Field(discriminator="type")]
+)
+
+
 class SchedulerTaskList(BaseModel):
     tasks: list[Annotated[Union[ScheduledTask, AdHocTask, PlannedTask], Field(discriminator="type")]] = Field(default_factory=list)
     # Singleton instance
@@ -450,13 +488,10 @@ class SchedulerTaskList(BaseModel):
 
     @classmethod
     def get(cls) -> "SchedulerTaskList":
-        path = get_abs_path(SCHEDULER_FOLDER, "tasks.json")
         if cls.__instance is None:
-            if not exists(path):
-                make_dirs(path)
-                cls.__instance = asyncio.run(cls(tasks=[]).save())
-            else:
-                cls.__instance = cls.model_validate_json(read_file(path))
+            instance = cls(tasks=[])
+            instance._load()
+            cls.__instance = instance
         else:
             asyncio.run(cls.__instance.reload())
         return cls.__instance
@@ -464,59 +499,296 @@ class SchedulerTaskList(BaseModel):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._lock = threading.RLock()
+        self._version = 0
+        self._manifest_stamp: tuple[int, int] | None = None
+        # task uuid -> stamp of its file and the json last read or written, to skip unchanged tasks
+        self._task_stamps: dict[str, tuple[int, int] | None] = {}
+        self._written: dict[str, str] = {}
+        # min-heap of (fire time, task uuid), entries are valid only if they match _next_runs
+        self._run_heap: list[tuple[datetime, str]] = []
+        # task uuid -> (schedule key, next fire time)
+        self._next_runs: dict[str, tuple[str, datetime]] = {}
+        # planned tasks that are due but not idle, retried on the next change
+        self._blocked: set[str] = set()
+        # planned task uuid -> schedule key already handed out, fired once until the plan moves on
+        self._fired_plans: dict[str, str] = {}
+        self._change_listeners: list[Callable[[], None]] = []
+        # lookup indexes, updated per task on add, save and remove, rebuilt when tasks are loaded
+        self._by_uuid: dict[str, Union[ScheduledTask, AdHocTask, PlannedTask]] = {}
+        # tasks sharing a name or context id in creation order, the first one wins a name lookup
+        self._by_name: dict[str, list[Union[ScheduledTask, AdHocTask, PlannedTask]]] = {}
+        self._by_context: dict[str | None, list[Union[ScheduledTask, AdHocTask, PlannedTask]]] = {}
+        # task uuid -> (name, context id) it is indexed under, tasks are edited in place
+        self._index_keys: dict[str, tuple[str, str | None]] = {}
+        self._reindex()
+        self._refresh_schedule()
 
     async def reload(self) -> "SchedulerTaskList":
-        path = get_abs_path(SCHEDULER_FOLDER, "tasks.json")
-        if exists(path):
-            with self._lock:
-                data = self.__class__.model_validate_json(read_file(path))
-                self.tasks.clear()
-                self.tasks.extend(data.tasks)
+        self._load()
         return self
 
+    def _load(self):
+        with self._lock:
+            manifest_path = get_abs_path(SCHEDULER_FOLDER, MANIFEST_FILE)
+            # a tasks.json can also show up next to the manifest, e.g. restored from an old backup
+            if not exists(manifest_path) or exists(get_abs_path(SCHEDULER_FOLDER, LEGACY_TASKS_FILE)):
+                self._migrate_legacy()
+
+            # every writer bumps the manifest, skip everything if it has not changed
+            stamp = self._get_file_stamp(manifest_path)
+            if stamp is not None and stamp == self._manifest_stamp:
+                return
+            try:
+                version = int(json.loads(read_file(manifest_path)).get("version", 0))
+            except (OSError, ValueError):
+                version = 0
+
+            current = {task.uuid: task for task in self.tasks}
+            tasks = []
+            tasks_dir = get_abs_path(TASKS_FOLDER)
+            # the manifest can exist without the tasks folder, e.g. after a partial backup restore
+            make_dirs(get_abs_path(TASKS_FOLDER, "_"))
+            with os.scandir(tasks_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".json"):
+                        continue
+                    task_uuid = entry.name[: -len(".json")]
+                    task_stamp = self._get_file_stamp(entry.path)
+                    if task_uuid in current and self._task_stamps.get(task_uuid) == task_stamp:
+                        tasks.append(current[task_uuid])
+                        continue
+                    try:
+                        content = read_file(entry.path)
+                        task = _TASK_ADAPTER.validate_json(content)
+                    except Exception as e:
+                        PrintStyle.error(f"Failed to load scheduler task {entry.name}: {e}")
+                        continue
+                    self._task_stamps[task_uuid] = task_stamp
+                    self._written[task_uuid] = content
+                    tasks.append(task)
+
+            # directory order is arbitrary, keep tasks in creation order
+            tasks.sort(key=lambda task: task.created_at)
+            loaded = {task.uuid for task in tasks}
+            for task_uuid in list(self._written):
+                if task_uuid not in loaded:
+                    self._written.pop(task_uuid, None)
+                    self._task_stamps.pop(task_uuid, None)
+            self.tasks.clear()
+            self.tasks.extend(tasks)
+            self._manifest_stamp = stamp
+            self._version = max(self._version + 1, version)
+            self._reindex()
+            self._on_change()
+
+    def _migrate_legacy(self):
+        make_dirs(get_abs_path(TASKS_FOLDER, "_"))
+        legacy_path = get_abs_path(SCHEDULER_FOLDER, LEGACY_TASKS_FILE)
+        if exists(legacy_path):
+            legacy = self.__class__.model_validate_json(read_file(legacy_path))
+            for task in legacy.tasks:
+                self._write_task(task)
+            os.replace(legacy_path, legacy_path + ".bak")
+        self._bump_version()
+        self._manifest_stamp = None  # force load of migrated tasks
+
+    def _task_path(self, task_uuid: str) -> str:
+        return get_abs_path(TASKS_FOLDER, f"{task_uuid}.json")
+
+    @staticmethod
+    def _write_atomic(path: str, content: str):
+        # readers never see a partially written file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def _serialize_task(self, task: Union["ScheduledTask", "AdHocTask", "PlannedTask"]) -> str:
+        # Debug: check for AdHocTasks with null tokens before saving
+        if isinstance(task, AdHocTask):
+            if task.token is None or task.token == "":
+                PrintStyle(italic=True, font_color="red", padding=False).print(
+                    f"WARNING: AdHocTask {task.name} ({task.uuid}) has a null or empty token before saving: '{task.token}'"
+                )
+                # Generate a new token to prevent errors
+                task.token = str(random.randint(1000000000000000000, 9999999999999999999))
+                PrintStyle(italic=True, font_color="red", padding=False).print(
+                    f"Fixed: Generated new token '{task.token}' for task {task.name}"
+                )
+        return task.model_dump_json()
+
+    def _write_task(self, task: Union["ScheduledTask", "AdHocTask", "PlannedTask"]) -> bool:
+        """Write a single task file if its content changed, returns True if written."""
+        data = self._serialize_task(task)
+        if self._written.get(task.uuid) == data:
+            return False
+        path = self._task_path(task.uuid)
+        self._write_atomic(path, data)
+        self._written[task.uuid] = data
+        self._task_stamps[task.uuid] = self._get_file_stamp(path)
+        return True
+
+    def _delete_task(self, task_uuid: str) -> bool:
+        self._written.pop(task_uuid, None)
+        self._task_stamps.pop(task_uuid, None)
+        try:
+            os.remove(self._task_path(task_uuid))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _bump_version(self):
+        self._version += 1
+        path = get_abs_path(SCHEDULER_FOLDER, MANIFEST_FILE)
+        self._write_atomic(path, json.dumps({"version": self._version}))
+        self._manifest_stamp = self._get_file_stamp(path)
+
+    def get_version(self) -> int:
+        """Change counter, increases whenever any task is added, updated or removed."""
+        return self._version
+
+    @staticmethod
+    def _get_file_stamp(path: str) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def add_change_listener(self, listener: Callable[[], None]):
+        """Register a callback invoked (from any thread) whenever tasks change."""
+        with self._lock:
+            if listener not in self._change_listeners:
+                self._change_listeners.append(listener)
+
+    def _reindex(self):
+        with self._lock:
+            self._by_uuid, self._by_name, self._by_context, self._index_keys = {}, {}, {}, {}
+            for task in self.tasks:
+                self._index_add(task)
+
+    def _index_add(self, task: Union[ScheduledTask, AdHocTask, PlannedTask]):
+        self._by_uuid[task.uuid] = task
+        self._index_keys[task.uuid] = (task.name, task.context_id)
+        _insert_by_creation(self._by_name.setdefault(task.name, []), task)
+        _insert_by_creation(self._by_context.setdefault(task.context_id, []), task)
+
+    def _index_remove(self, task_uuid: str):
+        task = self._by_uuid.pop(task_uuid, None)
+        keys = self._index_keys.pop(task_uuid, None)
+        if task is None or keys is None:
+            return
+        name, context_id = keys
+        _discard_from(self._by_name, name, task)
+        _discard_from(self._by_context, context_id, task)
+
+    def _index_update(self, task: Union[ScheduledTask, AdHocTask, PlannedTask]):
+        """Re-index a task whose name or context id may have been changed in place since it was indexed."""
+        if self._by_uuid.get(task.uuid) is task and self._index_keys.get(task.uuid) == (task.name, task.context_id):
+            return
+        self._index_remove(task.uuid)
+        self._index_add(task)
+
+    def _on_change(self):
+        self._refresh_schedule()
+        for listener in list(self._change_listeners):
+            try:
+                listener()
+            except Exception as e:
+                PrintStyle.error(f"Scheduler change listener failed: {e}")
+
+    def _schedule_key(self, task: Union[ScheduledTask, AdHocTask, PlannedTask]) -> str | None:
+        if isinstance(task, ScheduledTask):
+            return f"{task.schedule.to_crontab()}|{task.schedule.timezone}"
+        if isinstance(task, PlannedTask):
+            next_launch = task.plan.get_next_launch_time()
+            return f"plan|{next_launch.isoformat()}" if next_launch else None
+        return None
+
+    def _compute_next_run(
+        self, task: Union[ScheduledTask, AdHocTask, PlannedTask], after: datetime
+    ) -> datetime | None:
+        if isinstance(task, ScheduledTask):
+            return task.get_next_run_after(after)
+        if isinstance(task, PlannedTask):
+            return task.plan.get_next_launch_time()
+        return None
+
+    def _refresh_schedule(self):
+        """Recompute next fire times of new or changed tasks only and rebuild the heap."""
+        with self._lock:
+            now = datetime.now(timezone.utc)
+            next_runs: dict[str, tuple[str, datetime]] = {}
+            for task in self.tasks:
+                key = self._schedule_key(task)
+                if key is None or self._fired_plans.get(task.uuid) == key:
+                    continue
+                self._fired_plans.pop(task.uuid, None)
+                current = self._next_runs.get(task.uuid)
+                if current and current[0] == key:
+                    next_runs[task.uuid] = current
+                    continue
+                try:
+                    next_run = self._compute_next_run(task, now)
+                except Exception as e:
+                    PrintStyle.error(f"Invalid schedule of task {task.name}: {e}")
+                    continue
+                if next_run is not None:
+                    next_runs[task.uuid] = (key, next_run)
+            self._next_runs = next_runs
+            task_uuids = {task.uuid for task in self.tasks}
+            self._fired_plans = {u: k for u, k in self._fired_plans.items() if u in task_uuids}
+            self._run_heap = [(run, uuid) for uuid, (_, run) in next_runs.items()]
+            heapq.heapify(self._run_heap)
+            self._blocked.clear()
+
+    def get_next_run_time(self) -> datetime | None:
+        """Earliest pending fire time of any task, None if nothing is scheduled."""
+        with self._lock:
+            while self._run_heap:
+                run, uuid = self._run_heap[0]
+                current = self._next_runs.get(uuid)
+                if uuid in self._blocked or not current or current[1] != run:
+                    heapq.heappop(self._run_heap)  # stale entry
+                    continue
+                return run
+            return None
+
     async def add_task(self, task: Union[ScheduledTask, AdHocTask, PlannedTask]) -> "SchedulerTaskList":
         with self._lock:
             self.tasks.append(task)
-            await self.save()
+            self._index_add(task)
+            await self.save_task(task)
+        return self
+
+    async def save_task(self, task: Union[ScheduledTask, AdHocTask, PlannedTask]) -> "SchedulerTaskList":
+        """Persist a single task, other task files are not touched."""
+        with self._lock:
+            self._index_update(task)
+            if self._write_task(task):
+                self._bump_version()
+                self._on_change()
         return self
 
     async def save(self) -> "SchedulerTaskList":
+        """Persist all tasks that changed since they were last read or written."""
         with self._lock:
-            # Debug: check for AdHocTasks with null tokens before saving
+            changed = False
             for task in self.tasks:
-                if isinstance(task, AdHocTask):
-                    if task.token is None or task.token == "":
-                        PrintStyle(italic=True, font_color="red", padding=False).print(
-                            f"WARNING: AdHocTask {task.name} ({task.uuid}) has a null or empty token before saving: '{task.token}'"
-                        )
-                        # Generate a new token to prevent errors
-                        task.token = str(random.randint(1000000000000000000, 9999999999999999999))
-                        PrintStyle(italic=True, font_color="red", padding=False).print(
-                            f"Fixed: Generated new token '{task.token}' for task {task.name}"
-                        )
-
-            path = get_abs_path(SCHEDULER_FOLDER, "tasks.json")
-            if not exists(path):
-                make_dirs(path)
-
-            # Get the JSON string before writing
-            json_data = self.model_dump_json()
-
-            # Debug: check if 'null' appears as token value in JSON
-            if '"type": "adhoc"' in json_data and '"token": null' in json_data:
-                PrintStyle(italic=True, font_color="red", padding=False).print(
-                    "ERROR: Found null token in JSON output for an adhoc task"
-                )
+                self._index_update(task)
+                changed = self._write_task(task) or changed
 
-            write_file(path, json_data)
+            # tasks dropped from the list
+            task_uuids = {task.uuid for task in self.tasks}
+            for task_uuid in [u for u in self._by_uuid if u not in task_uuids]:
+                self._index_remove(task_uuid)
+            for task_uuid in [u for u in self._written if u not in task_uuids]:
+                self._delete_task(task_uuid)
+                changed = True
 
-            # Debug: Verify after saving
-            if exists(path):
-                loaded_json = read_file(path)
-                if '"type": "adhoc"' in loaded_json and '"token": null' in loaded_json:
-                    PrintStyle(italic=True, font_color="red", padding=False).print(
-                        "ERROR: Null token persisted in JSON file for an adhoc task"
-                    )
+            if changed:
+                self._bump_version()
+                self._on_change()
 
         return self
 
@@ -539,15 +811,15 @@ class SchedulerTaskList(BaseModel):
             await self.reload()
 
             # Find the task
-            task = next((task for task in self.tasks if task.uuid == task_uuid and verify_func(task)), None)
-            if task is None:
+            task = self._by_uuid.get(task_uuid)
+            if task is None or not verify_func(task):
                 return None
 
             # Apply the updates via the provided function
             updater_func(task)
 
-            # Save the changes
-            await self.save()
+            # Save the changes of this task only
+            await self.save_task(task)
 
             return task
 
@@ -558,26 +830,59 @@ class SchedulerTaskList(BaseModel):
     def get_tasks_by_context_id(self, context_id: str, only_running: bool = False) -> list[Union[ScheduledTask, AdHocTask, PlannedTask]]:
         with self._lock:
             return [
-                task for task in self.tasks
-                if task.context_id == context_id
-                and (not only_running or task.state == TaskState.RUNNING)
+                task for task in self._by_context.get(context_id, [])
+                if not only_running or task.state == TaskState.RUNNING
             ]
 
     async def get_due_tasks(self) -> list[Union[ScheduledTask, AdHocTask, PlannedTask]]:
+        return [task for task, _ in await self.get_due_runs()]
+
+    async def get_due_runs(self) -> list[tuple[Union[ScheduledTask, AdHocTask, PlannedTask], datetime]]:
+        """Pop all due (task, fire time) entries from the next-run heap. Every fire time is handed out once."""
         with self._lock:
             await self.reload()
-            return [
-                task for task in self.tasks
-                if task.check_schedule() and task.state == TaskState.IDLE
-            ]
+            now = datetime.now(timezone.utc)
+            tasks_by_uuid = self._by_uuid
+            due = []
+            while self._run_heap and self._run_heap[0][0] <= now:
+                run, uuid = heapq.heappop(self._run_heap)
+                current = self._next_runs.get(uuid)
+                task = tasks_by_uuid.get(uuid)
+                if not current or current[1] != run or task is None or uuid in self._blocked:
+                    continue  # stale entry
+
+                if isinstance(task, PlannedTask):
+                    # plan items stay due until launched, wait for the task to become idle
+                    if task.state == TaskState.IDLE:
+                        due.append((task, run))
+                        self._fired_plans[uuid] = current[0]
+                        del self._next_runs[uuid]
+                    else:
+                        self._blocked.add(uuid)
+                    continue
+
+                # cron occurrence is consumed even if the task is busy, like a missed minute
+                if task.state == TaskState.IDLE:
+                    due.append((task, run))
+                next_run = self._compute_next_run(task, run)
+                if next_run is not None and next_run <= now:
+                    # loop was paused or late, skip missed occurrences instead of bursting
+                    next_run = self._compute_next_run(task, now)
+                if next_run is None:
+                    del self._next_runs[uuid]
+                    continue
+                self._next_runs[uuid] = (current[0], next_run)
+                heapq.heappush(self._run_heap, (next_run, uuid))
+            return due
 
     def get_task_by_uuid(self, task_uuid: str) -> Union[ScheduledTask, AdHocTask, PlannedTask] | None:
         with self._lock:
-            return next((task for task in self.tasks if task.uuid == task_uuid), None)
+            return self._by_uuid.get(task_uuid)
 
     def get_task_by_name(self, name: str) -> Union[ScheduledTask, AdHocTask, PlannedTask] | None:
         with self._lock:
-            return next((task for task in self.tasks if task.name == name), None)
+            tasks = self._by_name.get(name)
+            return tasks[0] if tasks else None
 
     def find_task_by_name(self, name: str) -> list[Union[ScheduledTask, AdHocTask, PlannedTask]]:
         with self._lock:
@@ -586,16 +891,161 @@ class SchedulerTaskList(BaseModel):
     async def remove_task_by_uuid(self, task_uuid: str) -> "SchedulerTaskList":
         with self._lock:
             self.tasks = [task for task in self.tasks if task.uuid != task_uuid]
+            self._index_remove(task_uuid)
             await self.save()
         return self
 
     async def remove_task_by_name(self, name: str) -> "SchedulerTaskList":
         with self._lock:
+            for task in list(self._by_name.get(name, [])):
+                self._index_remove(task.uuid)
             self.tasks = [task for task in self.tasks if task.name != name]
             await self.save()
         return self
 
 
+def _insert_by_creation(tasks: list, task: Union[ScheduledTask, AdHocTask, PlannedTask]):
+    # new tasks go last, an edited one goes back to its place in creation order
+    i = len(tasks)
+    while i and tasks[i - 1].created_at > task.created_at:
+        i -= 1
+    tasks.insert(i, task)
+
+
+def _discard_from(index: dict, key: Any, task: Union[ScheduledTask, AdHocTask, PlannedTask]):
+    tasks = index.get(key)
+    if tasks is None:
+        return
+    tasks[:] = [t for t in tasks if t is not task]
+    if not tasks:
+        del index[key]
+
+
+@dataclass
+class _QueuedRun:
+    task_uuid: str
+    task_type: str
+    due_time: datetime
+    task_context: str | None
+
+
+class SchedulerExecutor:
+    """
+    Bounded pool executing scheduler tasks on the scheduler event loop thread.
+    Runs are queued per task type and dispatched round-robin, at most max_concurrency at once,
+    and held back while too many agent contexts are busy.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[str, str | None], Coroutine[Any, Any, Any]],
+        max_concurrency: int = MAX_CONCURRENT_TASKS,
+        max_running_contexts: int = MAX_RUNNING_CONTEXTS,
+    ):
+        self.runner = runner
+        self.max_concurrency = max_concurrency
+        self.max_running_contexts = max_running_contexts
+        self._loop_thread = EventLoopThread("TaskScheduler")
+        self._lock = threading.Lock()
+        self._queues: dict[str, deque[_QueuedRun]] = {t.value: deque() for t in TaskType}
+        self._next_queue = 0
+        self._running = 0
+        self._retry_scheduled = False
+        # metrics
+        self._started = 0
+        self._completed = 0
+        self._failed = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._latency_last = 0.0
+
+    def submit(self, task: Union["ScheduledTask", "AdHocTask", "PlannedTask"], due_time: datetime | None = None, task_context: str | None = None):
+        run = _QueuedRun(
+            task_uuid=task.uuid,
+            task_type=task.type.value,
+            due_time=due_time or datetime.now(timezone.utc),
+            task_context=task_context,
+        )
+        with self._lock:
+            self._queues[run.task_type].append(run)
+        self._schedule_dispatch()
+
+    def _schedule_dispatch(self, delay: float = 0.0):
+        self._loop_thread._start()
+        loop = self._loop_thread.loop
+        if not loop:
+            raise RuntimeError("Event loop is not initialized")
+        if delay:
+            loop.call_soon_threadsafe(loop.call_later, delay, self._dispatch)
+        else:
+            loop.call_soon_threadsafe(self._dispatch)
+
+    def _count_busy_contexts(self) -> int:
+        return sum(1 for ctx in AgentContext.all() if ctx.task and ctx.task.is_alive())
+
+    def _next_run(self) -> _QueuedRun | None:
+        # round-robin over task type queues so one type cannot starve the others
+        order = list(self._queues.keys())
+        for i in range(len(order)):
+            queue = self._queues[order[(self._next_queue + i) % len(order)]]
+            if queue:
+                self._next_queue = (self._next_queue + i + 1) % len(order)
+                return queue.popleft()
+        return None
+
+    def _dispatch(self):
+        # runs on the scheduler loop thread
+        with self._lock:
+            self._retry_scheduled = False
+            while self._running < self.max_concurrency and any(self._queues.values()):
+                if self._running + self._count_busy_contexts() >= self.max_running_contexts:
+                    # backpressure, try again later
+                    if not self._retry_scheduled:
+                        self._retry_scheduled = True
+                        asyncio.get_running_loop().call_later(BACKPRESSURE_RETRY_SECONDS, self._dispatch)
+                    break
+                run = self._next_run()
+                if not run:
+                    break
+                self._running += 1
+                self._started += 1
+                latency = max(0.0, (datetime.now(timezone.utc) - run.due_time).total_seconds())
+                self._latency_last = latency
+                self._latency_total += latency
+                self._latency_max = max(self._latency_max, latency)
+                asyncio.get_running_loop().create_task(self._execute(run))
+
+    async def _execute(self, run: _QueuedRun):
+        failed = False
+        try:
+            await self.runner(run.task_uuid, run.task_context)
+        except Exception as e:
+            failed = True
+            PrintStyle.error(f"Scheduler task {run.task_uuid} failed in executor: {e}")
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                if failed:
+                    self._failed += 1
+            self._dispatch()
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_running_contexts": self.max_running_contexts,
+                "running": self._running,
+                "queued": {name: len(queue) for name, queue in self._queues.items()},
+                "started": self._started,
+                "completed": self._completed,
+                "failed": self._failed,
+                "queue_latency_last": round(self._latency_last, 3),
+                "queue_latency_avg": round(self._latency_total / self._started, 3) if self._started else 0.0,
+                "queue_latency_max": round(self._latency_max, 3),
+            }
+
+
 class TaskScheduler:
 
     _tasks: SchedulerTaskList
@@ -613,6 +1063,7 @@ class TaskScheduler:
         if not hasattr(self, '_initialized'):
             self._tasks = SchedulerTaskList.get()
             self._printer = PrintStyle(italic=True, font_color="green", padding=False)
+            self._executor = SchedulerExecutor(self._execute_task)
             self._initialized = True
 
     async def reload(self):
@@ -646,9 +1097,21 @@ class TaskScheduler:
     def find_task_by_name(self, name: str) -> list[Union[ScheduledTask, AdHocTask, PlannedTask]]:
         return self._tasks.find_task_by_name(name)
 
+    def add_change_listener(self, listener: Callable[[], None]):
+        self._tasks.add_change_listener(listener)
+
+    def get_next_run_time(self) -> datetime | None:
+        return self._tasks.get_next_run_time()
+
+    def get_version(self) -> int:
+        return self._tasks.get_version()
+
+    def get_executor_stats(self) -> dict[str, Any]:
+        return self._executor.get_stats()
+
     async def tick(self):
-        for task in await self._tasks.get_due_tasks():
-            await self._run_task(task)
+        for task, due_time in await self._tasks.get_due_runs():
+            await self._run_task(task, due_time=due_time)
 
     async def run_task_by_uuid(self, task_uuid: str, task_context: str | None = None):
         # First reload tasks to ensure we have the latest state
@@ -744,134 +1207,130 @@ class TaskScheduler:
             raise ValueError(f"Context ID mismatch for task {task.name}: context {context.id} != task {task.context_id}")
         save_tmp_chat(context)
 
-    async def _run_task(self, task: Union[ScheduledTask, AdHocTask, PlannedTask], task_context: str | None = None):
-
-        async def _run_task_wrapper(task_uuid: str, task_context: str | None = None):
-
-            # preflight checks with a snapshot of the task
-            task_snapshot: Union[ScheduledTask, AdHocTask, PlannedTask] | None = self.get_task_by_uuid(task_uuid)
-            if task_snapshot is None:
-                self._printer.print(f"Scheduler Task with UUID '{task_uuid}' not found")
-                return
-            if task_snapshot.state == TaskState.RUNNING:
-                self._printer.print(f"Scheduler Task '{task_snapshot.name}' already running, skipping")
-                return
-
-            # Atomically fetch and check the task's current state
-            current_task = await self.update_task_checked(task_uuid, lambda task: task.state != TaskState.RUNNING, state=TaskState.RUNNING)
-            if not current_task:
-                self._printer.print(f"Scheduler Task with UUID '{task_uuid}' not found or updated by another process")
-                return
-            if current_task.state != TaskState.RUNNING:
-                # This means the update failed due to state conflict
-                self._printer.print(f"Scheduler Task '{current_task.name}' state is '{current_task.state}', skipping")
-                return
-
-            await current_task.on_run()
-
-            # the agent instance - init in try block
-            agent = None
-
-            try:
-                self._printer.print(f"Scheduler Task '{current_task.name}' started")
-
-                context = await self._get_chat_context(current_task)
-
-                # Ensure the context is properly registered in the AgentContext._contexts
-                # This is critical for the polling mechanism to find and stream logs
-                # Dict operations are atomic
-                # AgentContext._contexts[context.id] = context
-                agent = context.streaming_agent or context.agent0
-
-                # Prepare attachment filenames for logging
-                attachment_filenames = []
-                if current_task.attachments:
-                    for attachment in current_task.attachments:
-                        if os.path.exists(attachment):
-                            attachment_filenames.append(attachment)
-                        else:
-                            try:
-                                url = urlparse(attachment)
-                                if url.scheme in ["http", "https", "ftp", "ftps", "sftp"]:
-                                    attachment_filenames.append(attachment)
-                                else:
-                                    self._printer.print(f"Skipping attachment: [{attachment}]")
-                            except Exception:
+    async def _run_task(self, task: Union[ScheduledTask, AdHocTask, PlannedTask], task_context: str | None = None, due_time: datetime | None = None):
+        # queue on the bounded executor, runs in the background on the scheduler loop thread
+        self._executor.submit(task, due_time=due_time, task_context=task_context)
+
+    async def _execute_task(self, task_uuid: str, task_context: str | None = None):
+        # preflight checks with a snapshot of the task
+        task_snapshot: Union[ScheduledTask, AdHocTask, PlannedTask] | None = self.get_task_by_uuid(task_uuid)
+        if task_snapshot is None:
+            self._printer.print(f"Scheduler Task with UUID '{task_uuid}' not found")
+            return
+        if task_snapshot.state == TaskState.RUNNING:
+            self._printer.print(f"Scheduler Task '{task_snapshot.name}' already running, skipping")
+            return
+
+        # Atomically fetch and check the task's current state
+        current_task = await self.update_task_checked(task_uuid, lambda task: task.state != TaskState.RUNNING, state=TaskState.RUNNING)
+        if not current_task:
+            self._printer.print(f"Scheduler Task with UUID '{task_uuid}' not found or updated by another process")
+            return
+        if current_task.state != TaskState.RUNNING:
+            # This means the update failed due to state conflict
+            self._printer.print(f"Scheduler Task '{current_task.name}' state is '{current_task.state}', skipping")
+            return
+
+        await current_task.on_run()
+
+        # the agent instance - init in try block
+        agent = None
+
+        try:
+            self._printer.print(f"Scheduler Task '{current_task.name}' started")
+
+            context = await self._get_chat_context(current_task)
+
+            # Ensure the context is properly registered in the AgentContext._contexts
+            # This is critical for the polling mechanism to find and stream logs
+            # Dict operations are atomic
+            # AgentContext._contexts[context.id] = context
+            agent = context.streaming_agent or context.agent0
+
+            # Prepare attachment filenames for logging
+            attachment_filenames = []
+            if current_task.attachments:
+                for attachment in current_task.attachments:
+                    if os.path.exists(attachment):
+                        attachment_filenames.append(attachment)
+                    else:
+                        try:
+                            url = urlparse(attachment)
+                            if url.scheme in ["http", "https", "ftp", "ftps", "sftp"]:
+                                attachment_filenames.append(attachment)
+                            else:
                                 self._printer.print(f"Skipping attachment: [{attachment}]")
+                        except Exception:
+                            self._printer.print(f"Skipping attachment: [{attachment}]")
+
+            self._printer.print("User message:")
+            self._printer.print(f"> {current_task.prompt}")
+            if attachment_filenames:
+                self._printer.print("Attachments:")
+                for filename in attachment_filenames:
+                    self._printer.print(f"- {filename}")
+
+            task_prompt = f"# Starting scheduler task '{current_task.name}' ({current_task.uuid})"
+            if task_context:
+                task_prompt = f"## Context:\n{task_context}\n\n## Task:\n{current_task.prompt}"
+            else:
+                task_prompt = f"## Task:\n{current_task.prompt}"
+
+            # Log the message with message_id and attachments
+            context.log.log(
+                type="user",
+                heading="User message",
+                content=task_prompt,
+                kvps={"attachments": attachment_filenames},
+                id=str(uuid.uuid4()),
+            )
 
-                self._printer.print("User message:")
-                self._printer.print(f"> {current_task.prompt}")
-                if attachment_filenames:
-                    self._printer.print("Attachments:")
-                    for filename in attachment_filenames:
-                        self._printer.print(f"- {filename}")
-
-                task_prompt = f"# Starting scheduler task '{current_task.name}' ({current_task.uuid})"
-                if task_context:
-                    task_prompt = f"## Context:\n{task_context}\n\n## Task:\n{current_task.prompt}"
-                else:
-                    task_prompt = f"## Task:\n{current_task.prompt}"
-
-                # Log the message with message_id and attachments
-                context.log.log(
-                    type="user",
-                    heading="User message",
-                    content=task_prompt,
-                    kvps={"attachments": attachment_filenames},
-                    id=str(uuid.uuid4()),
-                )
-
-                agent.hist_add_user_message(
-                    UserMessage(
-                        message=task_prompt,
-                        system_message=[current_task.system_prompt],
-                        attachments=attachment_filenames))
-
-                # Persist after setting up the context but before running the agent
-                # This ensures the task context is saved and can be found by polling
-                await self._persist_chat(current_task, context)
-
-                result = await agent.monologue()
-
-                # Success
-                self._printer.print(f"Scheduler Task '{current_task.name}' completed: {result}")
-                await self._persist_chat(current_task, context)
-                await current_task.on_success(result)
-
-                # Explicitly verify task was updated in storage after success
-                await self._tasks.reload()
-                updated_task = self.get_task_by_uuid(task_uuid)
-                if updated_task and updated_task.state != TaskState.IDLE:
-                    self._printer.print(f"Fixing task state consistency: '{current_task.name}' state is not IDLE after success")
-                    await self.update_task(task_uuid, state=TaskState.IDLE)
+            agent.hist_add_user_message(
+                UserMessage(
+                    message=task_prompt,
+                    system_message=[current_task.system_prompt],
+                    attachments=attachment_filenames))
 
-            except Exception as e:
-                # Error
-                self._printer.print(f"Scheduler Task '{current_task.name}' failed: {e}")
-                await current_task.on_error(str(e))
+            # Persist after setting up the context but before running the agent
+            # This ensures the task context is saved and can be found by polling
+            await self._persist_chat(current_task, context)
 
-                # Explicitly verify task was updated in storage after error
-                await self._tasks.reload()
-                updated_task = self.get_task_by_uuid(task_uuid)
-                if updated_task and updated_task.state != TaskState.ERROR:
-                    self._printer.print(f"Fixing task state consistency: '{current_task.name}' state is not ERROR after failure")
-                    await self.update_task(task_uuid, state=TaskState.ERROR)
+            result = await agent.monologue()
 
-                if agent:
-                    agent.handle_critical_exception(e)
-            finally:
-                # Call on_finish for task-specific cleanup
-                await current_task.on_finish()
+            # Success
+            self._printer.print(f"Scheduler Task '{current_task.name}' completed: {result}")
+            await self._persist_chat(current_task, context)
+            await current_task.on_success(result)
 
-                # Make one final save to ensure all states are persisted
-                await self._tasks.save()
+            # Explicitly verify task was updated in storage after success
+            await self._tasks.reload()
+            updated_task = self.get_task_by_uuid(task_uuid)
+            if updated_task and updated_task.state != TaskState.IDLE:
+                self._printer.print(f"Fixing task state consistency: '{current_task.name}' state is not IDLE after success")
+                await self.update_task(task_uuid, state=TaskState.IDLE)
 
-        deferred_task = DeferredTask(thread_name=self.__class__.__name__)
-        deferred_task.start_task(_run_task_wrapper, task.uuid, task_context)
+        except Exception as e:
+            # Error
+            self._printer.print(f"Scheduler Task '{current_task.name}' failed: {e}")
+            await current_task.on_error(str(e))
 
-        # Ensure background execution doesn't exit immediately on async await, especially in script contexts
-        # This helps prevent premature exits when running from non-event-loop contexts
-        asyncio.create_task(asyncio.sleep(0.1))
+            # Explicitly verify task was updated in storage after error
+            await self._tasks.reload()
+            updated_task = self.get_task_by_uuid(task_uuid)
+            if updated_task and updated_task.state != TaskState.ERROR:
+                self._printer.print(f"Fixing task state consistency: '{current_task.name}' state is not ERROR after failure")
+                await self.update_task(task_uuid, state=TaskState.ERROR)
+
+            if agent:
+                agent.handle_critical_exception(e)
+        finally:
+            # Call on_finish for task-specific cleanup
+            await current_task.on_finish()
+
+            # Make one final save of this task to ensure its state is persisted
+            final_task = self.get_task_by_uuid(task_uuid)
+            if final_task:
+                await self._tasks.save_task(final_task)
 
     def serialize_all_tasks(self) -> list[Dict[str, Any]]:
         """
@@ -935,6 +1394,7 @@ def serialize_task_schedule(schedule: TaskSchedule) -> Dict[str, str]:
         'day': schedule.day,
         'month': schedule.month,
         'weekday': schedule.weekday,
+        'second': schedule.second,
         'timezone': schedule.timezone
     }
 
@@ -948,6 +1408,7 @@ def parse_task_schedule(schedule_data: Dict[str, str]) -> TaskSchedule:
             day=schedule_data.get('day', '*'),
             month=schedule_data.get('month', '*'),
             weekday=schedule_data.get('weekday', '*'),
+            second=schedule_data.get('second') or None,
             timezone=schedule_data.get('timezone', Localization.get().get_timezone())
         )
     except Exception as e:
@@ -21,6 +21,11 @@ class Tool:
         self.loop_data = loop_data
         self.message = message
 
+    @classmethod
+    def parallel_safe(cls) -> bool:
+        """Tools without side effects on the agent or environment may run concurrently with other such tools."""
+        return False
+
     @abstractmethod
     async def execute(self,**kwargs) -> Response:
         pass
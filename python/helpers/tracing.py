@@ -0,0 +1,192 @@
+import asyncio
+import contextvars
+import itertools
+import json
+import os
+import time
+import weakref
+from collections import deque
+from typing import Any
+
+from python.helpers import files
+from python.helpers.dotenv import get_dotenv_value
+
+TRACES_FOLDER = "tmp/traces"
+MAX_SPANS = 20000  # finished spans kept per context, oldest are dropped first
+
+_enabled = str(get_dotenv_value("A0_TRACING", "")).lower() in ("1", "true")
+_traces: dict[str, "Trace"] = {}
+_ids = itertools.count(1)
+
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar(
+    "tracing_span", default=None
+)
+
+
+class Trace:
+    def __init__(self, context_id: str):
+        self.context_id = context_id
+        self.spans: deque[dict[str, Any]] = deque(maxlen=MAX_SPANS)
+        # asyncio task -> small track number, finished tasks drop out so ids are never reused
+        self._tasks: weakref.WeakKeyDictionary[asyncio.Task, int] = weakref.WeakKeyDictionary()
+        self._track_numbers = itertools.count(1)
+
+    def track(self) -> int:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is None:
+            return 0  # outside of a task, e.g. a worker thread
+        number = self._tasks.get(task)
+        if number is None:
+            number = self._tasks[task] = next(self._track_numbers)
+        return number
+
+
+class Span:
+    __slots__ = ("trace", "id", "parent", "name", "attrs", "start", "track", "_token")
+
+    def __init__(self, trace: Trace, parent: "Span | None", name: str, attrs: dict[str, Any]):
+        self.trace = trace
+        self.id = next(_ids)
+        self.parent = parent.id if parent else None
+        self.name = name
+        self.attrs = attrs
+        self.track = trace.track()
+        self.start = time.perf_counter_ns()
+        self._token = _current_span.set(self)
+
+    def set(self, **attrs: Any):
+        self.attrs.update(attrs)
+
+    def event(self, name: str, **attrs: Any):
+        """Record an instant, e.g. the first token of a stream."""
+        self.trace.spans.append(
+            {"name": name, "parent": self.id, "track": self.track, "start": time.perf_counter_ns(), "duration": None, "attrs": attrs}
+        )
+
+    def end(self, error: BaseException | None = None):
+        if not self._token:
+            return
+        duration = time.perf_counter_ns() - self.start
+        if error is not None:
+            self.attrs["error"] = type(error).__name__
+        self.trace.spans.append(
+            {"id": self.id, "name": self.name, "parent": self.parent, "track": self.track, "start": self.start, "duration": duration, "attrs": self.attrs}
+        )
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            _current_span.set(None)  # ended from another context, just detach
+        self._token = None
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end(exc)
+
+
+class _NoopSpan:
+    """Returned while tracing is off or outside a traced context, every call is a no-op."""
+
+    def set(self, **attrs: Any):
+        pass
+
+    def event(self, name: str, **attrs: Any):
+        pass
+
+    def end(self, error: BaseException | None = None):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, context_id: str | None = None, **attrs: Any) -> Span | _NoopSpan:
+    """Start a span as a child of the current one. Root spans pass the context_id
+    they belong to, nested spans inherit it. Use as a context manager or call end()."""
+    if not _enabled:
+        return _NOOP
+    parent = _current_span.get()
+    if context_id:
+        trace = get_trace(context_id)
+    elif parent:
+        trace = parent.trace
+    else:
+        return _NOOP
+    return Span(trace, parent, name, attrs)
+
+
+def current() -> Span | _NoopSpan:
+    return _current_span.get() or _NOOP
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(enabled: bool):
+    global _enabled
+    _enabled = enabled
+
+
+def get_trace(context_id: str) -> Trace:
+    trace = _traces.get(context_id)
+    if not trace:
+        trace = _traces[context_id] = Trace(context_id)
+    return trace
+
+
+def remove_trace(context_id: str):
+    _traces.pop(context_id, None)
+
+
+def export_json(context_id: str) -> list[dict[str, Any]]:
+    trace = _traces.get(context_id)
+    if not trace:
+        return []
+    return [
+        {
+            **s,
+            "start": s["start"] / 1000,
+            "duration": s["duration"] / 1000 if s["duration"] is not None else None,
+        }
+        for s in list(trace.spans)
+    ]  # microseconds
+
+
+def export_chrome(context_id: str) -> dict[str, Any]:
+    """Trace Event Format, opens in chrome://tracing and Perfetto."""
+    events = []
+    for s in export_json(context_id):
+        event = {
+            "name": s["name"],
+            "cat": s["name"].split(":", 1)[0],
+            "ts": s["start"],
+            "pid": 1,
+            "tid": s["track"],
+            "args": s["attrs"],
+        }
+        if s["duration"] is None:
+            event.update(ph="i", s="t")
+        else:
+            event.update(ph="X", dur=s["duration"])
+        events.append(event)
+    return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"context": context_id}}
+
+
+def save(context_id: str, format: str = "chrome") -> str:
+    data = export_chrome(context_id) if format == "chrome" else export_json(context_id)
+    path = files.get_abs_path(TRACES_FOLDER, f"{context_id}.{format}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, default=str)
+    return path
@@ -1,18 +1,69 @@
 import base64
+import io
+import queue
+import subprocess
+import threading
+import time
 import warnings
 import whisper
-import tempfile
 import asyncio
+import numpy as np
+import torch
+import soundfile as sf
+from concurrent.futures import Future
+from dataclasses import dataclass, field
 from python.helpers import runtime, rfc, settings, files
 from python.helpers.print_style import PrintStyle
 
 # Suppress FutureWarning from torch.load
 warnings.filterwarnings("ignore", category=FutureWarning)
 
+MAX_BATCH_SIZE = 8  # max concurrent short clips decoded in one batch
+
+# quality thresholds of whisper.transcribe (its defaults), batched results failing them are transcribed again
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+TIME_PRECISION = 0.02  # seconds per timestamp token
+
 _model = None
 _model_name = ""
+_model_lock = threading.Lock()
 is_updating_model = False  # Tracks whether the model is currently updating
 
+
+@dataclass
+class _TranscriptionRequest:
+    model_name: str
+    audio: np.ndarray
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class _Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.batches = 0
+        self.last_queue_time = 0.0
+        self.last_latency = 0.0
+        self.total_latency = 0.0
+
+    def record(self, request: _TranscriptionRequest, started_at: float):
+        now = time.perf_counter()
+        with self.lock:
+            self.requests += 1
+            self.last_queue_time = started_at - request.enqueued_at
+            self.last_latency = now - request.enqueued_at
+            self.total_latency += self.last_latency
+
+
+_queue: "queue.Queue[_TranscriptionRequest]" = queue.Queue()
+_worker: threading.Thread | None = None
+_worker_lock = threading.Lock()
+_stats = _Stats()
+
+
 async def preload(model_name:str):
     try:
         # return await runtime.call_development_function(_preload, model_name)
@@ -20,21 +71,24 @@ async def preload(model_name:str):
     except Exception as e:
         # if not runtime.is_development():
         raise e
-        
+
 async def _preload(model_name:str):
-    global _model, _model_name, is_updating_model
+    # load off the event loop, model download and init can take minutes
+    await asyncio.to_thread(_load_model, model_name)
 
-    while is_updating_model:
-        await asyncio.sleep(0.1)
+def _load_model(model_name: str):
+    global _model, _model_name, is_updating_model
 
-    try:
-        is_updating_model = True
+    with _model_lock:
         if not _model or _model_name != model_name:
+            try:
+                is_updating_model = True
                 PrintStyle.standard(f"Loading Whisper model: {model_name}")
                 _model = whisper.load_model(name=model_name, download_root=files.get_abs_path("/tmp/models/whisper")) # type: ignore
                 _model_name = model_name
-    finally:
-        is_updating_model = False
+            finally:
+                is_updating_model = False
+        return _model
 
 async def is_downloading():
     # return await runtime.call_development_function(_is_downloading)
@@ -56,28 +110,193 @@ async def is_downloaded():
 def _is_downloaded():
     return _model is not None
 
+def get_stats() -> dict:
+    """Queue depth and latency of the transcription worker"""
+    with _stats.lock:
+        return {
+            "queue_depth": _queue.qsize(),
+            "requests": _stats.requests,
+            "batches": _stats.batches,
+            "last_queue_time": round(_stats.last_queue_time, 3),
+            "last_latency": round(_stats.last_latency, 3),
+            "avg_latency": round(_stats.total_latency / _stats.requests, 3) if _stats.requests else 0.0,
+        }
+
 async def transcribe(model_name:str, audio_bytes_b64: str):
     # return await runtime.call_development_function(_transcribe, model_name, audio_bytes_b64)
     return await _transcribe(model_name, audio_bytes_b64)
 
 
 async def _transcribe(model_name:str, audio_bytes_b64: str):
-    await _preload(model_name)
-    
     # Decode audio bytes if encoded as a base64 string
     audio_bytes = base64.b64decode(audio_bytes_b64)
+    audio = await asyncio.to_thread(_decode_audio, audio_bytes)
+
+    # hand over to the worker thread, the event loop stays free while the model runs
+    request = _TranscriptionRequest(model_name=model_name, audio=audio)
+    _ensure_worker()
+    _queue.put(request)
+    return await asyncio.wrap_future(request.future)
+
+
+def _decode_audio(audio_bytes: bytes) -> np.ndarray:
+    """Decode audio in memory to 16 kHz mono float32 as expected by whisper"""
+    try:
+        data, sample_rate = sf.read(io.BytesIO(audio_bytes), dtype="float32", always_2d=True)
+        if sample_rate == whisper.audio.SAMPLE_RATE:
+            return data.mean(axis=1)
+    except Exception:
+        pass  # not a format libsndfile knows (e.g. webm from MediaRecorder), use ffmpeg
 
-    # Create temp audio file
-    import os
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as audio_file:
-        audio_file.write(audio_bytes)
-        temp_path = audio_file.name
+    # same conversion as whisper.load_audio, but piped instead of via a file
+    cmd = [
+        "ffmpeg", "-nostdin", "-threads", "0",
+        "-i", "pipe:0",
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le",
+        "-ar", str(whisper.audio.SAMPLE_RATE),
+        "pipe:1",
+    ]
     try:
-        # Transcribe the audio file
-        result = _model.transcribe(temp_path, fp16=False) # type: ignore
-        return result
-    finally:
+        out = subprocess.run(cmd, input=audio_bytes, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to load audio: {e.stderr.decode()}") from e
+    return np.frombuffer(out, np.int16).flatten().astype(np.float32) / 32768.0
+
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_worker_loop, name="WhisperWorker", daemon=True)
+            _worker.start()
+
+
+def _worker_loop():
+    while True:
+        batch = [_queue.get()]
+        # collect whatever arrived concurrently, up to the batch limit
+        while len(batch) < MAX_BATCH_SIZE:
+            try:
+                batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        started_at = time.perf_counter()
+        for model_name in dict.fromkeys(r.model_name for r in batch):
+            group = [r for r in batch if r.model_name == model_name]
+            try:
+                _run_batch(_load_model(model_name), group)
+            except Exception as e:
+                PrintStyle.error(f"Whisper transcription failed: {e}")
+                for r in group:
+                    if not r.future.done():
+                        r.future.set_exception(e)
+            for r in group:
+                _stats.record(r, started_at)
+        with _stats.lock:
+            _stats.batches += 1
+
+
+def _run_batch(model, requests: list[_TranscriptionRequest]):
+    # clips that fit into one 30s window can be decoded together in a single forward pass
+    short = [r for r in requests if len(r.audio) <= whisper.audio.N_SAMPLES]
+    long = [r for r in requests if len(r.audio) > whisper.audio.N_SAMPLES]
+    if len(short) == 1:
+        long.append(short.pop())
+
+    if short:
+        mels = np.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(r.audio), model.dims.n_mels).numpy()
+            for r in short
+        ])
+        results = whisper.decode(
+            model,
+            torch.from_numpy(mels).to(model.device),
+            whisper.DecodingOptions(fp16=False, temperature=0.0),
+        )
+        for r, res in zip(short, results):  # type: ignore
+            if _needs_fallback(res):
+                # transcribe retries with rising temperature, same as an unbatched clip would get
+                long.append(r)
+            elif _is_silence(res):
+                r.future.set_result({"text": "", "segments": [], "language": res.language})
+            else:
+                segments = _segments(model, res, len(r.audio) / whisper.audio.SAMPLE_RATE)
+                r.future.set_result({
+                    "text": "".join(s["text"] for s in segments),
+                    "segments": segments,
+                    "language": res.language,
+                })
+
+    for r in long:
         try:
-            os.remove(temp_path)
-        except Exception:
-            pass # ignore errors during cleanup
+            r.future.set_result(model.transcribe(r.audio, fp16=False))
+        except Exception as e:
+            r.future.set_exception(e)
+
+
+def _is_silence(res) -> bool:
+    # whisper.transcribe skips such a window instead of emitting its text
+    return res.no_speech_prob > NO_SPEECH_THRESHOLD and res.avg_logprob < LOGPROB_THRESHOLD
+
+
+def _needs_fallback(res) -> bool:
+    if _is_silence(res):
+        return False
+    return res.compression_ratio > COMPRESSION_RATIO_THRESHOLD or res.avg_logprob < LOGPROB_THRESHOLD
+
+
+def _segments(model, res, duration: float) -> list[dict]:
+    """Split a single window decode result at its timestamp tokens the way whisper.transcribe does"""
+    tokenizer = whisper.tokenizer.get_tokenizer(
+        model.is_multilingual,
+        num_languages=model.num_languages,
+        language=res.language,
+        task="transcribe",
+    )
+    begin = tokenizer.timestamp_begin
+    tokens = list(res.tokens)
+    is_timestamp = [t >= begin for t in tokens]
+
+    # a pair of consecutive timestamp tokens closes one segment and opens the next
+    slices = [i + 1 for i in range(len(tokens) - 1) if is_timestamp[i] and is_timestamp[i + 1]]
+    if slices and is_timestamp[-2:] == [False, True]:
+        slices.append(len(tokens))
+
+    spans: list[tuple[float, float, list[int]]] = []
+    if slices:
+        last = 0
+        for current in slices:
+            part = tokens[last:current]
+            spans.append(((part[0] - begin) * TIME_PRECISION, (part[-1] - begin) * TIME_PRECISION, part))
+            last = current
+        if last < len(tokens):
+            # text after the last closed segment, transcribe would pick it up in the next window
+            part = tokens[last:]
+            start = (part[0] - begin) * TIME_PRECISION if is_timestamp[last] else spans[-1][1]
+            spans.append((start, duration, part))
+    else:
+        end = duration
+        stamps = [t for t in tokens if t >= begin]
+        if stamps and stamps[-1] != begin:
+            end = (stamps[-1] - begin) * TIME_PRECISION
+        spans.append((0.0, end, tokens))
+
+    segments = []
+    for start, end, part in spans:
+        text = tokenizer.decode([t for t in part if t < tokenizer.eot])
+        if start == end or not text.strip():
+            continue
+        segments.append({
+            "id": len(segments),
+            "seek": 0,
+            "start": round(start, 2),
+            "end": round(min(end, duration), 2),
+            "text": text,
+            "tokens": part,
+            "temperature": res.temperature,
+            "avg_logprob": res.avg_logprob,
+            "compression_ratio": res.compression_ratio,
+            "no_speech_prob": res.no_speech_prob,
+        })
+    return segments
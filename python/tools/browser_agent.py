@@ -1,8 +1,9 @@
 import asyncio
+import io
+import os
 import time
 from typing import Optional
 from agent import Agent, InterventionException
-from pathlib import Path
 
 
 import models
@@ -10,9 +11,11 @@ from python.helpers.tool import Tool, Response
 from python.helpers import files, defer, persist_chat, strings
 from python.helpers.browser_use import browser_use
 from python.helpers.print_style import PrintStyle
-from python.helpers.playwright import ensure_playwright_binary
+from python.helpers import browser_pool
+from python.helpers.browser_pool import BrowserPool, BrowserLease
 from python.extensions.message_loop_start._10_iteration_no import get_iter_no
 from pydantic import BaseModel
+from PIL import Image
 import uuid
 from python.helpers.dirty_json import DirtyJson
 
@@ -26,6 +29,7 @@ class State:
     def __init__(self, agent: Agent):
         self.agent = agent
         self.browser_session: Optional[browser_use.BrowserSession] = None
+        self.lease: Optional[BrowserLease] = None
         self.task: Optional[defer.DeferredTask] = None
         self.use_agent: Optional[browser_use.Agent] = None
         self.iter_no = 0
@@ -34,11 +38,17 @@ class State:
         self.kill_task()
 
     async def _initialize(self):
-        if self.browser_session:
-            return
-
-        # for some reason we need to provide exact path to headless shell, otherwise it looks for headed browser
-        pw_binary = ensure_playwright_binary()
+        pool = BrowserPool.get()
+        if self.lease and not self.lease.released:
+            pool.set_busy(self.lease)
+            if self.browser_session:
+                return
+        else:
+            # first task, or the pool reclaimed the context while it was idle
+            self.browser_session = None
+            self.use_agent = None
+            # isolated context on a shared warm browser instead of a chromium process per agent
+            self.lease = await pool.acquire(owner=self.agent.context.id)
 
         self.browser_session = browser_use.BrowserSession(
             browser_profile=browser_use.BrowserProfile(
@@ -48,65 +58,56 @@ class State:
                 accept_downloads=True,
                 downloads_dir=files.get_abs_path("tmp/downloads"),
                 downloads_path=files.get_abs_path("tmp/downloads"),
-                executable_path=pw_binary,
-                keep_alive=True,
+                keep_alive=True,  # the context is owned and closed by the pool
                 minimum_wait_page_load_time=1.0,
                 wait_for_network_idle_page_load_time=2.0,
                 maximum_wait_page_load_time=10.0,
-                screen={"width": 1024, "height": 2048},
-                viewport={"width": 1024, "height": 2048},
-                args=["--headless=new"],
-                # Use a unique user data directory to avoid conflicts
-                user_data_dir=str(
-                    Path.home()
-                    / ".config"
-                    / "browseruse"
-                    / "profiles"
-                    / f"agent_{self.agent.context.id}"
-                ),
-            )
+                screen=browser_pool.VIEWPORT,
+                viewport=browser_pool.VIEWPORT,
+            ),
+            playwright=BrowserPool.get().playwright,
+            browser=self.lease.browser,
+            browser_context=self.lease.context,
         )
 
         await self.browser_session.start()
         # self.override_hooks()
 
-        # Add init script to the browser session
-        if self.browser_session.browser_context:
-            js_override = files.get_abs_path("lib/browser/init_override.js")
-            await self.browser_session.browser_context.add_init_script(path=js_override)
-
     def start_task(self, task: str):
         if self.task and self.task.is_alive():
             self.kill_task()
 
-        self.task = defer.DeferredTask(
-            thread_name="BrowserAgent" + self.agent.context.id
-        )
+        # all browser tasks share the pool loop, never terminate its thread
+        self.task = defer.DeferredTask(thread_name=browser_pool.POOL_THREAD)
         if self.agent.context.task:
-            self.agent.context.task.add_child_task(self.task, terminate_thread=True)
+            self.agent.context.task.add_child_task(self.task, terminate_thread=False)
         self.task.start_task(self._run_task, task)
         return self.task
 
     def kill_task(self):
         if self.task:
-            self.task.kill(terminate_thread=True)
+            self.task.kill(terminate_thread=False)
             self.task = None
-        if self.browser_session:
+        if self.lease:
             try:
-                import asyncio
-
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                loop.run_until_complete(self.browser_session.close())
-                loop.close()
+                BrowserPool.get().release_threadsafe(self.lease)
             except Exception as e:
                 PrintStyle().error(f"Error closing browser session: {e}")
             finally:
-                self.browser_session = None
+                self.lease = None
+        self.browser_session = None
         self.use_agent = None
         self.iter_no = 0
 
     async def _run_task(self, task: str):
+        try:
+            return await self._run_use_agent(task)
+        finally:
+            # the context stays for follow-up tasks, but the pool may hand it to another agent
+            if self.lease and not self.lease.released:
+                await BrowserPool.get().set_idle(self.lease)
+
+    async def _run_use_agent(self, task: str):
         await self._initialize()
 
         class DoneResult(BaseModel):
@@ -201,10 +202,85 @@ class State:
         return {}
 
 
+SCREENSHOT_MIN_INTERVAL = 1.0  # seconds between screenshots of a changing page
+SCREENSHOT_MAX_INTERVAL = 10.0  # screenshot at least this often even without change events
+SCREENSHOT_QUALITY = 60
+SCREENSHOT_HASH_DISTANCE = 3  # max differing dhash bits to treat screenshots as duplicates
+
+
+class ScreenshotThrottle:
+    """Takes a screenshot only when the page navigated or its DOM changed, or after an interval
+    that backs off while nothing changes. Duplicates are detected by perceptual hash and not written."""
+
+    def __init__(self):
+        self.last_capture = 0.0
+        self.interval = SCREENSHOT_MIN_INTERVAL
+        self.last_signal: tuple | None = None
+        self.last_hash: int | None = None
+        self.stats = {"checks": 0, "captures": 0, "duplicates": 0, "written": 0}
+
+    async def capture(self, page, path: str) -> bool:
+        """Update the screenshot file at path if the page visibly changed, returns True if written."""
+        self.stats["checks"] += 1
+        now = time.monotonic()
+        elapsed = now - self.last_capture
+        try:
+            mutations = await page.evaluate("window.__a0_mutations || 0")
+        except Exception:
+            mutations = None  # page is navigating
+        signal = (page.url, mutations)
+        changed = signal != self.last_signal
+        if not (changed and elapsed >= SCREENSHOT_MIN_INTERVAL) and elapsed < self.interval:
+            return False
+
+        self.last_signal = signal
+        self.last_capture = now
+        self.stats["captures"] += 1
+        data = await page.screenshot(
+            type="jpeg", quality=SCREENSHOT_QUALITY, scale="css", full_page=False, timeout=3000
+        )
+        image_hash = await asyncio.to_thread(_dhash, data)
+        if self.last_hash is not None and bin(self.last_hash ^ image_hash).count("1") <= SCREENSHOT_HASH_DISTANCE:
+            # nothing visible changed, check less often
+            self.stats["duplicates"] += 1
+            self.interval = min(self.interval * 2, SCREENSHOT_MAX_INTERVAL)
+            return False
+
+        self.last_hash = image_hash
+        self.interval = SCREENSHOT_MIN_INTERVAL
+        await asyncio.to_thread(_write_rolling, path, data)
+        self.stats["written"] += 1
+        return True
+
+
+def _dhash(data: bytes, size: int = 8) -> int:
+    # difference hash: compare neighbouring pixels of a tiny grayscale version
+    with Image.open(io.BytesIO(data)) as img:
+        small = img.convert("L").resize((size + 1, size), Image.Resampling.BILINEAR)
+        pixels = list(small.getdata())
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+
+def _write_rolling(path: str, data: bytes):
+    # overwrite the single screenshot file atomically, the UI may be reading it
+    files.make_dirs(path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
 class BrowserAgent(Tool):
 
     async def execute(self, message="", reset="", **kwargs):
         self.guid = str(uuid.uuid4())
+        self.screenshots = ScreenshotThrottle()
         reset = str(reset).lower().strip() == "true"
         await self.prepare_state(reset=reset)
         task = self.state.start_task(message)
@@ -376,11 +452,10 @@ class BrowserAgent(Tool):
                         persist_chat.get_chat_folder_path(agent.context.id),
                         "browser",
                         "screenshots",
-                        f"{self.guid}.png",
+                        f"{self.guid}.jpg",
                     )
-                    files.make_dirs(path)
-                    await page.screenshot(path=path, full_page=False, timeout=3000)
-                    result["screenshot"] = f"img://{path}&t={str(time.time())}"
+                    if await self.screenshots.capture(page, path):
+                        result["screenshot"] = f"img://{path}&t={str(time.time())}"
 
                 if self.state.task and not self.state.task.is_ready():
                     await self.state.task.execute_inside(_get_update)
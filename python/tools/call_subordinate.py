@@ -1,10 +1,22 @@
-from agent import Agent, UserMessage
+import asyncio
+import dataclasses
+
+from agent import Agent, HandledException, UserMessage
+from python.helpers import errors
 from python.helpers.tool import Tool, Response
+import models
+
+MAX_PARALLEL_SUBORDINATES = 4
 
 
 class Delegation(Tool):
 
     async def execute(self, message="", reset="", **kwargs):
+        # several independent subtasks, run them on parallel subordinates
+        tasks = kwargs.get("tasks")
+        if isinstance(tasks, list) and tasks:
+            return await self.fan_out(tasks)
+
         # create subordinate agent using the data object on this agent and set superior agent to his data object
         if (
             self.agent.get_data(Agent.DATA_NAME_SUBORDINATE) is None
@@ -15,6 +27,8 @@ class Delegation(Tool):
             # register superior/subordinate
             sub.set_data(Agent.DATA_NAME_SUPERIOR, self.agent)
             self.agent.set_data(Agent.DATA_NAME_SUBORDINATE, sub)
+            # the chain below a parallel subordinate is parallel too
+            sub.set_data(Agent.DATA_NAME_PARALLEL, self.agent.get_data(Agent.DATA_NAME_PARALLEL))
             # set default prompt profile to new agents
             sub.config.profile = ""
 
@@ -33,10 +47,84 @@ class Delegation(Tool):
         # result
         return Response(message=result, break_loop=False)
 
+    async def fan_out(self, tasks: list) -> Response:
+        subordinates: list[Agent] = []
+        for i, task in enumerate(tasks):
+            if isinstance(task, str):
+                task = {"message": task}
+            # every subordinate gets its own config copy so profiles do not leak between them
+            config = dataclasses.replace(
+                self.agent.config, profile=str(task.get("profile") or "")
+            )
+            sub = Agent(self.agent.number + 1, config, self.agent.context)
+            sub.agent_name = f"{sub.agent_name}.{i + 1}"
+            sub.set_data(Agent.DATA_NAME_SUPERIOR, self.agent)
+            # the superior keeps streaming, the subordinates only log
+            sub.set_data(Agent.DATA_NAME_PARALLEL, True)
+            sub.hist_add_user_message(
+                UserMessage(message=str(task.get("message", "")), attachments=[])
+            )
+            subordinates.append(sub)
+
+        limit = await self.get_parallel_limit()
+        semaphore = asyncio.Semaphore(limit)
+
+        async def run(sub: Agent) -> str:
+            async with semaphore:
+                try:
+                    return await sub.monologue()
+                except HandledException as e:
+                    cause = e.args[0] if e.args else e
+                    if isinstance(cause, asyncio.CancelledError):
+                        raise
+                    # already logged by the subordinate, report it to the superior and keep the others going
+                    return f"Error: {errors.error_text(cause)}"
+
+        self.log.update(parallel=limit)
+        # user interventions go to all running subordinates
+        self.agent.set_data(Agent.DATA_NAME_PARALLEL_SUBORDINATES, subordinates)
+        running = [asyncio.create_task(run(sub)) for sub in subordinates]
+        try:
+            results = await asyncio.gather(*running)
+        except BaseException:
+            for task in running:
+                task.cancel()
+            raise
+        finally:
+            self.agent.set_data(Agent.DATA_NAME_PARALLEL_SUBORDINATES, None)
+
+        message = "\n\n".join(
+            f"## {sub.agent_name}"
+            + (f" ({sub.config.profile})" if sub.config.profile else "")
+            + f"\n{result}"
+            for sub, result in zip(subordinates, results)
+        )
+        return Response(message=message, break_loop=False)
+
+    async def get_parallel_limit(self) -> int:
+        limit = MAX_PARALLEL_SUBORDINATES
+        model = self.agent.config.chat_model
+        if model.limit_requests:
+            # subordinates share the chat model rate limiter with every other agent,
+            # running more of them than it allows only makes them queue
+            limiter = models.get_rate_limiter(
+                model.provider,
+                model.name,
+                model.limit_requests,
+                model.limit_input,
+                model.limit_output,
+            )
+            await limiter.cleanup()
+            used = await limiter.get_total("requests")
+            headroom = max(0, model.limit_requests - used)
+            per_subordinate = max(1, self.agent.config.subordinate_requests_per_minute)
+            limit = min(limit, max(1, headroom // per_subordinate))
+        return limit
+
     def get_log_object(self):
         return self.agent.context.log.log(
             type="tool",
             heading=f"icon://communication {self.agent.agent_name}: Calling Subordinate Agent",
             content="",
             kvps=self.args,
-        )
\ No newline at end of file
+        )
@@ -4,6 +4,10 @@ from python.helpers.document_query import DocumentQueryHelper
 
 class DocumentQueryTool(Tool):
 
+    @classmethod
+    def parallel_safe(cls) -> bool:
+        return True
+
     async def execute(self, **kwargs):
         document_uri = kwargs["document"] or None
         queries = kwargs["queries"] if "queries" in kwargs else [kwargs["query"]] if ("query" in kwargs and kwargs["query"]) else []
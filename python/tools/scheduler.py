@@ -146,6 +146,7 @@ class SchedulerTool(Tool):
             day=schedule.get("day", "*"),
             month=schedule.get("month", "*"),
             weekday=schedule.get("weekday", "*"),
+            second=schedule.get("second") or None,
         )
 
         # Validate cron expression, agent might hallucinate
@@ -10,6 +10,11 @@ SEARCH_ENGINE_RESULTS = 10
 
 
 class SearchEngine(Tool):
+
+    @classmethod
+    def parallel_safe(cls) -> bool:
+        return True
+
     async def execute(self, query="", **kwargs):
 
 
@@ -5,9 +5,7 @@ from python.helpers import runtime, files, images
 from mimetypes import guess_type
 from python.helpers import history
 
-# image optimization and token estimation for context window
-MAX_PIXELS = 768_000
-QUALITY = 75
+# token estimation for context window, images are compressed to images.VARIANT_LLM
 TOKENS_ESTIMATE = 1500
 
 
@@ -30,9 +28,9 @@ class VisionLoad(Tool):
                             files.read_file_base64, str(path)
                         )
                         file_content = base64.b64decode(file_content)
-                        # Compress and convert to JPEG
-                        compressed = images.compress_image(
-                            file_content, max_pixels=MAX_PIXELS, quality=QUALITY
+                        # Compress and convert to JPEG (cached by content hash)
+                        compressed = await images.get_variant_async(
+                            file_content, images.VARIANT_LLM
                         )
                         # Encode as base64
                         file_content_b64 = base64.b64encode(compressed).decode("utf-8")
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import timedelta
 import os
 import secrets
@@ -151,13 +152,14 @@ def csrf_protect(f):
 async def serve_index():
     gitinfo = None
     try:
-        gitinfo = git.get_git_info()
+        gitinfo = await asyncio.to_thread(git.get_git_info)
     except Exception:
         gitinfo = {
             "version": "unknown",
             "commit_time": "unknown",
         }
-    return files.read_file(
+    return await asyncio.to_thread(
+        files.read_file,
         "./webui/index.html",
         version_no=gitinfo["version"],
         version_time=gitinfo["commit_time"],
@@ -201,6 +203,7 @@ def run():
             handler_wrap = requires_api_key(handler_wrap)
         if handler.requires_csrf():
             handler_wrap = csrf_protect(handler_wrap)
+        handler_wrap.blocks_loop = handler.blocks_loop()  # type: ignore
 
         app.add_url_rule(
             f"/{name}",
@@ -214,23 +217,35 @@ def run():
     for handler in handlers:
         register_api_handler(webapp, handler)
 
-    # add the webapp and mcp to the app
-    app = DispatcherMiddleware(
-        webapp,
-        {
-            "/mcp": ASGIMiddleware(app=mcp_server.DynamicMcpProxy.get_instance()),  # type: ignore
-        },
-    )
-
     PrintStyle().debug(f"Starting server at http://{host}:{port} ...")
 
-    server = make_server(
-        host=host,
-        port=port,
-        app=app,
-        request_handler=NoRequestLoggingWSGIRequestHandler,
-        threaded=True,
-    )
+    if _use_asgi():
+        # one event loop for the API handlers, static files and /mcp
+        from python.helpers import asgi
+
+        server = asgi.make_server(
+            host=host,
+            port=port,
+            app=webapp,
+            mounts={"/mcp": mcp_server.DynamicMcpProxy.get_instance()},  # type: ignore
+            static_dir=get_abs_path("./webui"),
+        )
+    else:
+        # add the webapp and mcp to the app
+        app = DispatcherMiddleware(
+            webapp,
+            {
+                "/mcp": ASGIMiddleware(app=mcp_server.DynamicMcpProxy.get_instance()),  # type: ignore
+            },
+        )
+
+        server = make_server(
+            host=host,
+            port=port,
+            app=app,
+            request_handler=NoRequestLoggingWSGIRequestHandler,
+            threaded=True,
+        )
     process.set_server(server)
     server.log_startup()
 
@@ -242,6 +257,11 @@ def run():
     server.serve_forever()
 
 
+def _use_asgi() -> bool:
+    server = runtime.get_arg("server") or dotenv.get_dotenv_value("WEB_UI_SERVER") or "wsgi"
+    return str(server).lower() == "asgi"
+
+
 def init_a0():
     # initialize contexts and MCP
     init_chats = initialize.initialize_chats()
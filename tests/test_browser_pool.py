@@ -0,0 +1,100 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("playwright")
+
+from python.helpers import browser_pool
+from python.helpers.browser_pool import BrowserPool
+
+SLOTS = browser_pool.MAX_BROWSERS * browser_pool.MAX_CONTEXTS_PER_BROWSER
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def is_connected(self) -> bool:
+        return True
+
+    async def close(self):
+        pass
+
+
+class FakePool(BrowserPool):
+    """Pool with in-memory browsers, no chromium is started."""
+
+    async def _start_browser(self):
+        return FakeBrowser()
+
+    async def _new_context(self, browser):
+        return FakeContext()
+
+
+def test_sequential_leases_beyond_capacity_reuse_idle_slots():
+    async def run():
+        pool = FakePool()
+        leases = []
+        # one finished browser task per chat, more chats than the pool has slots
+        for i in range(SLOTS * 2 + 1):
+            lease = await asyncio.wait_for(pool.acquire(owner=f"chat-{i}"), timeout=5)
+            await pool.set_idle(lease)
+            leases.append(lease)
+
+        stats = pool.get_stats()
+        assert stats["browsers"] == browser_pool.MAX_BROWSERS
+        assert stats["active_contexts"] == SLOTS
+        assert stats["reclaims"] == SLOTS + 1
+        # the oldest idle contexts were the ones reclaimed
+        assert all(lease.released and lease.context.closed for lease in leases[: SLOTS + 1])
+        assert not any(lease.released for lease in leases[SLOTS + 1 :])
+
+    asyncio.run(run())
+
+
+def test_released_leases_free_their_slot():
+    async def run():
+        pool = FakePool()
+        for i in range(SLOTS * 2 + 1):
+            lease = await asyncio.wait_for(pool.acquire(owner=f"chat-{i}"), timeout=5)
+            await pool.release(lease)
+            assert lease.context.closed
+        assert pool.get_stats()["active_contexts"] == 0
+        assert pool.get_stats()["reclaims"] == 0
+
+    asyncio.run(run())
+
+
+def test_acquire_times_out_when_every_context_is_busy():
+    async def run():
+        pool = FakePool()
+        for i in range(SLOTS):
+            await pool.acquire(owner=f"chat-{i}")
+        with pytest.raises(TimeoutError):
+            await pool.acquire(owner="late", timeout=0.1)
+        assert pool.get_stats()["timeouts"] == 1
+
+    asyncio.run(run())
+
+
+def test_waiter_reclaims_a_lease_that_becomes_idle():
+    async def run():
+        pool = FakePool()
+        busy = [await pool.acquire(owner=f"chat-{i}") for i in range(SLOTS)]
+        waiter = asyncio.create_task(pool.acquire(owner="late", timeout=5))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        await pool.set_idle(busy[3])
+        lease = await asyncio.wait_for(waiter, timeout=1)
+        assert busy[3].released and not lease.released
+
+    asyncio.run(run())
@@ -268,6 +268,11 @@ const model = {
     return `/image_get?path=/a0/tmp/uploads/${encodeURIComponent(filename)}`;
   },
 
+  // Compressed thumbnail of a server-stored image, cached server-side
+  getServerThumbUrl(filename) {
+    return `${this.getServerImgUrl(filename)}&variant=thumb`;
+  },
+
   getServerFileUrl(filename) {
     return `/a0/tmp/uploads/${encodeURIComponent(filename)}`;
   },
@@ -348,7 +353,7 @@ const model = {
       const extension = filename.split(".").pop();
       const isImage = this.isImageFile(filename);
       const previewUrl = isImage
-        ? this.getServerImgUrl(filename)
+        ? this.getServerThumbUrl(filename)
         : this.getFilePreviewUrl(filename);
 
       return {
@@ -370,7 +375,7 @@ const model = {
       const filename = attachment.name;
       const extension = filename.split(".").pop() || "";
       const previewUrl = isImage
-        ? this.getServerImgUrl(attachment.name)
+        ? this.getServerThumbUrl(attachment.name)
         : this.getFilePreviewUrl(attachment.name);
       return {
         filename: filename,
@@ -1,6 +1,7 @@
 import { createStore } from "/js/AlpineStore.js";
 import { updateChatInput, sendMessage } from "/index.js";
 import { sleep } from "/js/sleep.js";
+import { fetchApi } from "/js/api.js";
 import { store as microphoneSettingStore } from "/components/settings/speech/microphone-setting-store.js";
 
 const Status = {
@@ -34,6 +35,8 @@ const model = {
   userHasInteracted: false,
   stopSpeechChain: false,
   ttsStream: null,
+  kokoroPrefetch: null,
+  resolvePlayback: null,
 
   // STT State
   microphoneInput: null,
@@ -214,6 +217,14 @@ const model = {
       // set the index of last spoken chunk
       this.ttsStream.lastChunkIndex = i;
 
+      // synthesize the next chunk while this one plays
+      const next = i + 1;
+      if (
+        next < this.ttsStream.chunks.length - 1 ||
+        (next == this.ttsStream.chunks.length - 1 && this.ttsStream.finished)
+      )
+        this.prefetchKokoro(this.ttsStream.chunks[next]);
+
       // speak the chunk
       spoken.push(this.ttsStream.chunks[i]);
       await this._speak(this.ttsStream.chunks[i], i > 0, () => terminator());
@@ -385,39 +396,72 @@ const model = {
     this.synth.speak(this.browserUtterance);
   },
 
+  // start synthesis of a chunk ahead of time, it is picked up by speakWithKokoro
+  prefetchKokoro(text) {
+    if (!this.tts_kokoro || this.kokoroPrefetch?.text === text) return;
+    const response = this.requestKokoro(text);
+    response.catch(() => {}); // reported when the chunk is spoken
+    this.kokoroPrefetch = { text, response };
+  },
+
+  // synthesize on the backend, audio is streamed sentence by sentence
+  requestKokoro(text) {
+    return fetchApi("/synthesize", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ text, stream: true }),
+    });
+  },
+
   // Kokoro TTS
   async speakWithKokoro(text, waitForPrevious = false, terminator = null) {
     try {
-      // synthesize on the backend
-      const response = await sendJsonData("/synthesize", { text });
-
-      // wait for previous to finish if requested
-      while (waitForPrevious && this.isSpeaking) await sleep(25);
-      if (terminator && terminator()) return;
-
-      // stop previous if any
-      this.stopAudio();
-
-      if (response.success) {
-        if (response.audio_parts) {
-          // Multiple chunks - play sequentially
-          for (const audioPart of response.audio_parts) {
-            if (terminator && terminator()) return;
-            await this.playAudio(audioPart);
-            await sleep(100); // Brief pause
-          }
-        } else if (response.audio) {
-          // Single audio
-          this.playAudio(response.audio);
-        }
-      } else {
-        throw new Error("Kokoro TTS error:", response.error);
+      const prefetched =
+        this.kokoroPrefetch?.text === text ? this.kokoroPrefetch.response : null;
+      this.kokoroPrefetch = null;
+      const response = await (prefetched || this.requestKokoro(text));
+      if (!response.ok) throw new Error(await response.text());
+
+      let first = true;
+      for await (const part of this.readJsonLines(response)) {
+        if (!part.success) throw new Error(part.error);
+
+        if (first) {
+          // wait for previous to finish if requested
+          while (waitForPrevious && this.isSpeaking) await sleep(25);
+          if (terminator && terminator()) return;
+
+          // stop previous if any
+          this.stopAudio();
+          first = false;
+        } else if (terminator && terminator()) return;
+
+        await this.playAudio(part.audio);
       }
     } catch (error) {
       throw new Error("Kokoro TTS error:", error);
     }
   },
 
+  // Parse a streamed newline delimited json response
+  async *readJsonLines(response) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    while (true) {
+      const { done, value } = await reader.read();
+      if (value) buffer += decoder.decode(value, { stream: true });
+      let newline;
+      while ((newline = buffer.indexOf("\n")) >= 0) {
+        const line = buffer.slice(0, newline).trim();
+        buffer = buffer.slice(newline + 1);
+        if (line) yield JSON.parse(line);
+      }
+      if (done) break;
+    }
+    if (buffer.trim()) yield JSON.parse(buffer);
+  },
+
   // Play base64 audio
   async playAudio(base64Audio) {
     return new Promise((resolve, reject) => {
@@ -426,6 +470,8 @@ const model = {
       // Reset any previous playback state
       audio.pause();
       audio.currentTime = 0;
+      this.settlePlayback();
+      this.resolvePlayback = resolve;
 
       audio.onplay = () => {
         this.isSpeaking = true;
@@ -433,11 +479,12 @@ const model = {
       audio.onended = () => {
         this.isSpeaking = false;
         this.currentAudio = null;
-        resolve();
+        this.settlePlayback();
       };
       audio.onerror = (error) => {
         this.isSpeaking = false;
         this.currentAudio = null;
+        this.resolvePlayback = null;
         reject(error);
       };
 
@@ -452,11 +499,19 @@ const model = {
           this.showAudioPermissionPrompt();
           this.userHasInteracted = false;
         }
+        this.resolvePlayback = null;
         reject(error);
       });
     });
   },
 
+  // Resolve the pending playAudio promise, a paused element never fires onended
+  settlePlayback() {
+    const resolve = this.resolvePlayback;
+    this.resolvePlayback = null;
+    if (resolve) resolve();
+  },
+
   // Stop current speech chain
   stop() {
     this.stopAudio(); // stop current audio immediately
@@ -473,6 +528,7 @@ const model = {
       this.audioEl.pause();
       this.audioEl.currentTime = 0;
     }
+    this.settlePlayback();
     this.currentAudio = null;
     this.isSpeaking = false;
   },
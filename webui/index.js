@@ -323,6 +323,8 @@ function setConnectionStatus(connected) {
 let lastLogVersion = 0;
 let lastLogGuid = "";
 let lastSpokenNo = 0;
+let lastPollEtag = "";
+let lastPollResponse = null;
 
 async function poll() {
   let updated = false;
@@ -331,12 +333,31 @@ async function poll() {
     const timezone = Intl.DateTimeFormat().resolvedOptions().timeZone;
 
     const log_from = lastLogVersion;
-    const response = await sendJsonData("/poll", {
-      log_from: log_from,
-      context: context || null,
-      timezone: timezone,
+    const headers = { "Content-Type": "application/json" };
+    if (lastPollEtag && lastPollResponse) headers["If-None-Match"] = lastPollEtag;
+    const pollResponse = await api.fetchApi("/poll", {
+      method: "POST",
+      headers: headers,
+      credentials: "same-origin",
+      body: JSON.stringify({
+        log_from: log_from,
+        context: context || null,
+        timezone: timezone,
+      }),
     });
 
+    let response = null;
+    if (pollResponse.status === 304) {
+      // nothing changed on the server, process the previous response again
+      response = lastPollResponse;
+    } else if (pollResponse.ok) {
+      response = await pollResponse.json();
+      lastPollEtag = pollResponse.headers.get("ETag") || "";
+      lastPollResponse = response;
+    } else {
+      throw new Error(await pollResponse.text());
+    }
+
     // Check if the response is valid
     if (!response) {
       console.error("Invalid response from poll endpoint");
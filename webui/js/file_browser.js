@@ -9,6 +9,9 @@ const fileBrowserModalProxy = {
     parentPath: "",
     sortBy: "name",
     sortDirection: "asc",
+    nextCursor: null,
+    total: 0,
+    filter: "",
   },
 
   // Initialize navigation history
@@ -21,6 +24,7 @@ const fileBrowserModalProxy = {
     modalAD.isOpen = true;
     modalAD.isLoading = true;
     modalAD.history = []; // reset history when opening modal
+    modalAD.browser.filter = "";
 
     // Initialize currentPath to root if it's empty
     if (path) modalAD.browser.currentPath = path;
@@ -36,18 +40,28 @@ const fileBrowserModalProxy = {
     return archiveExts.includes(ext);
   },
 
-  async fetchFiles(path = "") {
+  async fetchFiles(path = "", cursor = 0) {
     this.isLoading = true;
     try {
-      const response = await fetchApi(
-        `/get_work_dir_files?path=${encodeURIComponent(path)}`
-      );
+      const params = new URLSearchParams({
+        path,
+        sort_by: this.browser.sortBy,
+        sort_dir: this.browser.sortDirection,
+        cursor,
+        filter: this.browser.filter,
+      });
+      const response = await fetchApi(`/get_work_dir_files?${params}`);
 
       if (response.ok) {
         const data = await response.json();
-        this.browser.entries = data.data.entries;
+        // append further pages, replace on first page
+        this.browser.entries = cursor
+          ? this.browser.entries.concat(data.data.entries)
+          : data.data.entries;
         this.browser.currentPath = data.data.current_path;
         this.browser.parentPath = data.data.parent_path;
+        this.browser.nextCursor = data.data.next_cursor;
+        this.browser.total = data.data.total;
       } else {
         console.error("Error fetching files:", await response.text());
         this.browser.entries = [];
@@ -60,11 +74,22 @@ const fileBrowserModalProxy = {
     }
   },
 
+  async applyFilter() {
+    // filtered on the server, the loaded page only holds part of the directory
+    await this.fetchFiles(this.browser.currentPath);
+  },
+
+  async loadMore() {
+    if (this.browser.nextCursor === null) return;
+    await this.fetchFiles(this.browser.currentPath, this.browser.nextCursor);
+  },
+
   async navigateToFolder(path) {
     // Push current path to history before navigating
     if (this.browser.currentPath !== path) {
       this.history.push(this.browser.currentPath);
     }
+    this.browser.filter = "";
     await this.fetchFiles(path);
   },
 
@@ -72,6 +97,7 @@ const fileBrowserModalProxy = {
     if (this.browser.parentPath !== "") {
       // Push current path to history before navigating up
       this.history.push(this.browser.currentPath);
+      this.browser.filter = "";
       await this.fetchFiles(this.browser.parentPath);
     }
   },
@@ -97,7 +123,7 @@ const fileBrowserModalProxy = {
     });
   },
 
-  toggleSort(column) {
+  async toggleSort(column) {
     if (this.browser.sortBy === column) {
       this.browser.sortDirection =
         this.browser.sortDirection === "asc" ? "desc" : "asc";
@@ -105,6 +131,10 @@ const fileBrowserModalProxy = {
       this.browser.sortBy = column;
       this.browser.sortDirection = "asc";
     }
+    // listing is paginated, so the server has to sort the whole directory
+    if (this.browser.nextCursor !== null) {
+      await this.fetchFiles(this.browser.currentPath);
+    }
   },
 
   async deleteFile(file) {
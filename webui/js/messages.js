@@ -689,14 +689,15 @@ function drawKvps(container, kvps, latex) {
         if (typeof value === "string" && value.startsWith("img://")) {
           const imgElement = document.createElement("img");
           imgElement.classList.add("kvps-img");
-          imgElement.src = value.replace("img://", "/image_get?path=");
+          const imgSrc = value.replace("img://", "/image_get?path=");
+          imgElement.src = imgSrc + "&variant=thumb";
           imgElement.alt = "Image Attachment";
           tdiv.appendChild(imgElement);
 
-          // Add click handler and cursor change
+          // Add click handler and cursor change, full size image in modal
           imgElement.style.cursor = "pointer";
           imgElement.addEventListener("click", () => {
-            openImageModal(imgElement.src, 1000);
+            openImageModal(imgSrc, 1000);
           });
         } else {
           const pre = document.createElement("pre");